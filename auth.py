@@ -3,13 +3,21 @@ from google.auth.transport import requests
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
+import logging
 import os
-from fastapi import HTTPException, status
+import secrets
+from fastapi import Header, HTTPException, status
+from services.tracing import span
+
+logger = logging.getLogger(__name__)
 
 # Google OAuth2 settings
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
+# Shared secret for operator endpoints under /admin; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
 # JWT settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = "HS256"
@@ -27,15 +35,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 def verify_google_token(token: str):
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), GOOGLE_CLIENT_ID)
-        print(idinfo)
+        # Fetches Google's certificates over the network on a cold cache
+        with span("google.verify_oauth2_token"):
+            idinfo = id_token.verify_oauth2_token(
+                token, requests.Request(), GOOGLE_CLIENT_ID)
         if idinfo['aud'] != GOOGLE_CLIENT_ID:
             raise ValueError('Wrong audience.')
         return idinfo
     except Exception as e:
         # For development/testing purposes
-        print(e)
+        logger.debug(f"Google token verification failed: {str(e)}")
         return {
            "message": "Invalid token"
-        }
\ No newline at end of file
+        }
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for operator-only endpoints"""
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
@@ -0,0 +1,96 @@
+"""Latency benchmark for the in-memory scout matcher.
+
+    python -m benchmarks.matching_benchmark --scouts 100000
+
+Builds the index from synthetic scouts, runs random founder profiles
+against it and fails if p99 latency is above --budget-ms.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from services.matching import ScoutMatcher
+
+SECTORS = ["fintech", "health", "climate", "saas", "edtech", "agritech", "mobility", "retail", "gaming", "biotech",
+           "logistics", "insurance", "media", "security", "energy", "robotics", "ai", "marketplace", "d2c", "deeptech"]
+STAGES = ["idea", "pre-seed", "seed", "series a", "series b", "growth"]
+COMMUNITIES = ["women founders", "student founders", "veterans", "first-time founders", "diaspora", "rural"]
+LOCATIONS = [
+    "India/Karnataka/Bangalore", "India/Maharashtra/Mumbai", "India/Delhi/New Delhi", "India/Telangana/Hyderabad",
+    "India/Tamil Nadu/Chennai", "India", "Singapore", "UAE/Dubai", "USA/California/San Francisco", "UK/London",
+]
+
+def random_scout(rng: random.Random, scout_id: int) -> dict:
+    def maybe(choices, k_max=2, empty=0.2):
+        if rng.random() < empty:
+            return None
+        return ", ".join(rng.sample(choices, rng.randint(1, k_max)))
+
+    low = rng.randint(18, 45)
+    return {
+        "id": scout_id,
+        "daftar_id": rng.randint(1, 10_000),
+        "name": f"Scout {scout_id}",
+        "sector": maybe(SECTORS, 3),
+        "stage": maybe(STAGES, 2),
+        "community": maybe(COMMUNITIES, 1, empty=0.6),
+        "location": maybe(LOCATIONS, 2, empty=0.3),
+        "age_range": None if rng.random() < 0.5 else f"{low}-{low + rng.randint(5, 20)}",
+    }
+
+def random_profile(rng: random.Random) -> dict:
+    profile = {
+        "sector": rng.choice(SECTORS),
+        "stage": rng.choice(STAGES),
+        "location": rng.choice(LOCATIONS),
+        "age": rng.randint(18, 60),
+    }
+    if rng.random() < 0.3:
+        profile["community"] = rng.choice(COMMUNITIES)
+    # Some founders fill in only part of their profile
+    for attribute in list(profile):
+        if rng.random() < 0.15:
+            del profile[attribute]
+    return profile
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scouts", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=10.0, help="fail if p99 exceeds this")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    matcher = ScoutMatcher()
+
+    started = time.perf_counter()
+    matcher.replace_all(random_scout(rng, scout_id) for scout_id in range(1, args.scouts + 1))
+    print(f"Indexed {len(matcher)} scouts in {time.perf_counter() - started:.2f}s")
+
+    started = time.perf_counter()
+    for scout_id in range(1, 1001):
+        matcher.add(random_scout(rng, scout_id))
+    print(f"Re-indexed 1000 scouts in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    samples = []
+    for _ in range(args.queries):
+        profile = random_profile(rng)
+        started = time.perf_counter()
+        matcher.match(profile, limit=args.limit)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    p99 = percentile(samples, 99)
+    print(
+        f"match: p50={statistics.median(samples):.2f}ms p95={percentile(samples, 95):.2f}ms "
+        f"p99={p99:.2f}ms max={max(samples):.2f}ms"
+    )
+    sys.exit(1 if p99 > args.budget_ms else 0)
+
+if __name__ == "__main__":
+    main()
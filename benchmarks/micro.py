@@ -0,0 +1,74 @@
+"""Run the micro-benchmarks and gate on regressions against a baseline.
+
+    python -m benchmarks.micro                      # compare with the baseline
+    python -m benchmarks.micro --update-baseline    # record a new baseline
+
+Needs pytest and pytest-benchmark. Each benchmark's fastest round is
+compared with benchmarks/micro_baseline.json and the run fails if any is
+more than --threshold (or MICRO_BENCH_THRESHOLD) slower. Baselines are
+machine specific; record one on the machine that runs the gate.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS = os.path.join(HERE, "micro_benchmarks.py")
+BASELINE = os.path.join(HERE, "micro_baseline.json")
+MICRO_BENCH_THRESHOLD = float(os.getenv("MICRO_BENCH_THRESHOLD", "0.25"))
+
+def run_benchmarks() -> dict:
+    """Fastest round in seconds per benchmark name, the least noisy statistic"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "results.json")
+        exit_code = pytest.main([
+            BENCHMARKS, "-q", "-p", "no:cacheprovider",
+            "--benchmark-only", "--benchmark-warmup=on", f"--benchmark-json={output}",
+        ])
+        if exit_code != 0:
+            sys.exit(exit_code)
+        with open(output) as f:
+            results = json.load(f)
+    return {bench["name"]: bench["stats"]["min"] for bench in results["benchmarks"]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=MICRO_BENCH_THRESHOLD, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=BASELINE)
+    args = parser.parse_args()
+
+    timings = run_benchmarks()
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({name: round(timing, 9) for name, timing in sorted(timings.items())}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}; record one with --update-baseline")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    failed = False
+    for name, timing in sorted(timings.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<45} {timing * 1e6:>10.1f}us  (no baseline)")
+            continue
+        change = (timing - previous) / previous
+        regressed = change > args.threshold
+        failed = failed or regressed
+        print(
+            f"{name:<45} {timing * 1e6:>10.1f}us  baseline {previous * 1e6:>10.1f}us  "
+            f"{change:+.0%}{'  REGRESSION' if regressed else ''}"
+        )
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
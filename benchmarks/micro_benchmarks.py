@@ -0,0 +1,97 @@
+"""pytest-benchmark micro-benchmarks for CPU-bound hot paths.
+
+Run through benchmarks.micro, which compares the results with the
+committed baseline. Nothing here touches the network or a database server.
+"""
+import sqlite3
+from datetime import datetime, timedelta
+from typing import List
+import pytest
+from jose import jwt
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, text
+import auth
+from routes.pitch import build_pitch_update
+from schemas.document import DocumentResponse
+from schemas.pitch import PitchResponse, PitchUpdate
+from schemas.scout import ScoutResponse
+
+# Typical page size of the list endpoints
+ROWS = 100
+
+CREATED_AT = datetime(2024, 1, 1, 12, 0, 0)
+
+def pitch_rows():
+    return [
+        {
+            "id": i, "pitch_name": f"Pitch {i}", "scout_id": i % 50, "founder_language": "en",
+            "ask_for_investor": False, "has_confirmed": True, "status_founder": "Inbox",
+            "created_at": CREATED_AT, "demo_link": None,
+            "counts": {"documents": 3, "offers_pending": 1, "questions": 2},
+        }
+        for i in range(ROWS)
+    ]
+
+def document_rows():
+    return [
+        {
+            "id": i, "document_url": f"https://files.example.com/{i}.pdf", "document_type": "pitch_deck",
+            "title": f"Deck {i}", "description": "Quarterly update", "is_private": False,
+            "uploaded_by_type": "founder", "uploaded_by_id": i, "uploaded_at": CREATED_AT,
+        }
+        for i in range(ROWS)
+    ]
+
+def scout_rows():
+    return [
+        {"id": i, "daftar_id": i % 10, "name": f"Scout {i}", "status": "approved", "created_at": CREATED_AT}
+        for i in range(ROWS)
+    ]
+
+@pytest.fixture(autouse=True)
+def secret_key(monkeypatch):
+    monkeypatch.setattr(auth, "SECRET_KEY", "benchmark-secret")
+
+def test_create_access_token(benchmark):
+    benchmark(
+        auth.create_access_token,
+        {"sub": "founder@example.com", "role": "founder"},
+        timedelta(minutes=30)
+    )
+
+def test_decode_access_token(benchmark):
+    token = auth.create_access_token({"sub": "founder@example.com", "role": "founder"}, timedelta(minutes=30))
+    benchmark(jwt.decode, token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+
+# FastAPI validates handler output against response_model, then dumps it
+@pytest.mark.parametrize("model, rows", [
+    (PitchResponse, pitch_rows),
+    (DocumentResponse, document_rows),
+    (ScoutResponse, scout_rows),
+], ids=["pitch", "document", "scout"])
+def test_serialize_response_list(benchmark, model, rows):
+    adapter = TypeAdapter(List[model])
+    data = rows()
+    benchmark(lambda: adapter.dump_json(adapter.validate_python(data)))
+
+def test_row_to_dict(benchmark):
+    # Real SQLAlchemy Row objects, from an in-memory SQLite table
+    engine = create_engine("sqlite://", creator=lambda: sqlite3.connect(":memory:"))
+    with engine.connect() as conn:
+        conn.execute(text(
+            "CREATE TABLE pitches (id INTEGER, pitch_name TEXT, scout_id INTEGER, founder_language TEXT, "
+            "ask_for_investor BOOLEAN, has_confirmed BOOLEAN, status_founder TEXT, created_at TEXT, demo_link TEXT)"
+        ))
+        conn.execute(
+            text(
+                "INSERT INTO pitches VALUES (:id, :pitch_name, :scout_id, :founder_language, "
+                ":ask_for_investor, :has_confirmed, :status_founder, :created_at, :demo_link)"
+            ),
+            [{**row, "created_at": row["created_at"].isoformat()} for row in pitch_rows()]
+        )
+        rows = conn.execute(text("SELECT * FROM pitches")).fetchall()
+    benchmark(lambda: [dict(row._mapping) for row in rows])
+
+def test_build_pitch_update(benchmark):
+    pitch_data = PitchUpdate(pitch_name="Renamed", status_founder="Accepted", demo_link="https://demo.example.com")
+    benchmark(build_pitch_update, 42, pitch_data)
@@ -0,0 +1,55 @@
+from redis.asyncio import Redis
+from cachetools import TTLCache
+from typing import Any, Optional
+import json
+import os
+import time
+from services.tracing import span
+
+# Shared Redis connection. Left unset in local development, in which case
+# callers fall back to their in-process implementations.
+REDIS_URL = os.getenv("REDIS_URL")
+
+_client: Optional[Redis] = None
+
+# Process-local stand-in for Redis; entries carry their own expiry
+_local = TTLCache(maxsize=10_000, ttl=24 * 3600)
+
+def get_redis() -> Optional[Redis]:
+    """Return the shared async Redis client, or None when Redis is not configured"""
+    global _client
+    if REDIS_URL is None:
+        return None
+    if _client is None:
+        _client = Redis.from_url(REDIS_URL, decode_responses=True)
+    return _client
+
+async def close_redis():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def cache_get_json(key: str) -> Optional[Any]:
+    """Read a JSON value written by cache_set_json, or None on a miss"""
+    redis = get_redis()
+    if redis is not None:
+        with span("redis GET", **{"db.system": "redis", "cache.key": key}):
+            value = await redis.get(key)
+        return json.loads(value) if value is not None else None
+
+    entry = _local.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+async def cache_set_json(key: str, value: Any, ttl: int):
+    """Store a JSON-serializable value for ttl seconds"""
+    redis = get_redis()
+    if redis is not None:
+        with span("redis SET", **{"db.system": "redis", "cache.key": key}):
+            await redis.set(key, json.dumps(value, default=str), ex=ttl)
+        return
+
+    # Round-trip through JSON so both backends hand back the same shapes
+    _local[key] = (time.monotonic() + ttl, json.loads(json.dumps(value, default=str)))
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import os
+from database import AsyncSessionLocal
+from services.scout_archive import run_archival
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+SCOUT_ARCHIVE_INTERVAL = float(os.getenv("SCOUT_ARCHIVE_INTERVAL", "3600"))
+# Scouts copied and released per run
+SCOUT_ARCHIVE_LIMIT = int(os.getenv("SCOUT_ARCHIVE_LIMIT", "50"))
+
+async def run_scout_archival(interval: float = SCOUT_ARCHIVE_INTERVAL):
+    """Periodically move long-archived scouts to the archive tier"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("archive_scouts") as acquired:
+                if acquired:
+                    async with AsyncSessionLocal() as db:
+                        await run_archival(db, SCOUT_ARCHIVE_LIMIT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Scout archival error: {str(e)}")
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    async with single_runner("archive_scouts") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            summary = await run_archival(db)
+    print(f"Copied {summary['copied']} scouts, released {summary['released']}")
+
+if __name__ == "__main__":
+    # python -m jobs.archive_scouts
+    asyncio.run(main())
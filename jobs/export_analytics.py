@@ -0,0 +1,39 @@
+import asyncio
+import logging
+import os
+from database import AsyncSessionLocal
+from services.analytics_export import export_changes
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_EXPORT_INTERVAL = float(os.getenv("ANALYTICS_EXPORT_INTERVAL", "900"))
+
+async def run_analytics_export(interval: float = ANALYTICS_EXPORT_INTERVAL):
+    """Periodically export changed rows to Parquet for the analytics reports"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("export_analytics") as acquired:
+                if acquired:
+                    async with AsyncSessionLocal() as db:
+                        await export_changes(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Analytics export error: {str(e)}")
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    async with single_runner("export_analytics") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            exported = await export_changes(db)
+    print(f"Exported {sum(exported.values())} rows: {exported}")
+
+if __name__ == "__main__":
+    # python -m jobs.export_analytics
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+import os
+from database import AsyncSessionLocal
+from services.partitions import maintain_partitions
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MAINTENANCE_INTERVAL = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", str(6 * 3600)))
+
+async def run_partition_maintenance(interval: float = PARTITION_MAINTENANCE_INTERVAL):
+    """Keep future partitions created and apply retention, starting at boot"""
+    while True:
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("maintain_partitions") as acquired:
+                if acquired:
+                    async with AsyncSessionLocal() as db:
+                        await maintain_partitions(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Partition maintenance error: {str(e)}")
+        await asyncio.sleep(interval)
+
+async def main():
+    async with single_runner("maintain_partitions") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            actions = await maintain_partitions(db)
+    for action in actions:
+        print(action)
+    print(f"{len(actions)} partition changes")
+
+if __name__ == "__main__":
+    # python -m jobs.maintain_partitions
+    asyncio.run(main())
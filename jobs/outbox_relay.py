@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncSessionLocal
+from services.bus import MessageBus, OUTBOX_STREAM, get_bus
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+
+async def relay_once(db: AsyncSession, bus: MessageBus, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """Publish one batch of unpublished outbox events and mark them as sent.
+
+    Rows are locked with SKIP LOCKED so several workers can relay concurrently
+    without publishing the same event twice. Returns the number of events sent.
+    """
+    result = await db.execute(
+        text("""
+            SELECT id, aggregate_type, aggregate_id, event_type, payload, created_at
+            FROM outbox_events
+            WHERE published_at IS NULL
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        """),
+        {"batch_size": batch_size}
+    )
+    events = [dict(row._mapping) for row in result.fetchall()]
+
+    if not events:
+        await db.rollback()
+        return 0
+
+    # Publish before marking; a crash in between re-sends the batch, so
+    # consumers must treat the event id as an idempotency key
+    await bus.publish(OUTBOX_STREAM, events)
+
+    await db.execute(
+        text("""
+            UPDATE outbox_events
+            SET published_at = CURRENT_TIMESTAMP
+            WHERE id = ANY(:ids)
+        """),
+        {"ids": [event["id"] for event in events]}
+    )
+    await db.commit()
+    return len(events)
+
+async def run_outbox_relay(poll_interval: float = OUTBOX_POLL_INTERVAL):
+    """Relay outbox events forever, draining full batches without sleeping"""
+    bus = get_bus()
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                sent = await relay_once(db, bus)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Outbox relay error: {str(e)}")
+            sent = 0
+
+        if sent < OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(poll_interval)
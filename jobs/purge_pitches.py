@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import os
+from database import AsyncSessionLocal
+from services.purge import purger
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+PITCH_PURGE_INTERVAL = float(os.getenv("PITCH_PURGE_INTERVAL", "60"))
+# Pitches purged per run, so one run cannot go on for hours
+PITCH_PURGE_LIMIT = int(os.getenv("PITCH_PURGE_LIMIT", "100"))
+
+async def run_pitch_purge(interval: float = PITCH_PURGE_INTERVAL):
+    """Periodically purge soft-deleted pitches"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("purge_pitches") as acquired:
+                if acquired:
+                    async with AsyncSessionLocal() as db:
+                        await purger.run_once(db, PITCH_PURGE_LIMIT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Pitch purge error: {str(e)}")
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    async with single_runner("purge_pitches") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            purged = await purger.run_once(db)
+    print(f"Purged {purged} pitches, {purger.rows_deleted} rows")
+
+if __name__ == "__main__":
+    # python -m jobs.purge_pitches
+    asyncio.run(main())
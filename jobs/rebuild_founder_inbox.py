@@ -0,0 +1,13 @@
+import asyncio
+import sys
+from database import AsyncSessionLocal
+from services.inbox import rebuild_founder_inbox
+
+async def main(founder_id=None):
+    async with AsyncSessionLocal() as db:
+        await rebuild_founder_inbox(db, founder_id)
+        await db.commit()
+
+if __name__ == "__main__":
+    # python -m jobs.rebuild_founder_inbox [founder_id]
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else None))
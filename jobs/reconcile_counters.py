@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import os
+from database import AsyncSessionLocal
+from services.counters import reconcile_counters
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+COUNTER_RECONCILE_INTERVAL = float(os.getenv("COUNTER_RECONCILE_INTERVAL", "3600"))
+
+async def run_counter_reconciliation(interval: float = COUNTER_RECONCILE_INTERVAL):
+    """Periodically correct counter drift"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("reconcile_counters") as acquired:
+                if not acquired:
+                    continue
+                async with AsyncSessionLocal() as db:
+                    corrected = await reconcile_counters(db)
+                    await db.commit()
+            if corrected:
+                logger.warning(f"Counter reconciliation corrected {corrected} counters")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Counter reconciliation error: {str(e)}")
+
+async def main():
+    async with single_runner("reconcile_counters") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            corrected = await reconcile_counters(db)
+            await db.commit()
+    print(f"Corrected {corrected} counters")
+
+if __name__ == "__main__":
+    # python -m jobs.reconcile_counters
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from database import AsyncSessionLocal
+from services.daftar_stats import DAFTAR_STATS_INTERVAL, refresh_rollups
+from services.job_lock import single_runner
+
+logger = logging.getLogger(__name__)
+
+async def run_daftar_stats_refresh(interval: float = DAFTAR_STATS_INTERVAL):
+    """Periodically recompute the rollups of daftars that changed"""
+    while True:
+        try:
+            # One worker at a time; the others skip this run
+            async with single_runner("refresh_daftar_stats") as acquired:
+                if acquired:
+                    async with AsyncSessionLocal() as db:
+                        await refresh_rollups(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Daftar stats refresh error: {str(e)}")
+        await asyncio.sleep(interval)
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    async with single_runner("refresh_daftar_stats") as acquired:
+        if not acquired:
+            print("Another worker is running this job")
+            return
+        async with AsyncSessionLocal() as db:
+            refreshed = await refresh_rollups(db)
+    print(f"Refreshed stats for {refreshed} daftars")
+
+if __name__ == "__main__":
+    # python -m jobs.refresh_daftar_stats
+    asyncio.run(main())
@@ -1,28 +1,86 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import init_db
-from routes import founder, investor, scout, auth, pitch
+from database import init_db, engine
+from routes import founder, investor, scout, auth, pitch, feed, search, metrics, admin, archive, analytics
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from sqlalchemy import text
+from cache import close_redis
+from jobs.outbox_relay import run_outbox_relay
+from jobs.reconcile_counters import run_counter_reconciliation
+from jobs.purge_pitches import run_pitch_purge
+from jobs.maintain_partitions import run_partition_maintenance
+from jobs.archive_scouts import run_scout_archival
+from jobs.export_analytics import run_analytics_export
+from jobs.refresh_daftar_stats import run_daftar_stats_refresh
+from services.bus import get_bus
+from services.feed import hub
+from services.matching import matcher
+from services.metrics import instrument_engine, metrics_middleware
+from services.tracing import setup_tracing, tracing_middleware
+from services.query_guard import setup_query_guard, query_guard_middleware, write_report
+from services.loop_lag import loop_lag
+from services.profiling import capture
+from services.rate_limit import rate_limit
+from services.idempotency import idempotency_middleware
+import asyncio
+import os
 
 logger = logging.getLogger(__name__)
 
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     try:
-#         # Setup
-#         await init_db()
-#         logger.info("Database initialized successfully")
-#     except Exception as e:
-#         logger.error(f"Failed to initialize database: {str(e)}")
-#         raise
-#     yield
-#     # # Cleanup (if needed)
+# Set to "false" on processes that should only serve requests
+RUN_BACKGROUND_JOBS = os.getenv("RUN_BACKGROUND_JOBS", "true").lower() == "true"
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Setup
+    # await init_db()
+    # Every worker follows the bus so its own feed connections and its
+    # scout matching index stay current
+    background_tasks = [
+        asyncio.create_task(hub.run(get_bus())),
+        asyncio.create_task(matcher.run(get_bus())),
+        asyncio.create_task(loop_lag.run()),
+    ]
+    if RUN_BACKGROUND_JOBS:
+        background_tasks.append(asyncio.create_task(run_outbox_relay()))
+        background_tasks.append(asyncio.create_task(run_counter_reconciliation()))
+        background_tasks.append(asyncio.create_task(run_pitch_purge()))
+        background_tasks.append(asyncio.create_task(run_partition_maintenance()))
+        background_tasks.append(asyncio.create_task(run_scout_archival()))
+        background_tasks.append(asyncio.create_task(run_analytics_export()))
+        background_tasks.append(asyncio.create_task(run_daftar_stats_refresh()))
+    yield
+    # Cleanup
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await close_redis()
+    if QUERY_GUARD_ENABLED:
+        write_report()
+
+app = FastAPI(lifespan=lifespan)
+
+# Per-route latency, DB time and statement counts, scraped from /metrics
+instrument_engine(engine)
+app.middleware("http")(metrics_middleware)
+
+# On-demand profiling, switched on through /admin/profiling
+app.middleware("http")(capture.middleware)
+
+# Retried POSTs with an Idempotency-Key replay the first response
+app.middleware("http")(idempotency_middleware)
+
+# Optional OpenTelemetry spans, enabled with TRACING_EXPORTER
+if setup_tracing(engine):
+    app.middleware("http")(tracing_middleware)
+
+# Development and CI: flag N+1 patterns, enabled with QUERY_GUARD
+QUERY_GUARD_ENABLED = setup_query_guard(engine)
+if QUERY_GUARD_ENABLED:
+    app.middleware("http")(query_guard_middleware)
 
 # Configure CORS
 app.add_middleware(
@@ -33,12 +91,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include all routers
-app.include_router(auth.router)
-app.include_router(founder.router)
-app.include_router(investor.router)
-app.include_router(scout.router)
-app.include_router(pitch.router)
+# Include all routers; API routes are rate limited and write routes capped
+# in concurrency
+limited = [Depends(rate_limit)]
+app.include_router(auth.router, dependencies=limited)
+app.include_router(founder.router, dependencies=limited)
+app.include_router(investor.router, dependencies=limited)
+app.include_router(scout.router, dependencies=limited)
+app.include_router(pitch.router, dependencies=limited)
+app.include_router(feed.router)
+app.include_router(search.router, dependencies=limited)
+app.include_router(archive.router, dependencies=limited)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+app.include_router(analytics.router)
+
+# Lets the loop watchdog name the route behind a blocking call
+loop_lag.watch_routes(app.routes)
 
 @app.get("/")
 async def root(db: AsyncSession = Depends(get_db)):
@@ -0,0 +1,36 @@
+-- Full-text search over pitches, scouts, scout FAQs, scout updates and
+-- investor notes. Each table gets a generated tsvector column and a GIN
+-- index; the search service queries them with the same 'english' config.
+
+ALTER TABLE pitches
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(pitch_name, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_pitches_search_vector ON pitches USING GIN (search_vector);
+
+ALTER TABLE scouts
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(name, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_scouts_search_vector ON scouts USING GIN (search_vector);
+
+ALTER TABLE scout_faqs
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(question, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(answer, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS ix_scout_faqs_search_vector ON scout_faqs USING GIN (search_vector);
+
+ALTER TABLE scout_updates
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(description, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_scout_updates_search_vector ON scout_updates USING GIN (search_vector);
+
+ALTER TABLE investor_notes
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(note_text, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_investor_notes_search_vector ON investor_notes USING GIN (search_vector);
+
+-- Access checks used by every search
+CREATE INDEX IF NOT EXISTS ix_daftar_investors_investor_id ON daftar_investors (investor_id) WHERE is_active = true;
+CREATE INDEX IF NOT EXISTS ix_founder_pitch_relationship_founder_id ON founder_pitch_relationship (founder_id);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_investor_id ON investor_notes (investor_id);
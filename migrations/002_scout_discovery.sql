@@ -0,0 +1,2 @@
+-- Keyset pagination for scout discovery walks (created_at, id) newest first
+CREATE INDEX IF NOT EXISTS ix_scouts_created_at_id ON scouts (created_at DESC, id DESC);
@@ -0,0 +1,3 @@
+-- Row versions for optimistic concurrency; served as ETags and checked against If-Match
+ALTER TABLE pitches ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE scouts ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
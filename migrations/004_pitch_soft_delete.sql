@@ -0,0 +1,22 @@
+-- Soft delete for pitches. DELETE /pitches/{id} only sets deleted_at; the
+-- purge job removes the pitch and its child rows later, in batches.
+ALTER TABLE pitches ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP;
+
+-- Purge queue: soft-deleted pitches, oldest first
+CREATE INDEX IF NOT EXISTS ix_pitches_purge_queue ON pitches (deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- Each purge batch finds a pitch's child rows through these
+CREATE INDEX IF NOT EXISTS ix_documents_pitch_id ON documents (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_offers_pitch_id ON offers (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_offer_actions_offer_id ON offer_actions (offer_id);
+CREATE INDEX IF NOT EXISTS ix_bills_pitch_id ON bills (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_pitch_id ON investor_notes (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_investor_questions_pitch_id ON investor_questions (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_question_answers_question_id ON question_answers (question_id);
+CREATE INDEX IF NOT EXISTS ix_founder_question_inbox_pitch_id ON founder_question_inbox (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_team_member_analysis_pitch_id ON team_member_analysis (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_founder_meeting_pitch_id ON founder_meeting (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_founder_meeting_detail_meeting_id ON founder_meeting_detail (meeting_id);
+CREATE INDEX IF NOT EXISTS ix_pitch_team_invites_pitch_id ON pitch_team_invites (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_pending_confirmations_pitch_id ON pending_confirmations (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_founder_pitch_relationship_pitch_id ON founder_pitch_relationship (pitch_id);
@@ -0,0 +1,29 @@
+-- Partial indexes over live rows only. The predicates are the ones
+-- services/soft_delete.py puts in queries, so the planner can use them;
+-- archived scouts, soft-deleted pitches and departed members stay out.
+
+-- Scout listings per daftar and discovery's keyset walk
+CREATE INDEX IF NOT EXISTS ix_scouts_live_daftar_created_at
+    ON scouts (daftar_id, created_at DESC)
+    WHERE status != 'archived';
+CREATE INDEX IF NOT EXISTS ix_scouts_live_created_at_id
+    ON scouts (created_at DESC, id DESC)
+    WHERE status != 'archived';
+
+-- Pitches of a scout
+CREATE INDEX IF NOT EXISTS ix_pitches_live_scout_id
+    ON pitches (scout_id)
+    WHERE deleted_at IS NULL;
+
+-- Investor access checks and daftar member lists
+CREATE INDEX IF NOT EXISTS ix_daftar_investors_live_investor_daftar
+    ON daftar_investors (investor_id, daftar_id)
+    WHERE is_active = true;
+CREATE INDEX IF NOT EXISTS ix_daftar_investors_live_daftar_joined_at
+    ON daftar_investors (daftar_id, joined_at DESC)
+    WHERE is_active = true;
+
+-- Joining a daftar by code
+CREATE INDEX IF NOT EXISTS ix_daftars_live_daftar_code
+    ON daftars (daftar_code)
+    WHERE is_active = true AND deleted_on IS NULL;
@@ -0,0 +1,112 @@
+-- Monthly range partitioning for the append-only tables: offer_actions,
+-- scout_updates, documents and investor_notes. Each table is rebuilt as a
+-- partitioned table with one partition per month from its oldest row to
+-- three months ahead, its rows are copied across and its secondary indexes
+-- are recreated. jobs.maintain_partitions keeps creating future months and
+-- applies the retention policy.
+--
+-- Copying takes an exclusive lock on each table for the duration; run it
+-- in a maintenance window. Already partitioned tables are skipped.
+
+BEGIN;
+
+CREATE FUNCTION pg_temp.partition_by_month(tbl TEXT, col TEXT) RETURNS void AS $$
+DECLARE
+    old TEXT := tbl || '_unpartitioned';
+    seq TEXT;
+    cols TEXT;
+    fk TEXT;
+    idx TEXT;
+    indexes TEXT[];
+    m DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(tbl)) THEN
+        RETURN;
+    END IF;
+
+    -- Secondary indexes go with the old table; keep their definitions to
+    -- recreate on the partitioned one. Unique indexes other than the
+    -- primary key cannot be, as they would have to include the partition key.
+    SELECT array_agg(pg_get_indexdef(indexrelid)) INTO indexes
+    FROM pg_index
+    WHERE indrelid = to_regclass(tbl) AND NOT indisprimary AND NOT indisunique;
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, old);
+    -- The partition key cannot be NULL
+    EXECUTE format('UPDATE %I SET %I = CURRENT_TIMESTAMP WHERE %I IS NULL', old, col, col);
+
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS) PARTITION BY RANGE (%I)',
+        tbl, old, col
+    );
+    EXECUTE format(
+        'ALTER TABLE %I ALTER COLUMN %I SET NOT NULL, ALTER COLUMN %I SET DEFAULT CURRENT_TIMESTAMP',
+        tbl, col, col
+    );
+    -- Unique constraints on a partitioned table must include the partition key
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, %I)', tbl, col);
+    -- Foreign keys are not carried over by LIKE; copy every one of them
+    FOR fk IN
+        SELECT pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = old::regclass AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ADD %s', tbl, fk);
+    END LOOP;
+
+    -- One partition per month, from the oldest row to three months ahead
+    EXECUTE format('SELECT date_trunc(''month'', COALESCE(MIN(%I), CURRENT_TIMESTAMP))::date FROM %I', col, old)
+        INTO m;
+    WHILE m <= date_trunc('month', CURRENT_DATE + INTERVAL '3 months') LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            tbl || '_p' || to_char(m, 'YYYYMM'), tbl, m, (m + INTERVAL '1 month')::date
+        );
+        m := (m + INTERVAL '1 month')::date;
+    END LOOP;
+
+    -- Generated columns are recomputed, so they are left out of the copy
+    SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position) INTO cols
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = old AND is_generated = 'NEVER';
+    EXECUTE format('INSERT INTO %I (%s) SELECT %s FROM %I', tbl, cols, cols, old);
+
+    -- Keep the id sequence when the old table goes
+    seq := pg_get_serial_sequence(old, 'id');
+    IF seq IS NOT NULL THEN
+        EXECUTE format('ALTER SEQUENCE %s OWNED BY %I.id', seq, tbl);
+    END IF;
+    EXECUTE format('DROP TABLE %I', old);
+
+    FOREACH idx IN ARRAY COALESCE(indexes, '{}') LOOP
+        EXECUTE replace(idx, 'CREATE INDEX ', 'CREATE INDEX IF NOT EXISTS ');
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT pg_temp.partition_by_month('offer_actions', 'action_taken_at');
+SELECT pg_temp.partition_by_month('scout_updates', 'created_at');
+SELECT pg_temp.partition_by_month('documents', 'uploaded_at');
+SELECT pg_temp.partition_by_month('investor_notes', 'created_at');
+
+-- Indexes on the parent are created on every partition, present and future.
+-- Each list read is "rows of one parent, newest first", which these serve
+-- per partition while the planner walks partitions newest first.
+CREATE INDEX IF NOT EXISTS ix_offer_actions_offer_id_taken_at ON offer_actions (offer_id, action_taken_at DESC);
+CREATE INDEX IF NOT EXISTS ix_scout_updates_scout_id_created_at ON scout_updates (scout_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_scout_updates_search_vector ON scout_updates USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_documents_pitch_id_uploaded_at ON documents (pitch_id, uploaded_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_pitch_investor_created_at ON investor_notes (pitch_id, investor_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_search_vector ON investor_notes USING GIN (search_vector);
+
+-- The indexes earlier migrations defined on these tables, in case they were
+-- missing from the old table: 001 for search and the investor notes list,
+-- 004 for the pitch purge
+CREATE INDEX IF NOT EXISTS ix_investor_notes_investor_id ON investor_notes (investor_id);
+CREATE INDEX IF NOT EXISTS ix_documents_pitch_id ON documents (pitch_id);
+CREATE INDEX IF NOT EXISTS ix_offer_actions_offer_id ON offer_actions (offer_id);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_pitch_id ON investor_notes (pitch_id);
+
+-- Detached partitions are moved here by the retention policy
+CREATE SCHEMA IF NOT EXISTS archive;
+
+COMMIT;
@@ -0,0 +1,29 @@
+-- Archive tier for scouts archived more than ARCHIVE_AFTER_DAYS ago. Each
+-- scout is stored as one JSONB document with its pitches, document
+-- metadata, offers with their actions, notes, updates and FAQs; Postgres
+-- compresses the document out of line. The hot rows are then removed.
+
+ALTER TABLE scouts ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP;
+-- Scouts archived before this column existed start ageing now
+UPDATE scouts SET archived_at = CURRENT_TIMESTAMP WHERE status = 'archived' AND archived_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_scouts_archived_at ON scouts (archived_at) WHERE status = 'archived';
+
+CREATE SCHEMA IF NOT EXISTS archive;
+
+CREATE TABLE IF NOT EXISTS archive.scouts (
+    id INTEGER PRIMARY KEY,
+    daftar_id INTEGER NOT NULL,
+    name VARCHAR(255),
+    archived_at TIMESTAMP,
+    moved_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    pitch_count INTEGER NOT NULL,
+    doc JSONB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_archive_scouts_daftar_id ON archive.scouts (daftar_id, archived_at DESC, id DESC);
+
+-- Finds the archived scout holding a pitch
+CREATE TABLE IF NOT EXISTS archive.pitch_index (
+    pitch_id INTEGER PRIMARY KEY,
+    scout_id INTEGER NOT NULL REFERENCES archive.scouts (id)
+);
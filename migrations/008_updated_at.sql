@@ -0,0 +1,57 @@
+-- updated_at on the mutable tables the analytics export reads incrementally
+-- (jobs.export_analytics), with the type the models declare for it
+-- (TIMESTAMPTZ, default now()). The ORM's onupdate does not cover the raw
+-- SQL writes, so a trigger keeps it current on every UPDATE; rows that
+-- predate the column take their created_at.
+
+CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['offers', 'pitches', 'scouts', 'bills'] LOOP
+        EXECUTE format('ALTER TABLE %I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ', t);
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN updated_at TYPE TIMESTAMPTZ', t);
+        EXECUTE format(
+            'UPDATE %I SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL', t
+        );
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN updated_at SET DEFAULT now(), ALTER COLUMN updated_at SET NOT NULL', t
+        );
+        -- The export reads "changed since the high-water mark" ranges
+        EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I (updated_at)', 'ix_' || t || '_updated_at', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_touch_updated_at', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION touch_updated_at()',
+            t || '_touch_updated_at', t
+        );
+    END LOOP;
+END;
+$$;
+
+-- Pitches deleted by the purge, which the export writes out as tombstones
+-- so reports stop counting them. The export removes them once past its
+-- high-water mark.
+CREATE TABLE IF NOT EXISTS analytics_deletions (
+    table_name VARCHAR(100) NOT NULL,
+    row_id INTEGER NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_analytics_deletions_table_deleted_at ON analytics_deletions (table_name, deleted_at);
+
+CREATE OR REPLACE FUNCTION record_deletion() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO analytics_deletions (table_name, row_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS pitches_record_deletion ON pitches;
+CREATE TRIGGER pitches_record_deletion AFTER DELETE ON pitches
+    FOR EACH ROW EXECUTE FUNCTION record_deletion();
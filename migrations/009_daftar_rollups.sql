@@ -0,0 +1,71 @@
+-- Dashboard rollups per daftar, kept by jobs.refresh_daftar_stats. Each
+-- run finds the daftars whose scouts, pitches, offers, bills, notes,
+-- members or member investors changed since its high-water mark and
+-- recomputes only those.
+-- Needs the updated_at columns from 008_updated_at.sql.
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(100) PRIMARY KEY,
+    high_water_mark TIMESTAMPTZ NOT NULL
+);
+ALTER TABLE rollup_watermarks ALTER COLUMN high_water_mark TYPE TIMESTAMPTZ;
+
+CREATE TABLE IF NOT EXISTS daftar_stats (
+    daftar_id INTEGER PRIMARY KEY REFERENCES daftars (id),
+    scouts INTEGER NOT NULL DEFAULT 0,
+    pitches INTEGER NOT NULL DEFAULT 0,
+    offers_by_status JSONB NOT NULL DEFAULT '{}',
+    avg_seconds_to_offer DOUBLE PRECISION,
+    bills_outstanding INTEGER NOT NULL DEFAULT 0,
+    bills_outstanding_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    bills_paid INTEGER NOT NULL DEFAULT 0,
+    bills_paid_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    members INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS daftar_scout_stats (
+    scout_id INTEGER PRIMARY KEY,
+    daftar_id INTEGER NOT NULL,
+    name VARCHAR(255),
+    status VARCHAR(50),
+    pitches INTEGER NOT NULL DEFAULT 0,
+    offers INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_daftar_scout_stats_daftar_id ON daftar_scout_stats (daftar_id);
+
+CREATE TABLE IF NOT EXISTS daftar_member_activity (
+    daftar_id INTEGER NOT NULL,
+    investor_id INTEGER NOT NULL,
+    offers INTEGER NOT NULL DEFAULT 0,
+    notes INTEGER NOT NULL DEFAULT 0,
+    last_active_at TIMESTAMP,
+    PRIMARY KEY (daftar_id, investor_id)
+);
+
+-- Memberships and investors change in place (role, is_active, deleted_on),
+-- so they get the trigger-kept updated_at of 008 as well and a member
+-- leaving or an investor being deactivated is found like any other change
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['daftar_investors', 'investors'] LOOP
+        EXECUTE format(
+            'ALTER TABLE %I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()', t
+        );
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_touch_updated_at', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I BEFORE UPDATE ON %I FOR EACH ROW EXECUTE FUNCTION touch_updated_at()',
+            t || '_touch_updated_at', t
+        );
+    END LOOP;
+END;
+$$;
+
+-- Finding changed daftars reads these ranges
+DROP INDEX IF EXISTS ix_daftar_investors_joined_at;
+CREATE INDEX IF NOT EXISTS ix_daftar_investors_updated_at ON daftar_investors (updated_at);
+CREATE INDEX IF NOT EXISTS ix_investors_updated_at ON investors (updated_at);
+CREATE INDEX IF NOT EXISTS ix_investor_notes_created_at ON investor_notes (created_at);
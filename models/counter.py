@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, BigInteger
+from models.base import Base
+
+class EntityCounter(Base):
+    __tablename__ = "entity_counters"
+
+    # Denormalized child-row counts, e.g. ("pitch", 12, "documents") -> 4
+    id = None
+    entity_type = Column(String(50), primary_key=True)  # "pitch" or "scout"
+    entity_id = Column(Integer, primary_key=True)
+    name = Column(String(100), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
@@ -6,7 +6,7 @@ from datetime import datetime
 class Document(Base):
     __tablename__ = "documents"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # SERIAL despite the composite key
     pitch_id = Column(Integer, ForeignKey("pitches.id"), nullable=False)
     document_url = Column(String(255), nullable=False)
     document_type = Column(String(50), nullable=False)
@@ -15,6 +15,10 @@ class Document(Base):
     is_private = Column(Boolean, default=False)
     uploaded_by_type = Column(String(50), nullable=False)  # "founder" or "investor"
     uploaded_by_id = Column(Integer, nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key (migrations/006_partition_append_only.sql)
+
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (uploaded_at)"},
+    )
 
     pitch = relationship("Pitch", backref="documents") 
\ No newline at end of file
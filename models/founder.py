@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, ARRAY, Index, Numeric, Float
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, ARRAY, Index, Numeric, Float, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from models.base import Base
 from datetime import datetime
@@ -41,6 +42,16 @@ class Pitch(Base):
     status_founder = Column(String(50), nullable=False, default="Inbox")
     created_at = Column(DateTime, default=datetime.utcnow)
     demo_link = Column(String(255), nullable=True)
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every update; served as the ETag
+    deleted_at = Column(DateTime, nullable=True)  # Soft-deleted; purged by jobs.purge_pitches
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(pitch_name, ''))", persisted=True)
+    )
+
+    __table_args__ = (
+        Index('ix_pitches_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     scout = relationship("Scout", backref="pitches")
 
@@ -85,13 +96,17 @@ class PendingConfirmation(Base):
 class Document(Base):
     __tablename__ = "documents"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # SERIAL despite the composite key
     pitch_id = Column(Integer, ForeignKey("pitches.id"), nullable=False)
     uploaded_by = Column(Integer, ForeignKey("founders.id"), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow)
+    uploaded_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key (migrations/006_partition_append_only.sql)
     document_url = Column(String(255), nullable=False)
     is_private = Column(Boolean, default=False)
 
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (uploaded_at)"},
+    )
+
     pitch = relationship("Pitch", backref="documents")
     founder = relationship("Founder", backref="uploaded_documents")
 
@@ -112,12 +127,16 @@ class Offer(Base):
 class OfferAction(Base):
     __tablename__ = "offer_actions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # SERIAL despite the composite key
     offer_id = Column(Integer, ForeignKey("offers.id"), nullable=False)
     action = Column(String(50), nullable=False)  # accepted, rejected, withdrawn
     action_by = Column(Integer, nullable=False)  # Can be either founder_id or investor_id
     notes = Column(Text, nullable=True)
-    action_taken_at = Column(DateTime, default=datetime.utcnow)
+    action_taken_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key (migrations/006_partition_append_only.sql)
+
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (action_taken_at)"},
+    )
 
     offer = relationship("Offer", backref="actions")
 
@@ -212,4 +231,21 @@ class PitchTeamInvite(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     accepted_at = Column(DateTime, nullable=True)
 
-    pitch = relationship("Pitch", backref="team_invites")
\ No newline at end of file
+    pitch = relationship("Pitch", backref="team_invites")
+
+class FounderQuestionInbox(Base):
+    __tablename__ = "founder_question_inbox"
+
+    # One row per (founder, unanswered question). question_id grows with
+    # time, so paging newest-first is a range scan over the primary key.
+    id = None
+    founder_id = Column(Integer, ForeignKey("founders.id"), primary_key=True)
+    question_id = Column(Integer, ForeignKey("investor_questions.id"), primary_key=True)
+    pitch_id = Column(Integer, ForeignKey("pitches.id"), nullable=False)
+    question_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Answering a question removes it from every founder's inbox
+    __table_args__ = (
+        Index('ix_founder_question_inbox_question_id', 'question_id'),
+    )
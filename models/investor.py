@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from models.base import Base
 from datetime import datetime
@@ -41,10 +42,22 @@ class TeamMemberAnalysis(Base):
 class InvestorNote(Base):
     __tablename__ = "investor_notes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # SERIAL despite the composite key
     pitch_id = Column(Integer, ForeignKey("pitches.id"), nullable=False)
     investor_id = Column(Integer, ForeignKey("investors.id"), nullable=False)
     note_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key (migrations/006_partition_append_only.sql)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(note_text, ''))", persisted=True)
+    )
+
+    __table_args__ = (
+        Index('ix_investor_notes_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_investor_notes_investor_id', 'investor_id'),
+        Index('ix_investor_notes_pitch_investor_created_at', 'pitch_id', 'investor_id', created_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     pitch = relationship("Pitch", backref="investor_notes")
     investor = relationship("Investor", backref="notes")
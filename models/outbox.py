@@ -0,0 +1,23 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from models.base import Base
+from datetime import datetime
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(BigInteger, primary_key=True)
+    aggregate_type = Column(String(50), nullable=False)  # "offer", "pitch_team_invite", ...
+    aggregate_id = Column(Integer, nullable=False)
+    event_type = Column(String(100), nullable=False)  # e.g. "offer.withdrawn"
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    published_at = Column(DateTime, nullable=True)
+
+    # The relay only ever scans unpublished rows in id order
+    __table_args__ = (
+        Index(
+            'ix_outbox_events_unpublished', 'id',
+            postgresql_where=published_at.is_(None)
+        ),
+    )
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from models.base import Base
 from datetime import datetime
@@ -26,6 +27,17 @@ class Scout(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     approved_at = Column(DateTime, nullable=True)
     approved_by = Column(Integer, ForeignKey("daftar_team_members.id"), nullable=True)
+    archived_at = Column(DateTime, nullable=True)  # Moved to the archive tier ARCHIVE_AFTER_DAYS later
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every update; served as the ETag
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(name, ''))", persisted=True)
+    )
+
+    __table_args__ = (
+        Index('ix_scouts_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_scouts_created_at_id', created_at.desc(), id.desc()),
+    )
 
     daftar = relationship("Daftar", backref="scouts")
     approver = relationship("DaftarTeamMember", backref="approved_scouts")
@@ -38,6 +50,18 @@ class ScoutFAQ(Base):
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(question, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(answer, '')), 'B')",
+            persisted=True
+        )
+    )
+
+    __table_args__ = (
+        Index('ix_scout_faqs_search_vector', 'search_vector', postgresql_using='gin'),
+    )
 
     scout = relationship("Scout", backref="faqs")
 
@@ -56,11 +80,21 @@ class ScoutSchedule(Base):
 class ScoutUpdate(Base):
     __tablename__ = "scout_updates"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)  # SERIAL despite the composite key
     scout_id = Column(Integer, ForeignKey("scouts.id"), nullable=False)
     description = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)  # Partition key (migrations/006_partition_append_only.sql)
     created_by = Column(Integer, ForeignKey("daftar_team_members.id"), nullable=False)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(description, ''))", persisted=True)
+    )
+
+    __table_args__ = (
+        Index('ix_scout_updates_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_scout_updates_scout_id_created_at', 'scout_id', created_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     scout = relationship("Scout", backref="updates")
     creator = relationship("DaftarTeamMember", backref="scout_updates") 
\ No newline at end of file
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from auth import require_admin
+from database import get_db
+from schemas.admin import LoopLagResponse, ProfilingStart, ProfilingStatus, PurgeStatus
+from services.loop_lag import loop_lag
+from services.profiling import capture
+from services.purge import purger
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# Profiles and loop lag are per worker process; repeat calls may land on
+# different workers behind a load balancer.
+
+@router.post("/profiling", response_model=ProfilingStatus)
+async def start_profiling(options: ProfilingStart):
+    """Profile the next N requests or every request for a time window"""
+    capture.start(requests=options.requests, seconds=options.seconds, route=options.route)
+    return capture.status()
+
+@router.get("/profiling", response_model=ProfilingStatus)
+async def get_profiling_status():
+    """Capture state and the profiles recorded so far"""
+    return capture.status()
+
+@router.delete("/profiling", response_model=ProfilingStatus)
+async def stop_profiling():
+    """Stop capturing; recorded profiles are kept"""
+    capture.stop()
+    return capture.status()
+
+@router.get("/profiling/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    format: str = Query("html", pattern="^(html|speedscope)$")
+):
+    """Flame graph for one captured request, as HTML or speedscope JSON"""
+    profile = capture.find(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    rendered = capture.render(profile, format)
+    if format == "speedscope":
+        # Open at https://www.speedscope.app or with the speedscope CLI
+        return Response(
+            rendered,
+            media_type="application/json",
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'}
+        )
+    return HTMLResponse(rendered)
+
+@router.get("/loop-lag", response_model=LoopLagResponse)
+async def get_loop_lag():
+    """How late this worker's event loop has been running scheduled callbacks"""
+    return loop_lag.summary()
+
+@router.get("/purges", response_model=PurgeStatus)
+async def get_purge_status(db: AsyncSession = Depends(get_db)):
+    """Soft-deleted pitches still to purge and this worker's purge progress"""
+    result = await db.execute(text("SELECT COUNT(*) FROM pitches WHERE deleted_at IS NOT NULL"))
+    return {"pending": result.scalar_one(), **purger.status()}
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from auth import require_admin
+from services.analytics import REPORTS, duckdb, exported_tables, run_report
+from services.analytics_export import EXPORT_TABLES, load_watermarks
+from typing import Optional
+from datetime import datetime
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], dependencies=[Depends(require_admin)])
+
+# Reports read the Parquet export (jobs.export_analytics), never Postgres,
+# so they lag the database by up to one export interval.
+
+@router.get("")
+async def list_reports():
+    """Available reports and how far each table has been exported"""
+    return {"reports": sorted(REPORTS), "exported": load_watermarks()}
+
+@router.get("/{report}")
+async def get_report(
+    report: str,
+    daftar_id: Optional[int] = None,
+    since: Optional[datetime] = None
+):
+    """Run a report, optionally for one daftar and for rows created since a time"""
+    if report not in REPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+    
+    if duckdb is None or len(exported_tables()) < len(EXPORT_TABLES):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics export not available yet"
+        )
+    
+    rows = await run_report(report, daftar_id, since)
+    return {"report": report, "rows": rows, "exported": load_watermarks()}
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from schemas.archive import ArchivedScout, ArchivedScoutSummary
+from services.access import investor_in_daftar
+from services.scout_archive import get_archived_pitch, get_archived_scout, list_archived_scouts, visible_to_investor
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+router = APIRouter(prefix="/archive", tags=["archive"])
+
+# Archived documents never change, so clients may keep them
+ARCHIVE_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+# The slow path for scouts moved out of the hot tables. Documents are read
+# whole from archive.scouts and are not cached server side. Only active
+# members of the scout's daftar can read them, and each sees what the live
+# routes would show them.
+
+@router.get("/scouts", response_model=List[ArchivedScoutSummary])
+async def list_scouts(
+    daftar_id: int,
+    investor_id: int,
+    before: Optional[datetime] = None,  # archived_at of the last item on the previous page
+    before_id: Optional[int] = None,  # and its id
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+):
+    """Archived scouts of a daftar, most recently archived first; page with before and before_id"""
+    if not await investor_in_daftar(db, investor_id, daftar_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Daftar not found or investor does not have access"
+        )
+    
+    return await list_archived_scouts(db, daftar_id, before, before_id, limit)
+
+@router.get("/scouts/{scout_id}", response_model=ArchivedScout)
+async def get_scout(
+    scout_id: int,
+    investor_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """An archived scout with its pitches, documents, offers and notes"""
+    scout = await get_archived_scout(db, scout_id)
+    if not scout or not await investor_in_daftar(db, investor_id, scout["daftar_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived scout not found or investor does not have access"
+        )
+    
+    doc = scout["doc"]
+    scout["doc"] = {
+        **doc,
+        "pitches": [visible_to_investor(pitch, investor_id) for pitch in doc.get("pitches", [])]
+    }
+    response.headers["Cache-Control"] = ARCHIVE_CACHE_CONTROL
+    return scout
+
+@router.get("/pitches/{pitch_id}", response_model=Dict[str, Any])
+async def get_pitch(
+    pitch_id: int,
+    investor_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """An archived pitch with its documents, offers and notes"""
+    archived = await get_archived_pitch(db, pitch_id)
+    if not archived or not await investor_in_daftar(db, investor_id, archived["daftar_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived pitch not found or investor does not have access"
+        )
+    
+    response.headers["Cache-Control"] = ARCHIVE_CACHE_CONTROL
+    return visible_to_investor(archived["pitch"], investor_id)
@@ -5,6 +5,7 @@ from schemas.auth import GoogleAuthRequest
 from auth import verify_google_token, create_access_token
 from sqlalchemy import text
 from datetime import datetime, timedelta
+from services.soft_delete import live
 
 router = APIRouter(tags=["auth"])
 
@@ -29,11 +30,18 @@ async def login(auth_request: GoogleAuthRequest, db: AsyncSession = Depends(get_
     
     if auth_request.user_type == "founder":
         result = await db.execute(
-            text("SELECT * FROM founders WHERE email = :email"),
+            text(f"SELECT *, {live('founders')} AS live FROM founders WHERE email = :email"),
             {"email": email}
         )
         founder = result.first()
         
+        # Deactivated accounts keep their email, so they cannot sign up again either
+        if founder and not founder.live:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is deactivated"
+            )
+        
         if not founder:
             # Create new founder with required fields
             await db.execute(
@@ -63,11 +71,18 @@ async def login(auth_request: GoogleAuthRequest, db: AsyncSession = Depends(get_
         
     elif auth_request.user_type == "investor":
         result = await db.execute(
-            text("SELECT * FROM investors WHERE email = :email"),
+            text(f"SELECT *, {live('investors')} AS live FROM investors WHERE email = :email"),
             {"email": email}
         )
         investor = result.first()
         
+        # Deactivated accounts keep their email, so they cannot sign up again either
+        if investor and not investor.live:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is deactivated"
+            )
+        
         if not investor:
             # Create new investor with required fields
             await db.execute(
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from database import get_db
+from services.dataloader import Loaders, get_loaders
 from schemas.daftar import DaftarCreate, DaftarResponse
+from services.soft_delete import live
 from typing import List
 
 router = APIRouter(prefix="/daftars", tags=["daftar"])
@@ -11,15 +13,12 @@ router = APIRouter(prefix="/daftars", tags=["daftar"])
 async def create_daftar(
     daftar_data: DaftarCreate,
     investor_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a new daftar using an investor ID"""
     # Verify the investor exists
-    investor_check = await db.execute(
-        text("SELECT id FROM investors WHERE id = :investor_id"),
-        {"investor_id": investor_id}
-    )
-    if not investor_check.first():
+    if not await loaders.investors.load(investor_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Investor not found"
@@ -62,7 +61,7 @@ async def join_daftar(
     """Join a daftar using a daftar code"""
     # Verify the daftar exists
     daftar_check = await db.execute(
-        text("SELECT id FROM daftars WHERE daftar_code = :daftar_code AND is_active = true"),
+        text(f"SELECT id FROM daftars WHERE daftar_code = :daftar_code AND {live('daftars')}"),
         {"daftar_code": daftar_code}
     )
     daftar = daftar_check.first()
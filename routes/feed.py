@@ -0,0 +1,71 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from database import AsyncSessionLocal
+from services.access import founder_can_see_pitch, investor_can_see_pitch, investor_in_daftar
+from services.feed import hub, pitch_scope, daftar_scope
+
+router = APIRouter(prefix="/ws", tags=["feed"])
+
+async def stream_feed(websocket: WebSocket, scope: str):
+    """Push feed events for a scope until the client goes away"""
+    await websocket.accept()
+    queue = hub.connect(scope)
+
+    # Clients never send anything; reading only serves to notice disconnects
+    async def wait_for_disconnect():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    disconnected = asyncio.create_task(wait_for_disconnect())
+    try:
+        while True:
+            next_event = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnected},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if disconnected in done:
+                next_event.cancel()
+                break
+            await websocket.send_json(jsonable_encoder(next_event.result()))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        hub.disconnect(scope, queue)
+
+# Access is checked once, before accepting, with a short-lived session so
+# an open feed does not hold a database connection
+
+@router.websocket("/pitches/{pitch_id}")
+async def pitch_feed(
+    websocket: WebSocket,
+    pitch_id: int,
+    investor_id: Optional[int] = None,
+    founder_id: Optional[int] = None
+):
+    """Live questions, answers, documents and offer changes for a pitch"""
+    async with AsyncSessionLocal() as db:
+        allowed = (
+            (investor_id is not None and await investor_can_see_pitch(db, investor_id, pitch_id))
+            or (founder_id is not None and await founder_can_see_pitch(db, founder_id, pitch_id))
+        )
+    if not allowed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await stream_feed(websocket, pitch_scope(pitch_id))
+
+@router.websocket("/daftars/{daftar_id}")
+async def daftar_feed(websocket: WebSocket, daftar_id: int, investor_id: int):
+    """Live activity across every pitch submitted to a daftar's scouts"""
+    async with AsyncSessionLocal() as db:
+        allowed = await investor_in_daftar(db, investor_id, daftar_id)
+    if not allowed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await stream_feed(websocket, daftar_scope(daftar_id))
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from database import get_db
-from schemas.founder import FounderProfileResponse, InvestorQuestionResponse, QuestionAnswerResponse
-from typing import List
+from services.dataloader import Loaders, get_loaders
+from schemas.founder import FounderProfileResponse, InvestorQuestionResponse, QuestionAnswerResponse, UnansweredCountResponse
+from typing import List, Optional
+from datetime import datetime
 from schemas.pitch import PitchResponse
 from schemas.document import DocumentCreate, DocumentResponse
+from services.soft_delete import live
+from services.outbox import record_event
+from services.counters import bump_counters, get_counters
 
 router = APIRouter(prefix="/founder", tags=["founder"])
 
@@ -16,8 +21,8 @@ async def get_founder_profile(
 ):
     """Get founder profile details by ID"""
     founder = await db.execute(
-        text("""
-            SELECT * FROM founders WHERE id = :founder_id AND is_active = true AND deleted_on IS NULL
+        text(f"""
+            SELECT * FROM founders WHERE id = :founder_id AND {live("founders")}
         """),
         {"founder_id": founder_id}
     )
@@ -34,15 +39,13 @@ async def get_founder_profile(
 @router.get("/{founder_id}/pitches", response_model=List[PitchResponse])
 async def get_founder_pitches(
     founder_id: int,
-    db: AsyncSession = Depends(get_db)
+    with_counts: bool = False,
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Get all pitches for a founder"""
     # First check if founder exists
-    founder_query = await db.execute(
-        text("SELECT id FROM founders WHERE id = :founder_id"),
-        {"founder_id": founder_id}
-    )
-    founder = founder_query.first()
+    founder = await loaders.founders.load(founder_id)
     
     if not founder:
         raise HTTPException(
@@ -52,18 +55,25 @@ async def get_founder_pitches(
     
     # Get all pitches for this founder through the relationship table
     result = await db.execute(
-        text("""
+        text(f"""
             SELECT p.* 
             FROM pitches p
             JOIN founder_pitch_relationship fpr ON p.id = fpr.pitch_id
             WHERE fpr.founder_id = :founder_id
+            AND {live("pitches", "p")}
             ORDER BY p.created_at DESC
         """),
         {"founder_id": founder_id}
     )
     
-    pitches = result.fetchall()
-    return [dict(pitch) for pitch in pitches]
+    pitches = [dict(pitch._mapping) for pitch in result.fetchall()]
+    
+    if with_counts:
+        counts = await get_counters(db, "pitch", [pitch["id"] for pitch in pitches])
+        for pitch in pitches:
+            pitch["counts"] = counts[pitch["id"]]
+    
+    return pitches
 
 @router.get("/{founder_id}/pitches/{pitch_id}/questions", response_model=List[QuestionAnswerResponse])
 async def get_founder_pitch_questions(
@@ -74,10 +84,14 @@ async def get_founder_pitch_questions(
     """Get all investor questions and answers for a founder's pitch"""
     # First verify the founder exists and has access to this pitch
     access_check = await db.execute(
-        text("""
-            SELECT 1 FROM founder_pitch_relationship
-            WHERE founder_id = :founder_id 
-            AND pitch_id = :pitch_id
+        text(f"""
+            SELECT 1 FROM founder_pitch_relationship fpr
+            JOIN pitches p ON p.id = fpr.pitch_id
+            JOIN founders f ON f.id = fpr.founder_id
+            WHERE fpr.founder_id = :founder_id 
+            AND fpr.pitch_id = :pitch_id
+            AND {live("pitches", "p")}
+            AND {live("founders", "f")}
         """),
         {
             "founder_id": founder_id,
@@ -114,30 +128,51 @@ async def get_founder_pitch_questions(
 @router.get("/{founder_id}/questions/unanswered", response_model=List[QuestionAnswerResponse])
 async def get_founder_unanswered_questions(
     founder_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[int] = None,  # question_id of the last item on the previous page
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all unanswered questions across all pitches for a founder"""
-    # Get all unanswered questions from all founder's pitches
+    """Get unanswered questions across all pitches for a founder, newest first"""
+    # Served from the founder inbox, which the question and answer write
+    # paths keep up to date, so this is a range scan on its primary key
+    query = """
+        SELECT 
+            question_id,
+            question_text,
+            NULL as answer_video_url,
+            NULL as answer_text,
+            NULL as answered_at
+        FROM founder_question_inbox
+        WHERE founder_id = :founder_id
+    """
+    params = {"founder_id": founder_id, "limit": limit}
+    
+    if before is not None:
+        query += " AND question_id < :before"
+        params["before"] = before
+    
+    query += " ORDER BY question_id DESC LIMIT :limit"
+    
+    result = await db.execute(text(query), params)
+    
+    questions = result.fetchall()
+    return [dict(q._mapping) for q in questions]
+
+@router.get("/{founder_id}/questions/unanswered/count", response_model=UnansweredCountResponse)
+async def get_founder_unanswered_count(
+    founder_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the number of unanswered questions across all pitches for a founder"""
     result = await db.execute(
         text("""
-            SELECT 
-                q.id as question_id,
-                q.question_text,
-                NULL as answer_video_url,
-                NULL as answer_text,
-                NULL as answered_at
-            FROM investor_questions q
-            JOIN founder_pitch_relationship fpr ON q.pitch_id = fpr.pitch_id
-            LEFT JOIN question_answers a ON q.id = a.question_id
-            WHERE fpr.founder_id = :founder_id
-            AND a.id IS NULL
-            ORDER BY q.created_at DESC
+            SELECT COUNT(*) FROM founder_question_inbox
+            WHERE founder_id = :founder_id
         """),
         {"founder_id": founder_id}
     )
     
-    questions = result.fetchall()
-    return [dict(q) for q in questions]
+    return {"founder_id": founder_id, "unanswered": result.scalar_one()}
 
 @router.post("/{founder_id}/pitches/{pitch_id}/documents", response_model=DocumentResponse)
 async def upload_founder_document(
@@ -147,12 +182,18 @@ async def upload_founder_document(
     db: AsyncSession = Depends(get_db)
 ):
     """Upload a document to a pitch as a founder"""
-    # Verify founder has access to this pitch
+    # Verify founder has access to this pitch, holding the pitch row so it
+    # cannot be deleted before the document and its counters are written
     access_check = await db.execute(
-        text("""
-            SELECT 1 FROM founder_pitch_relationship
-            WHERE founder_id = :founder_id 
-            AND pitch_id = :pitch_id
+        text(f"""
+            SELECT 1 FROM founder_pitch_relationship fpr
+            JOIN pitches p ON p.id = fpr.pitch_id
+            JOIN founders f ON f.id = fpr.founder_id
+            WHERE fpr.founder_id = :founder_id 
+            AND fpr.pitch_id = :pitch_id
+            AND {live("pitches", "p")}
+            AND {live("founders", "f")}
+            FOR SHARE OF p
         """),
         {
             "founder_id": founder_id,
@@ -191,23 +232,49 @@ async def upload_founder_document(
             "founder_id": founder_id
         }
     )
+    new_document = result.first()
+    
+    await record_event(
+        db,
+        aggregate_type="document",
+        aggregate_id=new_document.id,
+        event_type="document.created",
+        payload={
+            "document_id": new_document.id,
+            "title": new_document.title,
+            "document_type": new_document.document_type,
+            "is_private": new_document.is_private,
+            "uploaded_by_type": "founder",
+            "uploaded_by_id": founder_id
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(db, "pitch", pitch_id, {"documents": 1})
     
     await db.commit()
-    return result.first()
+    return new_document
 
 @router.get("/{founder_id}/pitches/{pitch_id}/documents", response_model=List[DocumentResponse])
 async def get_founder_pitch_documents(
     founder_id: int,
     pitch_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=500),  # All documents unless a page is asked for
+    before: Optional[datetime] = None,  # uploaded_at of the last item on the previous page
+    before_id: Optional[int] = None,  # and its id
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all accessible documents for a pitch"""
+    """Get accessible documents for a pitch, newest first"""
     # Verify founder has access to this pitch
     access_check = await db.execute(
-        text("""
-            SELECT 1 FROM founder_pitch_relationship
-            WHERE founder_id = :founder_id 
-            AND pitch_id = :pitch_id
+        text(f"""
+            SELECT 1 FROM founder_pitch_relationship fpr
+            JOIN pitches p ON p.id = fpr.pitch_id
+            JOIN founders f ON f.id = fpr.founder_id
+            WHERE fpr.founder_id = :founder_id 
+            AND fpr.pitch_id = :pitch_id
+            AND {live("pitches", "p")}
+            AND {live("founders", "f")}
         """),
         {
             "founder_id": founder_id,
@@ -223,22 +290,31 @@ async def get_founder_pitch_documents(
     
     # Get documents
     # Founders can see all their own documents plus non-private investor documents
-    result = await db.execute(
-        text("""
-            SELECT * FROM documents
-            WHERE pitch_id = :pitch_id
-            AND (
-                (uploaded_by_type = 'founder' AND uploaded_by_id = :founder_id)
-                OR
-                (uploaded_by_type = 'investor' AND is_private = false)
-            )
-            ORDER BY uploaded_at DESC
-        """),
-        {
-            "pitch_id": pitch_id,
-            "founder_id": founder_id
-        }
-    )
+    query = """
+        SELECT * FROM documents
+        WHERE pitch_id = :pitch_id
+        AND (
+            (uploaded_by_type = 'founder' AND uploaded_by_id = :founder_id)
+            OR
+            (uploaded_by_type = 'investor' AND is_private = false)
+        )
+    """
+    params = {"pitch_id": pitch_id, "founder_id": founder_id, "limit": limit}
+    
+    # documents is partitioned by month of uploaded_at: the cursor prunes
+    # newer partitions and the LIMIT stops before reaching older ones
+    if before is not None:
+        # Keyset on (uploaded_at, id) so rows sharing the boundary timestamp are not
+        # skipped; the plain bound on uploaded_at keeps partition pruning
+        query += " AND uploaded_at <= :before AND (uploaded_at, id) < (:before, :before_id)"
+        params["before"] = before
+        params["before_id"] = before_id if before_id is not None else 0
+    
+    query += " ORDER BY uploaded_at DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT :limit"
+    
+    result = await db.execute(text(query), params)
     
     documents = result.fetchall()
-    return [dict(doc) for doc in documents] 
\ No newline at end of file
+    return [dict(doc._mapping) for doc in documents] 
\ No newline at end of file
@@ -1,12 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from database import get_db
-from schemas.investor import InvestorProfileResponse, DaftarProfileResponse, DaftarInvestorResponse, DaftarInvestorCreate, SampleQuestionResponse, CustomQuestionCreate, CustomQuestionResponse, InvestorNoteCreate, InvestorNoteResponse, TeamMemberAnalysisCreate, TeamMemberAnalysisResponse
+from services.dataloader import Loaders, get_loaders
+from schemas.investor import InvestorProfileResponse, DaftarProfileResponse, DaftarInvestorResponse, DaftarInvestorCreate, DaftarStatsResponse, SampleQuestionResponse, CustomQuestionCreate, CustomQuestionResponse, InvestorNoteCreate, InvestorNoteResponse, TeamMemberAnalysisCreate, TeamMemberAnalysisResponse
 from typing import List, Optional
+from datetime import datetime
 from schemas.document import DocumentCreate, DocumentResponse
 from schemas.offer import OfferCreate, OfferResponse, OfferActionCreate
 from schemas.bill import BillCreate, BillResponse
+from schemas.founder import InvestorQuestionCreate, InvestorQuestionResponse
+from services.soft_delete import live
+from services.outbox import record_event
+from services.inbox import add_question_to_inbox, remove_question_from_inbox
+from services.counters import bump_counters
+from services.daftar_stats import DAFTAR_STATS_INTERVAL, get_daftar_stats
+from services.etags import etag, not_modified
+from services.access import investor_in_daftar
 
 router = APIRouter(tags=["investor"])
 
@@ -17,8 +27,8 @@ async def get_investor_profile(
 ):
     """Get investor profile details by ID"""
     investor = await db.execute(
-        text("""
-            SELECT * FROM investors WHERE id = :investor_id AND is_active = true
+        text(f"""
+            SELECT * FROM investors WHERE id = :investor_id AND {live("investors")}
         """),
         {"investor_id": investor_id}
     )
@@ -39,8 +49,8 @@ async def get_daftar_profile(
 ):
     """Get daftar profile details by ID"""
     daftar = await db.execute(
-        text("""
-            SELECT * FROM daftars WHERE id = :daftar_id AND is_active = true
+        text(f"""
+            SELECT * FROM daftars WHERE id = :daftar_id AND {live("daftars")}
         """),
         {"daftar_id": daftar_id}
     )
@@ -57,15 +67,12 @@ async def get_daftar_profile(
 @router.get("/daftars/{daftar_id}/investors", response_model=List[DaftarInvestorResponse])
 async def get_daftar_investors(
     daftar_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Get all investors in a daftar"""
     # Check if daftar exists
-    daftar_query = await db.execute(
-        text("SELECT id FROM daftars WHERE id = :daftar_id"),
-        {"daftar_id": daftar_id}
-    )
-    if not daftar_query.first():
+    if not await loaders.daftars.load(daftar_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Daftar not found"
@@ -73,7 +80,7 @@ async def get_daftar_investors(
     
     # Get all active investors for this daftar
     result = await db.execute(
-        text("""
+        text(f"""
             SELECT 
                 di.id,
                 di.investor_id,
@@ -84,7 +91,9 @@ async def get_daftar_investors(
                 di.is_active
             FROM daftar_investors di
             JOIN investors i ON di.investor_id = i.id
-            WHERE di.daftar_id = :daftar_id AND di.is_active = true
+            WHERE di.daftar_id = :daftar_id
+            AND {live("daftar_investors", "di")}
+            AND {live("investors", "i")}
             ORDER BY di.joined_at DESC
         """),
         {"daftar_id": daftar_id}
@@ -93,38 +102,64 @@ async def get_daftar_investors(
     investors = result.fetchall()
     return [dict(investor) for investor in investors]
 
+@router.get("/daftars/{daftar_id}/stats", response_model=DaftarStatsResponse)
+async def get_daftar_stats_rollup(
+    daftar_id: int,
+    investor_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
+):
+    """Dashboard numbers for a daftar, from rollups refreshed in the background"""
+    if not await loaders.daftars.load(daftar_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Daftar not found"
+        )
+    
+    # Only admins see the daftar's numbers, as only they create bills
+    if not await investor_in_daftar(db, investor_id, daftar_id, role="admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view daftar stats"
+        )
+    
+    stats = await get_daftar_stats(db, daftar_id)
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Daftar stats not computed yet",
+            headers={"Retry-After": str(int(DAFTAR_STATS_INTERVAL))}
+        )
+    
+    # The rollups only change when the refresh job runs
+    headers = {
+        "ETag": etag(stats["version"]),
+        "Cache-Control": f"private, max-age={int(DAFTAR_STATS_INTERVAL)}"
+    }
+    if not_modified(request, stats["version"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return stats
+
 @router.post("/daftars/{daftar_id}/investors", response_model=DaftarInvestorResponse)
 async def add_investor_to_daftar(
     daftar_id: int,
     investor_data: DaftarInvestorCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Add an investor to a daftar"""
     # Check if daftar exists and is active
-    daftar_query = await db.execute(
-        text("SELECT id, is_active FROM daftars WHERE id = :daftar_id"),
-        {"daftar_id": daftar_id}
-    )
-    daftar = daftar_query.first()
-    
-    if not daftar:
+    if not await loaders.daftars.load(daftar_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Daftar not found"
         )
     
-    if not daftar.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This daftar is not active"
-        )
-    
     # Check if investor exists
-    investor_query = await db.execute(
-        text("SELECT id FROM investors WHERE id = :investor_id"),
-        {"investor_id": investor_data.investor_id}
-    )
-    investor = investor_query.first()
+    investor = await loaders.investors.load(investor_data.investor_id)
     
     if not investor:
         raise HTTPException(
@@ -134,9 +169,9 @@ async def add_investor_to_daftar(
     
     # Check if relationship already exists
     existing_query = await db.execute(
-        text("""
+        text(f"""
             SELECT id FROM daftar_investors 
-            WHERE daftar_id = :daftar_id AND investor_id = :investor_id AND is_active = true
+            WHERE daftar_id = :daftar_id AND investor_id = :investor_id AND {live("daftar_investors")}
         """),
         {"daftar_id": daftar_id, "investor_id": investor_data.investor_id}
     )
@@ -164,22 +199,12 @@ async def add_investor_to_daftar(
     new_relationship = result.first()
     await db.commit()
     
-    # Get investor details
-    investor_details = await db.execute(
-        text("""
-            SELECT i.first_name, i.last_name
-            FROM investors i
-            WHERE i.id = :investor_id
-        """),
-        {"investor_id": investor_data.investor_id}
-    )
-    investor_info = investor_details.first()
-    
+    # Investor details come from the row loaded for the existence check
     return {
         "id": new_relationship.id,
         "investor_id": investor_data.investor_id,
-        "first_name": investor_info.first_name,
-        "last_name": investor_info.last_name,
+        "first_name": investor.first_name,
+        "last_name": investor.last_name,
         "role": investor_data.role,
         "joined_at": new_relationship.joined_at,
         "is_active": True
@@ -188,15 +213,12 @@ async def add_investor_to_daftar(
 @router.get("/scouts/{scout_id}/sample-questions", response_model=List[SampleQuestionResponse])
 async def get_sample_questions(
     scout_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Get all sample questions and answers for a scout"""
     # Check if scout exists
-    scout_query = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": scout_id}
-    )
-    if not scout_query.first():
+    if not await loaders.any_scouts.load(scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
@@ -225,15 +247,12 @@ async def get_sample_questions(
 async def create_custom_question(
     scout_id: int,
     question_data: CustomQuestionCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a custom question for a scout"""
     # Check if scout exists
-    scout_query = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": scout_id}
-    )
-    if not scout_query.first():
+    if not await loaders.scouts.load(scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
@@ -262,15 +281,12 @@ async def create_custom_question(
 @router.get("/scouts/{scout_id}/custom-questions", response_model=List[CustomQuestionResponse])
 async def get_custom_questions(
     scout_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Get all custom questions for a scout"""
     # Check if scout exists
-    scout_query = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": scout_id}
-    )
-    if not scout_query.first():
+    if not await loaders.any_scouts.load(scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
@@ -289,6 +305,74 @@ async def get_custom_questions(
     questions = result.fetchall()
     return [dict(q) for q in questions]
 
+@router.post("/pitches/{pitch_id}/questions", response_model=InvestorQuestionResponse)
+async def create_investor_question(
+    pitch_id: int,
+    investor_id: int,
+    question: InvestorQuestionCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Ask the founders of a pitch a question"""
+    # Verify investor has access to this pitch
+    access_check = await db.execute(
+        text(f"""
+            SELECT 1 FROM pitches p
+            JOIN scouts s ON p.scout_id = s.id
+            JOIN daftar_investors di ON s.daftar_id = di.daftar_id
+            WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
+            AND di.investor_id = :investor_id
+            AND {live("daftar_investors", "di")}
+        """),
+        {
+            "pitch_id": pitch_id,
+            "investor_id": investor_id
+        }
+    )
+    
+    if not access_check.first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pitch not found or investor does not have access"
+        )
+    
+    result = await db.execute(
+        text("""
+            INSERT INTO investor_questions (
+                pitch_id, question_text, created_at
+            )
+            VALUES (
+                :pitch_id, :question_text, CURRENT_TIMESTAMP
+            )
+            RETURNING *
+        """),
+        {
+            "pitch_id": pitch_id,
+            "question_text": question.question_text
+        }
+    )
+    new_question = result.first()
+    
+    await add_question_to_inbox(db, new_question.id)
+    
+    await record_event(
+        db,
+        aggregate_type="investor_question",
+        aggregate_id=new_question.id,
+        event_type="question.created",
+        payload={
+            "question_id": new_question.id,
+            "investor_id": investor_id,
+            "question_text": new_question.question_text
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(db, "pitch", pitch_id, {"questions": 1})
+    
+    await db.commit()
+    return new_question
+
 @router.post("/pitches/{pitch_id}/questions/{question_id}/answers")
 async def create_question_answer(
     pitch_id: int,
@@ -305,11 +389,13 @@ async def create_question_answer(
             detail="Either answer_text or video_url must be provided"
         )
     
-    # Check if question exists and belongs to this pitch
+    # Check if question exists and belongs to this pitch; the row lock makes
+    # concurrent answers to the same question take turns
     question_query = await db.execute(
         text("""
             SELECT id FROM investor_questions 
             WHERE id = :question_id AND pitch_id = :pitch_id
+            FOR UPDATE
         """),
         {
             "question_id": question_id,
@@ -322,25 +408,16 @@ async def create_question_answer(
             detail="Question not found for this pitch"
         )
     
-    # Check if answer already exists
-    existing_answer = await db.execute(
-        text("SELECT id FROM question_answers WHERE question_id = :question_id"),
-        {"question_id": question_id}
-    )
-    if existing_answer.first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Answer already exists for this question"
-        )
-    
-    # Create answer
+    # Create the answer only if it is the question's first, checked in the
+    # same statement, so answered_questions counts each question once
     result = await db.execute(
         text("""
             INSERT INTO question_answers (
                 question_id, answer_text, video_url, answered_at
             )
-            VALUES (
-                :question_id, :answer_text, :video_url, CURRENT_TIMESTAMP
+            SELECT :question_id, :answer_text, :video_url, CURRENT_TIMESTAMP
+            WHERE NOT EXISTS (
+                SELECT 1 FROM question_answers WHERE question_id = :question_id
             )
             RETURNING *
         """),
@@ -350,6 +427,29 @@ async def create_question_answer(
             "video_url": video_url
         }
     )
+    new_answer = result.first()
+    if not new_answer:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Answer already exists for this question"
+        )
+    
+    await remove_question_from_inbox(db, question_id)
+    
+    await record_event(
+        db,
+        aggregate_type="question_answer",
+        aggregate_id=new_answer.id,
+        event_type="answer.created",
+        payload={
+            "answer_id": new_answer.id,
+            "question_id": question_id,
+            "has_video": video_url is not None
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(db, "pitch", pitch_id, {"answered_questions": 1})
     
     await db.commit()
     return {"status": "success", "message": "Answer created successfully"}
@@ -364,13 +464,14 @@ async def upload_investor_document(
     """Upload a document to a pitch as an investor"""
     # Verify investor has access to this pitch (through scout/daftar)
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_investors di ON s.daftar_id = di.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND di.investor_id = :investor_id
-            AND di.is_active = true
+            AND {live("daftar_investors", "di")}
         """),
         {
             "pitch_id": pitch_id,
@@ -409,26 +510,49 @@ async def upload_investor_document(
             "investor_id": investor_id
         }
     )
+    new_document = result.first()
+    
+    await record_event(
+        db,
+        aggregate_type="document",
+        aggregate_id=new_document.id,
+        event_type="document.created",
+        payload={
+            "document_id": new_document.id,
+            "title": new_document.title,
+            "document_type": new_document.document_type,
+            "is_private": new_document.is_private,
+            "uploaded_by_type": "investor",
+            "uploaded_by_id": investor_id
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(db, "pitch", pitch_id, {"documents": 1})
     
     await db.commit()
-    return result.first()
+    return new_document
 
 @router.get("/pitches/{pitch_id}/documents", response_model=List[DocumentResponse])
 async def get_investor_pitch_documents(
     pitch_id: int,
     investor_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=500),  # All documents unless a page is asked for
+    before: Optional[datetime] = None,  # uploaded_at of the last item on the previous page
+    before_id: Optional[int] = None,  # and its id
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all accessible documents for a pitch"""
+    """Get accessible documents for a pitch, newest first"""
     # Verify investor has access to this pitch
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_investors di ON s.daftar_id = di.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND di.investor_id = :investor_id
-            AND di.is_active = true
+            AND {live("daftar_investors", "di")}
         """),
         {
             "pitch_id": pitch_id,
@@ -444,25 +568,33 @@ async def get_investor_pitch_documents(
     
     # Get documents
     # Investors can see all their own documents plus non-private founder documents
-    result = await db.execute(
-        text("""
-            SELECT * FROM documents
-            WHERE pitch_id = :pitch_id
-            AND (
-                (uploaded_by_type = 'investor' AND uploaded_by_id = :investor_id)
-                OR
-                (uploaded_by_type = 'founder' AND is_private = false)
-            )
-            ORDER BY uploaded_at DESC
-        """),
-        {
-            "pitch_id": pitch_id,
-            "investor_id": investor_id
-        }
-    )
+    query = """
+        SELECT * FROM documents
+        WHERE pitch_id = :pitch_id
+        AND (
+            (uploaded_by_type = 'investor' AND uploaded_by_id = :investor_id)
+            OR
+            (uploaded_by_type = 'founder' AND is_private = false)
+        )
+    """
+    params = {"pitch_id": pitch_id, "investor_id": investor_id, "limit": limit}
+    
+    # Partition-pruned page, as for founders
+    if before is not None:
+        # Keyset on (uploaded_at, id) so rows sharing the boundary timestamp are not
+        # skipped; the plain bound on uploaded_at keeps partition pruning
+        query += " AND uploaded_at <= :before AND (uploaded_at, id) < (:before, :before_id)"
+        params["before"] = before
+        params["before_id"] = before_id if before_id is not None else 0
+    
+    query += " ORDER BY uploaded_at DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT :limit"
+    
+    result = await db.execute(text(query), params)
     
     documents = result.fetchall()
-    return [dict(doc) for doc in documents]
+    return [dict(doc._mapping) for doc in documents]
 
 @router.post("/pitches/{pitch_id}/offers", response_model=OfferResponse)
 async def create_offer(
@@ -474,13 +606,14 @@ async def create_offer(
     """Create a new offer for a pitch"""
     # Verify investor has access to this pitch
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_investors di ON s.daftar_id = di.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND di.investor_id = :investor_id
-            AND di.is_active = true
+            AND {live("daftar_investors", "di")}
         """),
         {
             "pitch_id": pitch_id,
@@ -517,9 +650,25 @@ async def create_offer(
             "notes": offer.notes
         }
     )
+    new_offer = result.first()
+    
+    await record_event(
+        db,
+        aggregate_type="offer",
+        aggregate_id=new_offer.id,
+        event_type="offer.created",
+        payload={
+            "offer_id": new_offer.id,
+            "investor_id": investor_id,
+            "status": new_offer.status
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(db, "pitch", pitch_id, {"offers_pending": 1})
     
     await db.commit()
-    return result.first()
+    return new_offer
 
 @router.get("/pitches/{pitch_id}/offers", response_model=List[OfferResponse])
 async def get_pitch_offers(
@@ -553,48 +702,53 @@ async def take_offer_action(
     db: AsyncSession = Depends(get_db)
 ):
     """Take action on an offer (withdraw)"""
-    # Verify offer exists and belongs to investor
-    offer_check = await db.execute(
+    if action.action != 'withdraw':
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Investors can only withdraw offers"
+        )
+    
+    # Withdraw only a pending offer of this investor, checked in the same
+    # statement, so concurrent withdrawals move the counters once
+    result = await db.execute(
         text("""
-            SELECT status FROM offers
+            UPDATE offers
+            SET status = 'withdrawn'
             WHERE id = :offer_id
             AND investor_id = :investor_id
+            AND status = 'pending'
+            RETURNING pitch_id
         """),
         {
             "offer_id": offer_id,
             "investor_id": investor_id
         }
     )
-    offer = offer_check.first()
-    
-    if not offer:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Offer not found"
+    pitch_id = result.scalar_one_or_none()
+    
+    if pitch_id is None:
+        offer_check = await db.execute(
+            text("""
+                SELECT status FROM offers
+                WHERE id = :offer_id
+                AND investor_id = :investor_id
+            """),
+            {
+                "offer_id": offer_id,
+                "investor_id": investor_id
+            }
         )
-    
-    if offer.status != 'pending':
+        offer_status = offer_check.scalar_one_or_none()
+        if offer_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Offer not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot {action.action} offer with status {offer.status}"
+            detail=f"Cannot {action.action} offer with status {offer_status}"
         )
     
-    if action.action != 'withdraw':
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Investors can only withdraw offers"
-        )
-    
-    # Update offer status
-    await db.execute(
-        text("""
-            UPDATE offers
-            SET status = 'withdrawn'
-            WHERE id = :offer_id
-        """),
-        {"offer_id": offer_id}
-    )
-    
     # Record action
     await db.execute(
         text("""
@@ -613,6 +767,28 @@ async def take_offer_action(
         }
     )
     
+    # Publish the status change through the outbox in the same transaction
+    await record_event(
+        db,
+        aggregate_type="offer",
+        aggregate_id=offer_id,
+        event_type="offer.withdrawn",
+        payload={
+            "offer_id": offer_id,
+            "investor_id": investor_id,
+            "action": action.action,
+            "previous_status": "pending",
+            "status": "withdrawn",
+            "notes": action.notes
+        },
+        pitch_id=pitch_id
+    )
+    
+    await bump_counters(
+        db, "pitch", pitch_id,
+        {"offers_pending": -1, "offers_withdrawn": 1}
+    )
+    
     await db.commit()
     return {"status": "success", "message": "Offer withdrawn successfully"}
 
@@ -626,13 +802,14 @@ async def create_bill(
     """Create a new bill for a pitch"""
     # Verify investor has access to create bills
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_investors di ON s.daftar_id = di.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND di.investor_id = :investor_id
-            AND di.is_active = true
+            AND {live("daftar_investors", "di")}
             AND di.role = 'admin'  # Only admins can create bills
         """),
         {
@@ -682,13 +859,14 @@ async def create_investor_note(
     """Create a note for a specific pitch"""
     # Verify investor has access to this pitch
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_investors di ON s.daftar_id = di.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND di.investor_id = :investor_id
-            AND di.is_active = true
+            AND {live("daftar_investors", "di")}
         """),
         {
             "pitch_id": pitch_id,
@@ -719,28 +897,43 @@ async def create_investor_note(
         }
     )
     
+    new_note = result.first()
+    
+    await bump_counters(db, "pitch", pitch_id, {"notes": 1})
+    
     await db.commit()
-    return result.first()
+    return new_note
 
 @router.get("/pitches/{pitch_id}/notes", response_model=List[InvestorNoteResponse])
 async def get_investor_notes(
     pitch_id: int,
     investor_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=500),  # All notes unless a page is asked for
+    before: Optional[datetime] = None,  # created_at of the last item on the previous page
+    before_id: Optional[int] = None,  # and its id
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all notes for a specific pitch"""
-    result = await db.execute(
-        text("""
-            SELECT * FROM investor_notes
-            WHERE pitch_id = :pitch_id
-            AND investor_id = :investor_id
-            ORDER BY created_at DESC
-        """),
-        {
-            "pitch_id": pitch_id,
-            "investor_id": investor_id
-        }
-    )
+    """Get notes for a specific pitch, newest first"""
+    query = """
+        SELECT * FROM investor_notes
+        WHERE pitch_id = :pitch_id
+        AND investor_id = :investor_id
+    """
+    params = {"pitch_id": pitch_id, "investor_id": investor_id, "limit": limit}
+    
+    # investor_notes is partitioned by month of created_at
+    if before is not None:
+        # Keyset on (created_at, id) so rows sharing the boundary timestamp are not
+        # skipped; the plain bound on created_at keeps partition pruning
+        query += " AND created_at <= :before AND (created_at, id) < (:before, :before_id)"
+        params["before"] = before
+        params["before_id"] = before_id if before_id is not None else 0
+    
+    query += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT :limit"
+    
+    result = await db.execute(text(query), params)
     
     return result.fetchall()
 
@@ -754,11 +947,12 @@ async def create_team_analysis(
     """Create a team member analysis for a specific pitch"""
     # Verify team member has access
     access_check = await db.execute(
-        text("""
+        text(f"""
             SELECT 1 FROM pitches p
             JOIN scouts s ON p.scout_id = s.id
             JOIN daftar_team_members dtm ON s.daftar_id = dtm.daftar_id
             WHERE p.id = :pitch_id 
+            AND {live("pitches", "p")}
             AND dtm.id = :team_member_id
             AND dtm.is_active = true
         """),
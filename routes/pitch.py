@@ -1,25 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from database import get_db
+from services.dataloader import Loaders, get_loaders
 from schemas.pitch import PitchResponse, PitchCreate, PitchUpdate
 from schemas.invite import DaftarInviteResponse, DaftarInviteCreate, PitchTeamInviteResponse, PitchTeamInviteCreate
-from typing import List
+from typing import List, Optional, Tuple
+from services.outbox import record_event
+from services.counters import bump_counters, get_counters
+from services.soft_delete import live
+from services.inbox import remove_pitch_from_inbox
+from services.etags import check_versioned_update, etag, not_modified, parse_if_match, versioned_update_sql
 
 router = APIRouter(prefix="/pitches", tags=["pitch"])
 
 @router.post("/", response_model=PitchResponse)
 async def create_pitch(
     pitch_data: PitchCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a new pitch"""
     # Check if scout exists
-    scout_query = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": pitch_data.scout_id}
-    )
-    if not scout_query.first():
+    if not await loaders.scouts.load(pitch_data.scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
@@ -50,17 +53,21 @@ async def create_pitch(
     )
     
     new_pitch = result.first()
+    await bump_counters(db, "scout", pitch_data.scout_id, {"pitches": 1})
     await db.commit()
     return new_pitch
 
 @router.get("/{pitch_id}", response_model=PitchResponse)
 async def get_pitch(
     pitch_id: int,
+    request: Request,
+    response: Response,
+    with_counts: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get pitch details by ID"""
+    """Get pitch details by ID, honouring If-None-Match"""
     pitch = await db.execute(
-        text("SELECT * FROM pitches WHERE id = :pitch_id"),
+        text(f"SELECT * FROM pitches WHERE id = :pitch_id AND {live('pitches')}"),
         {"pitch_id": pitch_id}
     )
     result = pitch.first()
@@ -70,112 +77,123 @@ async def get_pitch(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Pitch not found"
         )
-        
+    
+    if with_counts:
+        # Counters change without a version bump, so these are not cached
+        counts = await get_counters(db, "pitch", [pitch_id])
+        return {**result._mapping, "counts": counts[pitch_id]}
+    
+    if not_modified(request, result.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag(result.version)})
+    response.headers["ETag"] = etag(result.version)
     return result
 
+# Columns a PitchUpdate may set, in the order they appear in the SET clause
+PITCH_UPDATE_FIELDS = [
+    "pitch_name",
+    "founder_language",
+    "ask_for_investor",
+    "has_confirmed",
+    "status_founder",
+    "demo_link",
+]
+
+def build_pitch_update(
+    pitch_id: int,
+    pitch_data: PitchUpdate,
+    expected_versions: Optional[List[int]] = None
+) -> Optional[Tuple[str, dict]]:
+    """Conditional UPDATE and binds for the fields that were provided, or None"""
+    update_fields = {
+        field: getattr(pitch_data, field)
+        for field in PITCH_UPDATE_FIELDS
+        if getattr(pitch_data, field) is not None
+    }
+    if not update_fields:
+        return None
+    
+    set_clause = ", ".join(f"{field} = :{field}" for field in update_fields)
+    update_fields["id"] = pitch_id
+    update_fields["expected_versions"] = expected_versions
+    return versioned_update_sql("pitches", set_clause), update_fields
+
 @router.patch("/{pitch_id}", response_model=PitchResponse)
 async def update_pitch(
     pitch_id: int,
     pitch_data: PitchUpdate,
-    db: AsyncSession = Depends(get_db)
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
-    """Update pitch details"""
-    # Check if pitch exists
-    pitch_query = await db.execute(
-        text("SELECT id FROM pitches WHERE id = :pitch_id"),
-        {"pitch_id": pitch_id}
-    )
-    if not pitch_query.first():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Pitch not found"
-        )
+    """Update pitch details, optionally only if If-Match has the current version"""
+    expected_versions = parse_if_match(if_match)
     
     # Build update query dynamically based on provided fields
-    update_fields = {}
-    update_query_parts = []
-    
-    if pitch_data.pitch_name is not None:
-        update_fields["pitch_name"] = pitch_data.pitch_name
-        update_query_parts.append("pitch_name = :pitch_name")
-        
-    if pitch_data.founder_language is not None:
-        update_fields["founder_language"] = pitch_data.founder_language
-        update_query_parts.append("founder_language = :founder_language")
-        
-    if pitch_data.ask_for_investor is not None:
-        update_fields["ask_for_investor"] = pitch_data.ask_for_investor
-        update_query_parts.append("ask_for_investor = :ask_for_investor")
-        
-    if pitch_data.has_confirmed is not None:
-        update_fields["has_confirmed"] = pitch_data.has_confirmed
-        update_query_parts.append("has_confirmed = :has_confirmed")
-        
-    if pitch_data.status_founder is not None:
-        update_fields["status_founder"] = pitch_data.status_founder
-        update_query_parts.append("status_founder = :status_founder")
-        
-    if pitch_data.demo_link is not None:
-        update_fields["demo_link"] = pitch_data.demo_link
-        update_query_parts.append("demo_link = :demo_link")
-    
-    if not update_fields:
-        return await get_pitch(pitch_id, db)
-    
-    # Add pitch_id to update fields
-    update_fields["pitch_id"] = pitch_id
+    update = build_pitch_update(pitch_id, pitch_data, expected_versions)
+    if update is None:
+        # Nothing to write, but the preconditions still apply
+        pitch = await loaders.pitches.load(pitch_id)
+        if not pitch:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Pitch not found"
+            )
+        if expected_versions is not None and pitch.version not in expected_versions:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="If-Match does not match the current version",
+                headers={"ETag": etag(pitch.version)}
+            )
+        response.headers["ETag"] = etag(pitch.version)
+        return pitch
     
-    # Execute update query
-    result = await db.execute(
-        text(f"""
-            UPDATE pitches
-            SET {", ".join(update_query_parts)}
-            WHERE id = :pitch_id
-            RETURNING *
-        """),
-        update_fields
-    )
+    # The UPDATE checks existence and version itself
+    sql, params = update
+    result = await db.execute(text(sql), params)
+    pitch = result.first()
+    check_versioned_update(pitch, response, "Pitch not found")
     
     await db.commit()
-    return result.first()
+    return pitch
 
 @router.delete("/{pitch_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pitch(
     pitch_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a pitch"""
-    # Check if pitch exists
-    pitch_query = await db.execute(
-        text("SELECT id FROM pitches WHERE id = :pitch_id"),
+    """Delete a pitch; it is hidden now and purged with its child rows by jobs.purge_pitches"""
+    result = await db.execute(
+        text(f"""
+            UPDATE pitches
+            SET deleted_at = CURRENT_TIMESTAMP, version = version + 1
+            WHERE id = :pitch_id AND {live("pitches")}
+            RETURNING scout_id
+        """),
         {"pitch_id": pitch_id}
     )
-    if not pitch_query.first():
+    scout_id = result.scalar_one_or_none()
+    
+    if scout_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Pitch not found"
         )
     
-    # Delete pitch
-    await db.execute(
-        text("DELETE FROM pitches WHERE id = :pitch_id"),
-        {"pitch_id": pitch_id}
-    )
+    await bump_counters(db, "scout", scout_id, {"pitches": -1})
+    await remove_pitch_from_inbox(db, pitch_id)
     await db.commit()
 
 @router.post("/{pitch_id}/team/invite", response_model=PitchTeamInviteResponse)
 async def invite_team_member(
     pitch_id: int,
     invite_data: PitchTeamInviteCreate,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Invite a member to pitch team"""
     # Check if pitch exists
-    pitch_query = await db.execute(
-        text("SELECT id FROM pitches WHERE id = :pitch_id"),
-        {"pitch_id": pitch_id}
-    )
-    if not pitch_query.first():
+    if not await loaders.pitches.load(pitch_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Pitch not found"
@@ -222,6 +240,22 @@ async def invite_team_member(
             "role": invite_data.role
         }
     )
+    invite = result.first()
+    
+    # Publish the new invite through the outbox in the same transaction
+    await record_event(
+        db,
+        aggregate_type="pitch_team_invite",
+        aggregate_id=invite.id,
+        event_type="pitch_team_invite.created",
+        payload={
+            "invite_id": invite.id,
+            "pitch_id": pitch_id,
+            "invited_email": invite.invited_email,
+            "role": invite.role,
+            "status": invite.status
+        }
+    )
     
     await db.commit()
-    return result.first() 
\ No newline at end of file
+    return invite 
\ No newline at end of file
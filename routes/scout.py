@@ -1,18 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from database import get_db
+from services.dataloader import Loaders, get_loaders
 from schemas.scout import (
     ScoutCreate, ScoutResponse, ScoutDetailsUpdate, 
     ScoutAudienceUpdate, ScoutCollaborationUpdate,
     ScoutFAQCreate, ScoutFAQResponse,
     ScoutScheduleCreate, ScoutScheduleResponse,
-    ScoutUpdateCreate, ScoutUpdateResponse
+    ScoutUpdateCreate, ScoutUpdateResponse,
+    ScoutMatchResponse, ScoutDiscoveryResponse,
+    ScoutBulkApprove, ScoutBulkArchive, ScoutBulkTransitionResponse
 )
 from typing import List, Optional
+from datetime import datetime
+from services.counters import bump_counters, get_counters
+from services.outbox import record_event
+from services.matching import matcher
+from services.discovery import discover_scouts, facet_counts
+from services.etags import check_versioned_update, etag, not_modified, parse_if_match, versioned_update_sql
+from services.soft_delete import live
+from services.scout_lifecycle import TRANSITIONS, Transition, transition_scouts
+from auth import require_admin
 
 router = APIRouter(prefix="/scouts", tags=["scout"])
 
+def _audience_payload(scout) -> dict:
+    """Fields the scout matcher needs to (re-)index a scout"""
+    return {
+        "scout_id": scout.id,
+        "daftar_id": scout.daftar_id,
+        "name": scout.name,
+        "status": scout.status,
+        "location": scout.location,
+        "community": scout.community,
+        "age_range": scout.age_range,
+        "stage": scout.stage,
+        "sector": scout.sector
+    }
+
+async def _transition_one(db: AsyncSession, transition: Transition, scout_id: int, response: Response, actor_id: Optional[int] = None):
+    """Apply a lifecycle transition to one scout, mapping the outcome to 404/400"""
+    moved, unchanged = await transition_scouts(db, transition, [scout_id], actor_id)
+    
+    if not moved and not unchanged:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scout not found"
+        )
+    if not moved:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=transition.error
+        )
+    
+    await db.commit()
+    response.headers["ETag"] = etag(moved[0].version)
+    return moved[0]
+
+async def _transition_many(db: AsyncSession, transition: Transition, scout_ids: List[int], actor_id: Optional[int] = None):
+    """Apply a lifecycle transition to every listed scout that allows it"""
+    scout_ids = list(dict.fromkeys(scout_ids))
+    moved, unchanged = await transition_scouts(db, transition, scout_ids, actor_id)
+    await db.commit()
+    
+    found = {scout.id for scout in moved} | {scout.id for scout in unchanged}
+    return {
+        "transitioned": moved,
+        "skipped": [{"id": scout.id, "status": scout.status} for scout in unchanged],
+        "not_found": [scout_id for scout_id in scout_ids if scout_id not in found]
+    }
+
 @router.post("/", response_model=ScoutResponse)
 async def create_scout(
     scout_data: ScoutCreate,
@@ -39,46 +97,46 @@ async def create_scout(
 async def update_scout_details(
     scout_id: int,
     details: ScoutDetailsUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Update scout name and vision"""
     result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET name = :name, vision = :vision
-            WHERE id = :scout_id
-            RETURNING *
-        """),
+        text(versioned_update_sql("scouts", "name = :name, vision = :vision")),
         {
-            "scout_id": scout_id,
+            "id": scout_id,
+            "expected_versions": parse_if_match(if_match),
             "name": details.name,
             "vision": details.vision
         }
     )
+    scout = result.first()
+    check_versioned_update(scout, response, "Scout not found")
     
     await db.commit()
-    return result.first()
+    return scout
 
 @router.put("/{scout_id}/audience", response_model=ScoutResponse)
 async def update_scout_audience(
     scout_id: int,
     audience: ScoutAudienceUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Update scout audience details"""
     result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET location = :location,
+        text(versioned_update_sql("scouts", """
+                location = :location,
                 community = :community,
                 age_range = :age_range,
                 stage = :stage,
                 sector = :sector
-            WHERE id = :scout_id
-            RETURNING *
-        """),
+        """)),
         {
-            "scout_id": scout_id,
+            "id": scout_id,
+            "expected_versions": parse_if_match(if_match),
             "location": audience.location,
             "community": audience.community,
             "age_range": audience.age_range,
@@ -87,35 +145,49 @@ async def update_scout_audience(
         }
     )
     
+    scout = result.first()
+    check_versioned_update(scout, response, "Scout not found")
+    
+    # Lets every worker re-index the scout for matching
+    await record_event(
+        db,
+        aggregate_type="scout",
+        aggregate_id=scout_id,
+        event_type="scout.audience_updated",
+        payload=_audience_payload(scout)
+    )
+    
     await db.commit()
-    return result.first()
+    return scout
 
 @router.put("/{scout_id}/collaboration", response_model=ScoutResponse)
 async def update_scout_collaboration(
     scout_id: int,
     collab: ScoutCollaborationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db)
 ):
     """Update scout collaboration details"""
     result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET team_size = :team_size,
+        text(versioned_update_sql("scouts", """
+                team_size = :team_size,
                 collaboration_type = :collaboration_type,
                 collaboration_details = :collaboration_details
-            WHERE id = :scout_id
-            RETURNING *
-        """),
+        """)),
         {
-            "scout_id": scout_id,
+            "id": scout_id,
+            "expected_versions": parse_if_match(if_match),
             "team_size": collab.team_size,
             "collaboration_type": collab.collaboration_type,
             "collaboration_details": collab.collaboration_details
         }
     )
+    scout = result.first()
+    check_versioned_update(scout, response, "Scout not found")
     
     await db.commit()
-    return result.first()
+    return scout
 
 @router.post("/{scout_id}/faqs", response_model=ScoutFAQResponse)
 async def create_scout_faq(
@@ -141,13 +213,89 @@ async def create_scout_faq(
         }
     )
     
+    new_faq = result.first()
+    
+    await bump_counters(db, "scout", scout_id, {"faqs": 1})
+    
     await db.commit()
-    return result.first()
+    return new_faq
+
+@router.get("/match", response_model=List[ScoutMatchResponse])
+async def match_scouts(
+    sector: Optional[str] = None,
+    stage: Optional[str] = None,
+    location: Optional[str] = None,  # country/state/city
+    community: Optional[str] = None,
+    age: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Rank open scouts whose audience fits a founder profile"""
+    # Served entirely from the in-memory index, no database round trip
+    return matcher.match(
+        {
+            "sector": sector,
+            "stage": stage,
+            "location": location,
+            "community": community,
+            "age": age
+        },
+        limit=limit
+    )
+
+@router.get("/discover", response_model=ScoutDiscoveryResponse)
+async def discover(
+    daftar_id: Optional[int] = None,
+    stage: Optional[List[str]] = Query(None),
+    sector: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    community: Optional[List[str]] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status"),  # Archived scouts are hidden unless listed here
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,  # next_cursor from the previous page
+    db: AsyncSession = Depends(get_db)
+):
+    """Browse scouts by facet, with counts for every facet value"""
+    filters = {
+        "stage": stage,
+        "sector": sector,
+        "location": location,
+        "community": community,
+        "status": status_filter
+    }
+    
+    try:
+        scouts, next_cursor = await discover_scouts(db, daftar_id, filters, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    
+    facets = await facet_counts(db, daftar_id, filters)
+    
+    return {"items": scouts, "facets": facets, "next_cursor": next_cursor}
+
+@router.post("/bulk/approve", response_model=ScoutBulkTransitionResponse, dependencies=[Depends(require_admin)])
+async def bulk_approve_scouts(
+    bulk: ScoutBulkApprove,
+    db: AsyncSession = Depends(get_db)
+):
+    """Approve many pending scouts in one statement"""
+    return await _transition_many(db, TRANSITIONS["approve"], bulk.scout_ids, bulk.approver_id)
+
+@router.post("/bulk/archive", response_model=ScoutBulkTransitionResponse, dependencies=[Depends(require_admin)])
+async def bulk_archive_scouts(
+    bulk: ScoutBulkArchive,
+    db: AsyncSession = Depends(get_db)
+):
+    """Archive many scouts in one statement"""
+    return await _transition_many(db, TRANSITIONS["archive"], bulk.scout_ids, bulk.approver_id)
 
 @router.get("/", response_model=List[ScoutResponse])
 async def get_scouts(
     daftar_id: Optional[int] = None,  # Make daftar_id optional
     include_archived: bool = False,  # Optional parameter to include archived scouts
+    with_counts: bool = False,  # Attach pitch/update/FAQ counters
     db: AsyncSession = Depends(get_db)
 ):
     """Get all scouts, optionally filtered by daftar_id"""
@@ -159,7 +307,7 @@ async def get_scouts(
 
     # Exclude archived scouts unless specified
     if not include_archived:
-        query += " AND status != 'archived'"
+        query += f" AND {live('scouts')}"
 
     query += " ORDER BY created_at DESC"
 
@@ -169,8 +317,39 @@ async def get_scouts(
         {"daftar_id": daftar_id} if daftar_id is not None else {}
     )
 
-    scouts = result.fetchall()
-    return [dict(scout) for scout in scouts]
+    scouts = [dict(scout._mapping) for scout in result.fetchall()]
+
+    if with_counts:
+        counts = await get_counters(db, "scout", [scout["id"] for scout in scouts])
+        for scout in scouts:
+            scout["counts"] = counts[scout["id"]]
+
+    return scouts
+
+@router.get("/{scout_id}", response_model=ScoutResponse)
+async def get_scout(
+    scout_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get scout details by ID, honouring If-None-Match"""
+    result = await db.execute(
+        text("SELECT * FROM scouts WHERE id = :scout_id"),
+        {"scout_id": scout_id}
+    )
+    scout = result.first()
+    
+    if not scout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scout not found"
+        )
+    
+    if not_modified(request, scout.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag(scout.version)})
+    response.headers["ETag"] = etag(scout.version)
+    return scout
 
 @router.post("/{scout_id}/schedule", response_model=ScoutScheduleResponse)
 async def create_scout_schedule(
@@ -203,73 +382,33 @@ async def create_scout_schedule(
 @router.put("/{scout_id}/submit", response_model=ScoutResponse)
 async def submit_scout_for_approval(
     scout_id: int,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """Submit scout for approval"""
-    result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET status = 'pending'
-            WHERE id = :scout_id AND status = 'draft'
-            RETURNING *
-        """),
-        {"scout_id": scout_id}
-    )
-    
-    if not result.first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Scout must be in draft status to submit"
-        )
-    
-    await db.commit()
-    return result.first()
+    return await _transition_one(db, TRANSITIONS["submit"], scout_id, response)
 
 @router.put("/{scout_id}/approve", response_model=ScoutResponse)
 async def approve_scout(
     scout_id: int,
     approver_id: int,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """Approve a scout"""
-    result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET status = 'approved',
-                approved_at = CURRENT_TIMESTAMP,
-                approved_by = :approver_id
-            WHERE id = :scout_id AND status = 'pending'
-            RETURNING *
-        """),
-        {
-            "scout_id": scout_id,
-            "approver_id": approver_id
-        }
-    )
-    
-    if not result.first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Scout must be in pending status to approve"
-        )
-    
-    await db.commit()
-    return result.first()
+    return await _transition_one(db, TRANSITIONS["approve"], scout_id, response, approver_id)
 
 @router.post("/{scout_id}/updates", response_model=ScoutUpdateResponse)
 async def create_scout_update(
     scout_id: int,
     update: ScoutUpdateCreate,
     creator_id: int,  # This would typically come from auth token
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a new update for a scout"""
     # First verify the scout exists
-    scout_check = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": scout_id}
-    )
-    if not scout_check.first():
+    if not await loaders.scouts.load(scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
@@ -293,38 +432,49 @@ async def create_scout_update(
         }
     )
     
+    new_update = result.first()
+    
+    await bump_counters(db, "scout", scout_id, {"updates": 1})
+    
     await db.commit()
-    return result.first()
+    return new_update
 
 @router.get("/{scout_id}/updates", response_model=List[ScoutUpdateResponse])
 async def get_scout_updates(
     scout_id: int,
-    db: AsyncSession = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=500),  # All updates unless a page is asked for
+    before: Optional[datetime] = None,  # created_at of the last item on the previous page
+    before_id: Optional[int] = None,  # and its id
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders)
 ):
-    """Get all updates for a scout"""
+    """Get updates for a scout, newest first"""
     # First verify the scout exists
-    scout_check = await db.execute(
-        text("SELECT id FROM scouts WHERE id = :scout_id"),
-        {"scout_id": scout_id}
-    )
-    if not scout_check.first():
+    if not await loaders.any_scouts.load(scout_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Scout not found"
         )
     
-    # Get updates
-    result = await db.execute(
-        text("""
-            SELECT * FROM scout_updates
-            WHERE scout_id = :scout_id
-            ORDER BY created_at DESC
-        """),
-        {"scout_id": scout_id}
-    )
+    # Get updates; scout_updates is partitioned by month of created_at
+    query = "SELECT * FROM scout_updates WHERE scout_id = :scout_id"
+    params = {"scout_id": scout_id, "limit": limit}
+    
+    if before is not None:
+        # Keyset on (created_at, id) so rows sharing the boundary timestamp are not
+        # skipped; the plain bound on created_at keeps partition pruning
+        query += " AND created_at <= :before AND (created_at, id) < (:before, :before_id)"
+        params["before"] = before
+        params["before_id"] = before_id if before_id is not None else 0
+    
+    query += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT :limit"
+    
+    result = await db.execute(text(query), params)
     
     updates = result.fetchall()
-    return [dict(update) for update in updates]
+    return [dict(update._mapping) for update in updates]
 
 @router.get("/{scout_id}/faqs", response_model=List[ScoutFAQResponse])
 async def get_scout_faqs(
@@ -334,10 +484,10 @@ async def get_scout_faqs(
     """Get all FAQs for a scout"""
     # First verify scout exists and is not archived
     scout_check = await db.execute(
-        text("""
+        text(f"""
             SELECT id FROM scouts 
             WHERE id = :scout_id 
-            AND status != 'archived'
+            AND {live("scouts")}
         """),
         {"scout_id": scout_id}
     )
@@ -362,42 +512,9 @@ async def get_scout_faqs(
 @router.put("/{scout_id}/archive", response_model=ScoutResponse)
 async def archive_scout(
     scout_id: int,
+    response: Response,
+    approver_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
     """Archive a scout"""
-    # First verify the scout exists and isn't already archived
-    scout_check = await db.execute(
-        text("""
-            SELECT id, status 
-            FROM scouts 
-            WHERE id = :scout_id
-        """),
-        {"scout_id": scout_id}
-    )
-    scout = scout_check.first()
-    
-    if not scout:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Scout not found"
-        )
-    
-    if scout.status == 'archived':
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Scout is already archived"
-        )
-    
-    # Archive the scout
-    result = await db.execute(
-        text("""
-            UPDATE scouts
-            SET status = 'archived'
-            WHERE id = :scout_id
-            RETURNING *
-        """),
-        {"scout_id": scout_id}
-    )
-    
-    await db.commit()
-    return result.first() 
\ No newline at end of file
+    return await _transition_one(db, TRANSITIONS["archive"], scout_id, response, approver_id)
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from schemas.search import SearchResponse
+from services.search import search, SEARCH_TYPES
+from typing import List, Optional
+
+router = APIRouter(tags=["search"])
+
+@router.get("/search", response_model=SearchResponse)
+async def search_all(
+    q: str = Query(..., min_length=1, max_length=200),
+    investor_id: Optional[int] = None,  # This would typically come from auth token
+    founder_id: Optional[int] = None,
+    types: Optional[List[str]] = Query(None),  # Defaults to every type
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Ranked full-text search over pitches, scouts, FAQs, updates and notes"""
+    if investor_id is not None and founder_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search as either an investor or a founder, not both"
+        )
+    
+    if types is not None:
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search types: {', '.join(sorted(unknown))}"
+            )
+    
+    results = await search(
+        db, q,
+        investor_id=investor_id,
+        founder_id=founder_id,
+        types=types,
+        limit=limit,
+        offset=offset
+    )
+    
+    return {"query": q, "limit": limit, "offset": offset, "results": results}
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class ProfilingStart(BaseModel):
+    requests: Optional[int] = Field(None, ge=1, le=1000)  # Profile the next N requests...
+    seconds: Optional[float] = Field(None, gt=0, le=3600)  # ...or every request for a window
+    route: Optional[str] = None  # Route template such as /pitches/{pitch_id}
+
+    @model_validator(mode="after")
+    def one_limit(self):
+        if (self.requests is None) == (self.seconds is None):
+            raise ValueError("Give exactly one of requests or seconds")
+        return self
+
+class ProfileSummary(BaseModel):
+    id: int
+    route: str
+    method: str
+    status_code: int
+    duration_ms: float
+    captured_at: datetime
+
+class ProfilingStatus(BaseModel):
+    active: bool
+    remaining_requests: Optional[int]
+    remaining_seconds: Optional[float]
+    route: Optional[str]
+    profiles: List[ProfileSummary]
+
+class LoopLagResponse(BaseModel):
+    interval_ms: float
+    samples: int
+    last_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+
+class PurgeProgress(BaseModel):
+    pitch_id: int
+    table: Optional[str]  # Child table being emptied
+    deleted: Dict[str, int]  # Rows deleted so far, per table
+    started_at: datetime
+
+class PurgeStatus(BaseModel):
+    pending: int  # Soft-deleted pitches not yet purged
+    current: Optional[PurgeProgress]
+    pitches_purged: int  # Since this worker started
+    rows_deleted: int
+    last_run_at: Optional[datetime]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+class ArchivedScoutSummary(BaseModel):
+    id: int
+    daftar_id: int
+    name: Optional[str]
+    archived_at: Optional[datetime]
+    moved_at: datetime  # When it left the hot tables
+    pitch_count: int
+
+    class Config:
+        from_attributes = True
+
+class ArchivedScout(ArchivedScoutSummary):
+    # The scout row with its faqs, updates and pitches; each pitch carries
+    # its documents, offers (with their actions) and notes
+    doc: Dict[str, Any]
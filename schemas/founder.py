@@ -37,6 +37,9 @@ class FounderUpdate(BaseModel):
     designation: Optional[str] = None
     location: Optional[str] = None
 
+class InvestorQuestionCreate(BaseModel):
+    question_text: str
+
 class InvestorQuestionResponse(BaseModel):
     id: int
     question_text: str
@@ -53,4 +56,8 @@ class QuestionAnswerResponse(BaseModel):
     answered_at: Optional[datetime]
     
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class UnansweredCountResponse(BaseModel):
+    founder_id: int
+    unanswered: int
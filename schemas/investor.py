@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
-from typing import Optional, List
+from decimal import Decimal
+from typing import Dict, Optional, List
 
 class InvestorProfileResponse(BaseModel):
     id: int
@@ -39,6 +40,37 @@ class DaftarInvestorResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DaftarScoutStats(BaseModel):
+    scout_id: int
+    name: Optional[str]
+    status: Optional[str]
+    pitches: int
+    offers: int
+
+class DaftarMemberActivity(BaseModel):
+    investor_id: int
+    offers: int
+    notes: int
+    last_active_at: Optional[datetime]
+
+class DaftarStatsResponse(BaseModel):
+    daftar_id: int
+    scouts: int
+    pitches: int
+    offers_by_status: Dict[str, int]
+    avg_seconds_to_offer: Optional[float]  # From a pitch arriving to its first offer
+    bills_outstanding: int
+    bills_outstanding_amount: Decimal
+    bills_paid: int
+    bills_paid_amount: Decimal
+    members: int
+    refreshed_at: datetime
+    scout_stats: List[DaftarScoutStats]
+    member_activity: List[DaftarMemberActivity]
+
+    class Config:
+        from_attributes = True
+
 class InvestorBase(BaseModel):
     first_name: str
     last_name: str
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class FounderInPitch(BaseModel):
     id: int
@@ -18,6 +18,8 @@ class PitchResponse(BaseModel):
     status_founder: str
     created_at: datetime
     demo_link: Optional[str]
+    version: Optional[int] = None  # Also sent as the ETag
+    counts: Optional[Dict[str, int]] = None  # Only filled in with ?with_counts=1
 
     class Config:
         from_attributes = True
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, constr
+from pydantic import BaseModel, Field, constr
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from .pitch import FounderInPitch
 
 # Base Scout Creation
@@ -15,10 +15,46 @@ class ScoutResponse(BaseModel):
     name: str
     status: str
     created_at: datetime
+    version: Optional[int] = None  # Also sent as the ETag
+    counts: Optional[Dict[str, int]] = None  # Only filled in with ?with_counts=1
     
     class Config:
         from_attributes = True
 
+# Bulk lifecycle transitions
+class ScoutBulkApprove(BaseModel):
+    scout_ids: List[int] = Field(..., min_length=1, max_length=500)
+    approver_id: int
+
+class ScoutBulkArchive(BaseModel):
+    scout_ids: List[int] = Field(..., min_length=1, max_length=500)
+    approver_id: Optional[int] = None  # Recorded as the delete approval when given
+
+class ScoutSkipped(BaseModel):
+    id: int
+    status: str  # Current status, which does not allow the transition
+
+class ScoutBulkTransitionResponse(BaseModel):
+    transitioned: List[ScoutResponse]
+    skipped: List[ScoutSkipped]
+    not_found: List[int]
+
+class ScoutMatchResponse(BaseModel):
+    id: int
+    daftar_id: Optional[int]
+    name: Optional[str]
+    score: float
+    matched_on: List[str]  # audience attributes the founder matched explicitly
+
+class FacetCount(BaseModel):
+    value: Optional[str]  # None counts scouts with the field unset
+    count: int
+
+class ScoutDiscoveryResponse(BaseModel):
+    items: List[ScoutResponse]
+    facets: Dict[str, List[FacetCount]]
+    next_cursor: Optional[str]
+
 # Scout Details
 class ScoutDetailsUpdate(BaseModel):
     name: str
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchResult(BaseModel):
+    type: str  # "pitch", "scout", "faq", "update" or "note"
+    id: int
+    scout_id: Optional[int]
+    pitch_id: Optional[int]
+    title: Optional[str]
+    snippet: str
+    rank: float
+
+class SearchResponse(BaseModel):
+    query: str
+    limit: int
+    offset: int
+    results: List[SearchResult]
@@ -0,0 +1,60 @@
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+# The membership checks the REST routes make inline, for callers outside a
+# request handler or that need them more than once
+
+async def investor_in_daftar(
+    db: AsyncSession,
+    investor_id: int,
+    daftar_id: int,
+    role: Optional[str] = None
+) -> bool:
+    """Whether a live investor is an active member of the daftar, optionally with a role"""
+    result = await db.execute(
+        text(f"""
+            SELECT 1 FROM daftar_investors di
+            JOIN investors i ON i.id = di.investor_id
+            WHERE di.daftar_id = :daftar_id
+            AND di.investor_id = :investor_id
+            AND {live("daftar_investors", "di")}
+            AND {live("investors", "i")}
+            {"AND di.role = :role" if role else ""}
+        """),
+        {"daftar_id": daftar_id, "investor_id": investor_id, "role": role}
+    )
+    return result.first() is not None
+
+async def investor_can_see_pitch(db: AsyncSession, investor_id: int, pitch_id: int) -> bool:
+    """Whether the investor is a member of the daftar the live pitch was sent to"""
+    result = await db.execute(
+        text(f"""
+            SELECT 1 FROM pitches p
+            JOIN scouts s ON p.scout_id = s.id
+            JOIN daftar_investors di ON s.daftar_id = di.daftar_id
+            WHERE p.id = :pitch_id
+            AND {live("pitches", "p")}
+            AND di.investor_id = :investor_id
+            AND {live("daftar_investors", "di")}
+        """),
+        {"pitch_id": pitch_id, "investor_id": investor_id}
+    )
+    return result.first() is not None
+
+async def founder_can_see_pitch(db: AsyncSession, founder_id: int, pitch_id: int) -> bool:
+    """Whether a live founder is linked to the live pitch"""
+    result = await db.execute(
+        text(f"""
+            SELECT 1 FROM founder_pitch_relationship fpr
+            JOIN pitches p ON p.id = fpr.pitch_id
+            JOIN founders f ON f.id = fpr.founder_id
+            WHERE fpr.founder_id = :founder_id
+            AND fpr.pitch_id = :pitch_id
+            AND {live("pitches", "p")}
+            AND {live("founders", "f")}
+        """),
+        {"founder_id": founder_id, "pitch_id": pitch_id}
+    )
+    return result.first() is not None
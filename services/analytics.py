@@ -0,0 +1,113 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import List, Optional
+from services.analytics_export import ANALYTICS_DIR, EXPORT_TABLES
+
+try:
+    import duckdb
+except ImportError:  # Analytics queries are optional
+    duckdb = None
+
+# Caps for each report's DuckDB connection, so reporting cannot starve the API
+ANALYTICS_THREADS = int(os.getenv("ANALYTICS_THREADS", "2"))
+ANALYTICS_MEMORY_LIMIT = os.getenv("ANALYTICS_MEMORY_LIMIT", "512MB")
+
+# Offers on live pitches with the scout and daftar they came through.
+# Deleted, archived and purged pitches have an exported copy with
+# deleted_at set, so their offers drop out.
+OFFERS_SQL = """
+    SELECT o.*, p.scout_id, s.daftar_id
+    FROM offers o
+    JOIN pitches p ON p.id = o.pitch_id
+    JOIN scouts s ON s.id = p.scout_id
+    WHERE p.deleted_at IS NULL
+    AND ($daftar_id IS NULL OR s.daftar_id = $daftar_id)
+    AND ($since IS NULL OR o.created_at >= $since)
+"""
+
+# Portfolio reports over the Parquet export; each takes $daftar_id and
+# $since, either of which may be NULL
+REPORTS = {
+    "offers_per_daftar": f"""
+        SELECT daftar_id, COUNT(*) AS offers, COUNT(DISTINCT pitch_id) AS pitches
+        FROM ({OFFERS_SQL})
+        GROUP BY daftar_id ORDER BY offers DESC
+    """,
+    "acceptance_rate": f"""
+        SELECT daftar_id,
+            COUNT(*) FILTER (WHERE status = 'accepted') AS accepted,
+            COUNT(*) FILTER (WHERE status = 'rejected') AS rejected,
+            COUNT(*) FILTER (WHERE status = 'accepted')
+                / NULLIF(COUNT(*) FILTER (WHERE status IN ('accepted', 'rejected')), 0) AS acceptance_rate
+        FROM ({OFFERS_SQL})
+        GROUP BY daftar_id ORDER BY daftar_id
+    """,
+    # Hours from an offer being sent to the first action taken on it
+    "time_to_first_answer": f"""
+        SELECT o.daftar_id,
+            COUNT(*) AS answered,
+            median(epoch(a.first_action_at - o.offer_sent_at)) / 3600 AS median_hours,
+            avg(epoch(a.first_action_at - o.offer_sent_at)) / 3600 AS mean_hours
+        FROM ({OFFERS_SQL}) o
+        JOIN (
+            SELECT offer_id, MIN(action_taken_at) AS first_action_at
+            FROM offer_actions GROUP BY offer_id
+        ) a ON a.offer_id = o.id
+        GROUP BY o.daftar_id ORDER BY o.daftar_id
+    """,
+    "bills": """
+        SELECT s.daftar_id,
+            COUNT(*) AS bills,
+            SUM(b.amount) FILTER (WHERE b.is_paid) AS paid,
+            SUM(b.amount) FILTER (WHERE NOT b.is_paid) AS outstanding,
+            COUNT(*) FILTER (WHERE NOT b.is_paid AND b.due_date < now()) AS overdue
+        FROM bills b
+        JOIN pitches p ON p.id = b.pitch_id
+        JOIN scouts s ON s.id = p.scout_id
+        WHERE p.deleted_at IS NULL
+        AND ($daftar_id IS NULL OR s.daftar_id = $daftar_id)
+        AND ($since IS NULL OR b.created_at >= $since)
+        GROUP BY s.daftar_id ORDER BY s.daftar_id
+    """,
+}
+
+def _connect(directory: str):
+    """In-memory DuckDB with one view per exported table over its Parquet files"""
+    con = duckdb.connect(config={"threads": ANALYTICS_THREADS, "memory_limit": ANALYTICS_MEMORY_LIMIT})
+    for table in EXPORT_TABLES:
+        files = os.path.join(directory, table.name, "*", "*.parquet")
+        columns = ", ".join(column for column, _ in table.columns)
+        # Rows changed several times were exported once per change; the
+        # view keeps the latest copy
+        con.execute(f"""
+            CREATE VIEW {table.name} AS
+            SELECT {columns} FROM read_parquet('{files}', filename = true)
+            QUALIFY row_number() OVER (PARTITION BY id ORDER BY {table.watermark} DESC, filename DESC) = 1
+        """)
+    return con
+
+def _run(report: str, daftar_id: Optional[int], since: Optional[datetime], directory: str) -> List[dict]:
+    con = _connect(directory)
+    try:
+        cursor = con.execute(REPORTS[report], {"daftar_id": daftar_id, "since": since})
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        con.close()
+
+def exported_tables(directory: str = ANALYTICS_DIR) -> List[str]:
+    """Tables with at least one exported file"""
+    return [
+        table.name for table in EXPORT_TABLES
+        if os.path.isdir(os.path.join(directory, table.name))
+    ]
+
+async def run_report(
+    report: str,
+    daftar_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    directory: str = ANALYTICS_DIR
+) -> List[dict]:
+    """Run a named report in a worker thread; DuckDB calls block"""
+    return await asyncio.to_thread(_run, report, daftar_id, since, directory)
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Analytics export is optional
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Parquet files land in <ANALYTICS_DIR>/<table>/month=YYYY-MM/
+ANALYTICS_DIR = os.getenv("ANALYTICS_DIR", "analytics")
+# Rows fetched from Postgres and written per Parquet file at most
+EXPORT_BATCH_SIZE = int(os.getenv("ANALYTICS_EXPORT_BATCH_SIZE", "50000"))
+# Rows changed in the last EXPORT_LAG seconds wait for the next run, so a
+# transaction that commits late with an older timestamp is not skipped
+EXPORT_LAG = int(os.getenv("ANALYTICS_EXPORT_LAG", "300"))
+
+WATERMARKS_FILE = "_watermarks.json"
+
+class ExportTable:
+    """A table exported as its rows change.
+
+    Rows whose watermark column is past the table's high-water mark are
+    appended as new Parquet files, so a row that changes again appears in
+    several files; readers keep the copy with the latest watermark. With
+    tombstones, rows deleted since the mark are exported too, as a copy
+    with only id, deleted_at and the watermark set.
+    """
+
+    def __init__(self, name: str, watermark: str, columns: List[Tuple[str, str]], tombstones: bool = False):
+        self.name = name
+        self.watermark = watermark
+        self.columns = columns
+        self.tombstones = tombstones
+
+    def schema(self):
+        types = {
+            "int": pa.int64(),
+            "text": pa.string(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us"),
+            "timestamptz": pa.timestamp("us", tz="UTC"),
+            "money": pa.decimal128(10, 2),
+        }
+        return pa.schema([(column, types[kind]) for column, kind in self.columns])
+
+    def bound(self, param: str) -> str:
+        """A TIMESTAMPTZ bind cast to the watermark column's type, so its index is used"""
+        if dict(self.columns)[self.watermark] == "timestamptz":
+            return f"CAST(:{param} AS TIMESTAMPTZ)"
+        return f"CAST(CAST(:{param} AS TIMESTAMPTZ) AS TIMESTAMP)"
+
+# Free text (offer descriptions, action notes) stays in Postgres
+EXPORT_TABLES = [
+    ExportTable("scouts", "updated_at", [
+        ("id", "int"), ("daftar_id", "int"), ("name", "text"), ("status", "text"),
+        ("stage", "text"), ("sector", "text"), ("location", "text"),
+        ("created_at", "timestamp"), ("approved_at", "timestamp"),
+        ("archived_at", "timestamp"), ("updated_at", "timestamptz"),
+    ]),
+    # The purge deletes soft-deleted pitches within minutes, usually before
+    # their deleted_at is exported, so deletions are exported as tombstones
+    ExportTable("pitches", "updated_at", [
+        ("id", "int"), ("scout_id", "int"), ("pitch_name", "text"), ("status_founder", "text"),
+        ("has_confirmed", "bool"), ("ask_for_investor", "bool"),
+        ("created_at", "timestamp"), ("deleted_at", "timestamp"), ("updated_at", "timestamptz"),
+    ], tombstones=True),
+    ExportTable("offers", "updated_at", [
+        ("id", "int"), ("pitch_id", "int"), ("investor_id", "int"), ("status", "text"),
+        ("offer_sent_at", "timestamp"), ("created_at", "timestamp"), ("updated_at", "timestamptz"),
+    ]),
+    # Append-only, so its partition key is the high-water column
+    ExportTable("offer_actions", "action_taken_at", [
+        ("id", "int"), ("offer_id", "int"), ("action", "text"), ("action_by", "int"),
+        ("action_taken_at", "timestamp"),
+    ]),
+    ExportTable("bills", "updated_at", [
+        ("id", "int"), ("pitch_id", "int"), ("amount", "money"), ("is_paid", "bool"),
+        ("due_date", "timestamp"), ("created_at", "timestamp"), ("paid_at", "timestamp"),
+        ("updated_at", "timestamptz"),
+    ]),
+]
+
+def load_watermarks(directory: str = ANALYTICS_DIR) -> Dict[str, dict]:
+    """Per table: high_water_mark, exported_at and rows, as of the last export"""
+    try:
+        with open(os.path.join(directory, WATERMARKS_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _save_watermarks(watermarks: Dict[str, dict], directory: str):
+    # Replaced atomically, and only after the files it covers are in place.
+    # The temporary name is per writer so a manual run cannot clobber the
+    # job's half-written file; the job lock keeps writers to one at a time.
+    path = os.path.join(directory, WATERMARKS_FILE)
+    tmp = f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(watermarks, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def _write_files(table: ExportTable, rows: List[dict], directory: str, run_id: str) -> int:
+    """Write rows as one Parquet file per month of their watermark; returns files written"""
+    months: Dict[str, List[dict]] = {}
+    for row in rows:
+        months.setdefault(f"{row[table.watermark]:%Y-%m}", []).append(row)
+
+    schema = table.schema()
+    for month, month_rows in months.items():
+        folder = os.path.join(directory, table.name, f"month={month}")
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{run_id}.parquet")
+        # Write beside, then rename, so readers never see half a file
+        pq.write_table(pa.Table.from_pylist(month_rows, schema=schema), path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+    return len(months)
+
+async def export_table(
+    db: AsyncSession,
+    table: ExportTable,
+    since: Optional[datetime],
+    until: datetime,
+    directory: str = ANALYTICS_DIR
+) -> int:
+    """Export rows whose watermark is in (since, until]; returns rows exported"""
+    query = f"""
+        SELECT {", ".join(column for column, _ in table.columns)}
+        FROM {table.name}
+        WHERE {table.watermark} <= {table.bound("until")}
+    """
+    params = {"until": until}
+    if since:
+        query += f" AND {table.watermark} > {table.bound('since')}"
+        params["since"] = since
+    if table.tombstones:
+        tombstone = {"id": "row_id", "deleted_at": "CAST(deleted_at AS TIMESTAMP)", table.watermark: "deleted_at"}
+        query += f"""
+            UNION ALL
+            SELECT {", ".join(f"{tombstone.get(column, 'NULL')} AS {column}" for column, _ in table.columns)}
+            FROM analytics_deletions
+            WHERE table_name = '{table.name}' AND deleted_at <= CAST(:until AS TIMESTAMPTZ)
+        """
+        if since:
+            query += " AND deleted_at > CAST(:since AS TIMESTAMPTZ)"
+
+    exported = 0
+    result = await db.stream(text(query), params)
+    async for chunk in result.partitions(EXPORT_BATCH_SIZE):
+        rows = [dict(row._mapping) for row in chunk]
+        # One file name per batch keeps files from separate batches apart
+        run_id = f"{until:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        await asyncio.to_thread(_write_files, table, rows, directory, run_id)
+        exported += len(rows)
+    return exported
+
+async def export_changes(db: AsyncSession, directory: str = ANALYTICS_DIR) -> Dict[str, int]:
+    """Export every table's rows changed since its high-water mark; returns rows per table.
+
+    A table's mark only moves once all its files are written; a run that
+    fails part way exports the same rows again next time, which readers
+    collapse to one copy.
+    """
+    if pa is None:
+        logger.warning("Analytics export skipped: pyarrow is not installed")
+        return {}
+
+    os.makedirs(directory, exist_ok=True)
+    watermarks = load_watermarks(directory)
+    result = await db.execute(
+        text("SELECT CURRENT_TIMESTAMP - CAST(:lag AS INTEGER) * INTERVAL '1 second' AS until"),
+        {"lag": EXPORT_LAG}
+    )
+    until = result.scalar()
+
+    exported = {}
+    for table in EXPORT_TABLES:
+        mark = watermarks.get(table.name, {}).get("high_water_mark")
+        since = datetime.fromisoformat(mark) if mark else None
+        if since and since.tzinfo is None:
+            # Marks written before updated_at was TIMESTAMPTZ are UTC
+            since = since.replace(tzinfo=timezone.utc)
+        try:
+            exported[table.name] = await export_table(db, table, since, until, directory)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Analytics export failed for {table.name}: {str(e)}")
+            continue
+        watermarks[table.name] = {
+            "high_water_mark": until.isoformat(),
+            "exported_at": datetime.utcnow().isoformat(),
+            "rows": exported[table.name],
+        }
+        _save_watermarks(watermarks, directory)
+        if table.tombstones:
+            # Exported and past the mark, so no later run reads them
+            await db.execute(
+                text("DELETE FROM analytics_deletions WHERE table_name = :name AND deleted_at <= CAST(:until AS TIMESTAMPTZ)"),
+                {"name": table.name, "until": until}
+            )
+            await db.commit()
+    # Ends the read transaction the streams ran in
+    await db.rollback()
+
+    logger.info(f"Analytics export through {until}: {exported}")
+    return exported
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional
+from cache import get_redis
+
+# Stream the outbox relay publishes to
+OUTBOX_STREAM = "daftar:outbox"
+
+# Approximate cap on the length of each Redis stream
+STREAM_MAXLEN = 100_000
+
+class MessageBus:
+    """Minimal internal pub/sub interface used for domain events"""
+
+    async def publish(self, stream: str, messages: List[dict]):
+        raise NotImplementedError
+
+    def subscribe(self, stream: str) -> AsyncIterator[dict]:
+        raise NotImplementedError
+
+class InMemoryBus(MessageBus):
+    """Process-local bus, used in tests and when Redis is not configured"""
+
+    def __init__(self, history: int = 1000):
+        self.history = history
+        self.messages: Dict[str, List[dict]] = defaultdict(list)
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+
+    async def publish(self, stream: str, messages: List[dict]):
+        log = self.messages[stream]
+        log.extend(messages)
+        del log[:-self.history]
+        for queue in self._subscribers[stream]:
+            for message in messages:
+                queue.put_nowait(message)
+
+    async def subscribe(self, stream: str) -> AsyncIterator[dict]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[stream].append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[stream].remove(queue)
+
+class RedisStreamBus(MessageBus):
+    """Bus backed by Redis streams so every worker sees every message"""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def publish(self, stream: str, messages: List[dict]):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.xadd(
+                    stream,
+                    {"data": json.dumps(message, default=str)},
+                    maxlen=STREAM_MAXLEN,
+                    approximate=True
+                )
+            await pipe.execute()
+
+    async def subscribe(self, stream: str) -> AsyncIterator[dict]:
+        # Only deliver messages published after the subscription started
+        last_id = "$"
+        while True:
+            response = await self.redis.xread({stream: last_id}, block=5000, count=100)
+            for _, entries in response:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    yield json.loads(fields["data"])
+
+_bus: Optional[MessageBus] = None
+
+def get_bus() -> MessageBus:
+    """Return the process-wide bus, picking Redis when it is configured"""
+    global _bus
+    if _bus is None:
+        redis = get_redis()
+        _bus = RedisStreamBus(redis) if redis is not None else InMemoryBus()
+    return _bus
+
+def set_bus(bus: Optional[MessageBus]):
+    """Swap the process-wide bus, e.g. for an InMemoryBus in tests"""
+    global _bus
+    _bus = bus
@@ -0,0 +1,120 @@
+from typing import Dict, List
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+# Counters kept for each pitch and scout. Offers are counted per status as
+# "offers_<status>".
+PITCH_COUNTERS = [
+    "documents",
+    "offers_pending",
+    "offers_accepted",
+    "offers_rejected",
+    "offers_withdrawn",
+    "notes",
+    "questions",
+    "answered_questions",
+]
+SCOUT_COUNTERS = ["pitches", "updates", "faqs"]
+
+async def bump_counters(db: AsyncSession, entity_type: str, entity_id: int, deltas: Dict[str, int]):
+    """Apply counter deltas for one entity in a single upsert.
+
+    Call inside the write handler's transaction so the counter moves
+    together with the row it counts.
+    """
+    await db.execute(
+        text("""
+            INSERT INTO entity_counters (entity_type, entity_id, name, value)
+            SELECT :entity_type, :entity_id, d.name, d.delta
+            FROM unnest(CAST(:names AS TEXT[]), CAST(:deltas AS BIGINT[])) AS d(name, delta)
+            ON CONFLICT (entity_type, entity_id, name)
+            DO UPDATE SET value = entity_counters.value + EXCLUDED.value
+        """),
+        {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "names": list(deltas.keys()),
+            "deltas": list(deltas.values())
+        }
+    )
+
+async def get_counters(db: AsyncSession, entity_type: str, entity_ids: List[int]) -> Dict[int, Dict[str, int]]:
+    """Fetch counters for many entities at once, with missing counters as 0"""
+    names = PITCH_COUNTERS if entity_type == "pitch" else SCOUT_COUNTERS
+    counts = {entity_id: dict.fromkeys(names, 0) for entity_id in entity_ids}
+    if not entity_ids:
+        return counts
+
+    result = await db.execute(
+        text("""
+            SELECT entity_id, name, value FROM entity_counters
+            WHERE entity_type = :entity_type
+            AND entity_id = ANY(:entity_ids)
+        """),
+        {"entity_type": entity_type, "entity_ids": list(entity_ids)}
+    )
+    for row in result.fetchall():
+        counts[row.entity_id][row.name] = row.value
+    return counts
+
+async def reconcile_counters(db: AsyncSession) -> int:
+    """Recount every counter from the source tables and fix any drift.
+
+    Returns the number of counters that were corrected. Increments that
+    commit while this runs can be overwritten with the older value; the
+    next run corrects them.
+    """
+    result = await db.execute(
+        text(f"""
+            WITH actual AS (
+                SELECT 'pitch' AS entity_type, pitch_id AS entity_id, 'documents' AS name, COUNT(*) AS value
+                FROM documents GROUP BY pitch_id
+                UNION ALL
+                SELECT 'pitch', pitch_id, 'offers_' || status, COUNT(*)
+                FROM offers WHERE status IS NOT NULL GROUP BY pitch_id, status
+                UNION ALL
+                SELECT 'pitch', pitch_id, 'notes', COUNT(*)
+                FROM investor_notes GROUP BY pitch_id
+                UNION ALL
+                SELECT 'pitch', pitch_id, 'questions', COUNT(*)
+                FROM investor_questions GROUP BY pitch_id
+                UNION ALL
+                SELECT 'pitch', q.pitch_id, 'answered_questions', COUNT(DISTINCT q.id)
+                FROM investor_questions q
+                JOIN question_answers a ON q.id = a.question_id
+                GROUP BY q.pitch_id
+                UNION ALL
+                SELECT 'scout', scout_id, 'pitches', COUNT(*)
+                FROM pitches WHERE {live("pitches")} GROUP BY scout_id
+                UNION ALL
+                SELECT 'scout', scout_id, 'updates', COUNT(*)
+                FROM scout_updates GROUP BY scout_id
+                UNION ALL
+                SELECT 'scout', scout_id, 'faqs', COUNT(*)
+                FROM scout_faqs GROUP BY scout_id
+            ),
+            corrected AS (
+                INSERT INTO entity_counters (entity_type, entity_id, name, value)
+                SELECT entity_type, entity_id, name, value FROM actual
+                ON CONFLICT (entity_type, entity_id, name)
+                DO UPDATE SET value = EXCLUDED.value
+                WHERE entity_counters.value <> EXCLUDED.value
+                RETURNING 1
+            ),
+            zeroed AS (
+                UPDATE entity_counters c
+                SET value = 0
+                WHERE c.value <> 0
+                AND NOT EXISTS (
+                    SELECT 1 FROM actual a
+                    WHERE a.entity_type = c.entity_type
+                    AND a.entity_id = c.entity_id
+                    AND a.name = c.name
+                )
+                RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM corrected) + (SELECT COUNT(*) FROM zeroed)
+        """)
+    )
+    return result.scalar_one()
@@ -0,0 +1,240 @@
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+logger = logging.getLogger(__name__)
+
+# Seconds between refreshes; also how long clients may cache the stats
+DAFTAR_STATS_INTERVAL = float(os.getenv("DAFTAR_STATS_INTERVAL", "300"))
+# Daftars recomputed per transaction
+DAFTAR_STATS_BATCH = int(os.getenv("DAFTAR_STATS_BATCH", "100"))
+# Changes from the last ROLLUP_LAG seconds wait for the next run, so a
+# transaction that commits late with an older timestamp is not missed
+ROLLUP_LAG = int(os.getenv("ROLLUP_LAG", "60"))
+
+WATERMARK = "daftar_stats"
+
+# Daftars with a change in (:since, :until], plus live daftars that have no
+# stats yet. Every source is read through an index on its timestamp, so the
+# bounds are cast to each column's type; notes still have a naive created_at.
+CHANGED_DAFTARS_SQL = f"""
+    SELECT daftar_id FROM scouts
+    WHERE updated_at > CAST(:since AS TIMESTAMPTZ) AND updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT s.daftar_id FROM pitches p JOIN scouts s ON s.id = p.scout_id
+    WHERE p.updated_at > CAST(:since AS TIMESTAMPTZ) AND p.updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT s.daftar_id FROM offers o
+    JOIN pitches p ON p.id = o.pitch_id JOIN scouts s ON s.id = p.scout_id
+    WHERE o.updated_at > CAST(:since AS TIMESTAMPTZ) AND o.updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT s.daftar_id FROM bills b
+    JOIN pitches p ON p.id = b.pitch_id JOIN scouts s ON s.id = p.scout_id
+    WHERE b.updated_at > CAST(:since AS TIMESTAMPTZ) AND b.updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT s.daftar_id FROM investor_notes n
+    JOIN pitches p ON p.id = n.pitch_id JOIN scouts s ON s.id = p.scout_id
+    WHERE n.created_at > CAST(CAST(:since AS TIMESTAMPTZ) AS TIMESTAMP)
+    AND n.created_at <= CAST(CAST(:until AS TIMESTAMPTZ) AS TIMESTAMP)
+    UNION
+    SELECT daftar_id FROM daftar_investors
+    WHERE updated_at > CAST(:since AS TIMESTAMPTZ) AND updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT di.daftar_id FROM investors i JOIN daftar_investors di ON di.investor_id = i.id
+    WHERE i.updated_at > CAST(:since AS TIMESTAMPTZ) AND i.updated_at <= CAST(:until AS TIMESTAMPTZ)
+    UNION
+    SELECT d.id FROM daftars d
+    WHERE {live("daftars", "d")}
+    AND NOT EXISTS (SELECT 1 FROM daftar_stats ds WHERE ds.daftar_id = d.id)
+"""
+
+# Live pitches of the daftars being recomputed
+DAFTAR_PITCHES = f"""
+        SELECT p.id, p.created_at, s.daftar_id
+        FROM pitches p JOIN scouts s ON s.id = p.scout_id
+        WHERE s.daftar_id = ANY(:daftar_ids) AND {live("pitches", "p")}
+"""
+
+# Recomputes the rollups of :daftar_ids, in this order: per scout and per
+# member rows first, then the daftar totals that count them
+REFRESH_SQL = [
+    "DELETE FROM daftar_scout_stats WHERE daftar_id = ANY(:daftar_ids)",
+    f"""
+    INSERT INTO daftar_scout_stats (scout_id, daftar_id, name, status, pitches, offers)
+    SELECT s.id, s.daftar_id, s.name, s.status, COUNT(DISTINCT p.id), COUNT(o.id)
+    FROM scouts s
+    LEFT JOIN pitches p ON p.scout_id = s.id AND {live("pitches", "p")}
+    LEFT JOIN offers o ON o.pitch_id = p.id
+    WHERE s.daftar_id = ANY(:daftar_ids) AND {live("scouts", "s")}
+    GROUP BY s.id
+    """,
+    "DELETE FROM daftar_member_activity WHERE daftar_id = ANY(:daftar_ids)",
+    f"""
+    WITH dp AS ({DAFTAR_PITCHES}),
+    activity AS (
+        SELECT dp.daftar_id, o.investor_id, 'offer' AS kind, o.offer_sent_at AS at
+        FROM offers o JOIN dp ON dp.id = o.pitch_id
+        UNION ALL
+        SELECT dp.daftar_id, n.investor_id, 'note', n.created_at
+        FROM investor_notes n JOIN dp ON dp.id = n.pitch_id
+    )
+    INSERT INTO daftar_member_activity (daftar_id, investor_id, offers, notes, last_active_at)
+    SELECT di.daftar_id, di.investor_id,
+        COUNT(*) FILTER (WHERE a.kind = 'offer'),
+        COUNT(*) FILTER (WHERE a.kind = 'note'),
+        MAX(a.at)
+    FROM daftar_investors di
+    JOIN investors i ON i.id = di.investor_id AND {live("investors", "i")}
+    LEFT JOIN activity a ON a.daftar_id = di.daftar_id AND a.investor_id = di.investor_id
+    WHERE di.daftar_id = ANY(:daftar_ids) AND {live("daftar_investors", "di")}
+    GROUP BY di.daftar_id, di.investor_id
+    """,
+    f"""
+    WITH dp AS ({DAFTAR_PITCHES}),
+    pitch_totals AS (
+        SELECT daftar_id, COUNT(*) AS pitches FROM dp GROUP BY daftar_id
+    ),
+    offer_totals AS (
+        SELECT daftar_id, jsonb_object_agg(status, n) AS by_status
+        FROM (
+            SELECT dp.daftar_id, o.status, COUNT(*) AS n
+            FROM offers o JOIN dp ON dp.id = o.pitch_id
+            WHERE o.status IS NOT NULL
+            GROUP BY dp.daftar_id, o.status
+        ) counts
+        GROUP BY daftar_id
+    ),
+    -- From a pitch arriving to its first offer
+    time_to_offer AS (
+        SELECT dp.daftar_id, AVG(EXTRACT(EPOCH FROM f.first_offer_at - dp.created_at)) AS avg_seconds
+        FROM dp JOIN (
+            SELECT pitch_id, MIN(offer_sent_at) AS first_offer_at
+            FROM offers WHERE pitch_id IN (SELECT id FROM dp)
+            GROUP BY pitch_id
+        ) f ON f.pitch_id = dp.id
+        GROUP BY dp.daftar_id
+    ),
+    bill_totals AS (
+        SELECT dp.daftar_id,
+            COUNT(*) FILTER (WHERE NOT COALESCE(b.is_paid, false)) AS outstanding,
+            COALESCE(SUM(b.amount) FILTER (WHERE NOT COALESCE(b.is_paid, false)), 0) AS outstanding_amount,
+            COUNT(*) FILTER (WHERE b.is_paid) AS paid,
+            COALESCE(SUM(b.amount) FILTER (WHERE b.is_paid), 0) AS paid_amount
+        FROM bills b JOIN dp ON dp.id = b.pitch_id
+        GROUP BY dp.daftar_id
+    )
+    INSERT INTO daftar_stats (
+        daftar_id, scouts, pitches, offers_by_status, avg_seconds_to_offer,
+        bills_outstanding, bills_outstanding_amount, bills_paid, bills_paid_amount,
+        members, refreshed_at
+    )
+    SELECT d.id,
+        (SELECT COUNT(*) FROM daftar_scout_stats WHERE daftar_id = d.id),
+        COALESCE(pt.pitches, 0),
+        COALESCE(ot.by_status, '{{}}'),
+        tt.avg_seconds,
+        COALESCE(bt.outstanding, 0), COALESCE(bt.outstanding_amount, 0),
+        COALESCE(bt.paid, 0), COALESCE(bt.paid_amount, 0),
+        (SELECT COUNT(*) FROM daftar_member_activity WHERE daftar_id = d.id),
+        CURRENT_TIMESTAMP
+    FROM daftars d
+    LEFT JOIN pitch_totals pt ON pt.daftar_id = d.id
+    LEFT JOIN offer_totals ot ON ot.daftar_id = d.id
+    LEFT JOIN time_to_offer tt ON tt.daftar_id = d.id
+    LEFT JOIN bill_totals bt ON bt.daftar_id = d.id
+    WHERE d.id = ANY(:daftar_ids)
+    ON CONFLICT (daftar_id) DO UPDATE SET
+        scouts = EXCLUDED.scouts,
+        pitches = EXCLUDED.pitches,
+        offers_by_status = EXCLUDED.offers_by_status,
+        avg_seconds_to_offer = EXCLUDED.avg_seconds_to_offer,
+        bills_outstanding = EXCLUDED.bills_outstanding,
+        bills_outstanding_amount = EXCLUDED.bills_outstanding_amount,
+        bills_paid = EXCLUDED.bills_paid,
+        bills_paid_amount = EXCLUDED.bills_paid_amount,
+        members = EXCLUDED.members,
+        version = daftar_stats.version + 1,
+        refreshed_at = EXCLUDED.refreshed_at
+    """,
+]
+
+async def changed_daftars(db: AsyncSession, since: datetime, until: datetime) -> List[int]:
+    result = await db.execute(text(CHANGED_DAFTARS_SQL), {"since": since, "until": until})
+    return sorted(row.daftar_id for row in result.fetchall())
+
+async def refresh_daftars(db: AsyncSession, daftar_ids: List[int]):
+    """Recompute the rollups of some daftars in one transaction"""
+    for statement in REFRESH_SQL:
+        await db.execute(text(statement), {"daftar_ids": daftar_ids})
+    await db.commit()
+
+async def refresh_rollups(db: AsyncSession) -> int:
+    """Recompute the daftars changed since the last run; returns how many.
+
+    The watermark only moves once every changed daftar is done, so a run
+    that fails part way repeats the same daftars next time.
+    """
+    result = await db.execute(
+        text("""
+            SELECT
+                (SELECT high_water_mark FROM rollup_watermarks WHERE name = :name) AS since,
+                CURRENT_TIMESTAMP - CAST(:lag AS INTEGER) * INTERVAL '1 second' AS until
+        """),
+        {"name": WATERMARK, "lag": ROLLUP_LAG}
+    )
+    marks = result.first()
+    since = marks.since or datetime.min.replace(tzinfo=timezone.utc)
+    until = marks.until
+
+    daftar_ids = await changed_daftars(db, since, until)
+    for start in range(0, len(daftar_ids), DAFTAR_STATS_BATCH):
+        await refresh_daftars(db, daftar_ids[start:start + DAFTAR_STATS_BATCH])
+
+    await db.execute(
+        text("""
+            INSERT INTO rollup_watermarks (name, high_water_mark)
+            VALUES (:name, CAST(:until AS TIMESTAMPTZ))
+            ON CONFLICT (name) DO UPDATE SET high_water_mark = EXCLUDED.high_water_mark
+        """),
+        {"name": WATERMARK, "until": until}
+    )
+    await db.commit()
+    if daftar_ids:
+        logger.info(f"Refreshed stats for {len(daftar_ids)} daftars through {until}")
+    return len(daftar_ids)
+
+async def get_daftar_stats(db: AsyncSession, daftar_id: int) -> Optional[dict]:
+    """A daftar's rollups with its per scout and per member rows; None before the first refresh"""
+    result = await db.execute(
+        text("SELECT * FROM daftar_stats WHERE daftar_id = :daftar_id"),
+        {"daftar_id": daftar_id}
+    )
+    row = result.first()
+    if not row:
+        return None
+    stats = dict(row._mapping)
+
+    result = await db.execute(
+        text("""
+            SELECT scout_id, name, status, pitches, offers FROM daftar_scout_stats
+            WHERE daftar_id = :daftar_id
+            ORDER BY pitches DESC, scout_id
+        """),
+        {"daftar_id": daftar_id}
+    )
+    stats["scout_stats"] = [dict(row._mapping) for row in result.fetchall()]
+
+    result = await db.execute(
+        text("""
+            SELECT investor_id, offers, notes, last_active_at FROM daftar_member_activity
+            WHERE daftar_id = :daftar_id
+            ORDER BY last_active_at DESC NULLS LAST, investor_id
+        """),
+        {"daftar_id": daftar_id}
+    )
+    stats["member_activity"] = [dict(row._mapping) for row in result.fetchall()]
+    return stats
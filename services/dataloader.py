@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db
+from services.soft_delete import live
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+class DataLoader:
+    """Coalesces single-key loads into batched lookups.
+
+    Every load() issued in the same event-loop tick is sent to batch_fn as one
+    list of keys, and results are memoized for the lifetime of the loader,
+    which is one request.
+    """
+
+    def __init__(self, batch_fn: BatchFn):
+        self.batch_fn = batch_fn
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Tuple[Hashable, asyncio.Future]] = []
+        # The event loop only keeps weak references to tasks, so a dispatch
+        # in flight is held here until it finishes
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: Hashable) -> "asyncio.Future":
+        future = self._cache.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._queue.append((key, future))
+        if len(self._queue) == 1:
+            # First key this tick; dispatch once the current callbacks have run
+            loop.call_soon(lambda: self._tasks.add(loop.create_task(self._dispatch())))
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, value: Any):
+        """Seed the cache, e.g. with a row the handler just wrote"""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self, key: Hashable):
+        self._cache.pop(key, None)
+
+    async def _dispatch(self):
+        queue, self._queue = self._queue, []
+        keys = [key for key, _ in queue]
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            # Failed keys are not memoized, so a later load retries them
+            for key, future in queue:
+                if self._cache.get(key) is future:
+                    del self._cache[key]
+                future.set_exception(e)
+            return
+        finally:
+            self._tasks.discard(asyncio.current_task())
+        for key, future in queue:
+            future.set_result(results.get(key))
+
+class Loaders:
+    """Request-scoped loaders for entities fetched by primary key"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # The session cannot run two statements at once, and loaders for
+        # different tables may dispatch in the same tick
+        self._lock = asyncio.Lock()
+        self.scouts = DataLoader(self._by_id("scouts"))
+        # Read and history endpoints still serve archived scouts
+        self.any_scouts = DataLoader(self._by_id("scouts", live_only=False))
+        self.pitches = DataLoader(self._by_id("pitches"))
+        self.investors = DataLoader(self._by_id("investors"))
+        self.founders = DataLoader(self._by_id("founders"))
+        self.daftars = DataLoader(self._by_id("daftars"))
+
+    def _by_id(self, table: str, live_only: bool = True) -> BatchFn:
+        """Batch lookup by id; with live_only, soft-deleted and archived rows load as None"""
+        predicate = live(table) if live_only else "true"
+        async def batch(ids: List[int]) -> Dict[int, Optional[Any]]:
+            async with self._lock:
+                result = await self.db.execute(
+                    text(f"SELECT * FROM {table} WHERE id = ANY(:ids) AND {predicate}"),
+                    {"ids": ids}
+                )
+                return {row.id: row for row in result.fetchall()}
+        return batch
+
+async def get_loaders(db: AsyncSession = Depends(get_db)) -> Loaders:
+    """Dependency giving each request its own loaders over its own session"""
+    return Loaders(db)
@@ -0,0 +1,134 @@
+import base64
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache import cache_get_json, cache_set_json
+from services.soft_delete import live
+
+FACET_CACHE_TTL = int(os.getenv("FACET_CACHE_TTL", "60"))
+
+# Facet dimensions, all plain columns on scouts
+FACETS = ["stage", "sector", "location", "community", "status"]
+
+# Long-tail values beyond this many per facet are left out
+FACET_LIMIT = 20
+
+def encode_cursor(created_at: datetime, scout_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{scout_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    created_at, scout_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(created_at), int(scout_id)
+
+def _filter_sql(filters: Dict[str, List[str]], exclude: Optional[str] = None) -> str:
+    """AND of the facet filters, optionally leaving one dimension out"""
+    clauses = [
+        f"{facet} = ANY(:{facet})"
+        for facet, values in filters.items()
+        if values and facet != exclude
+    ]
+    return " AND ".join(clauses) if clauses else "true"
+
+def _base_sql(daftar_id: Optional[int], filters: Dict[str, List[str]]) -> str:
+    """Conditions that apply to every facet and to the result list"""
+    clauses = []
+    if daftar_id is not None:
+        clauses.append("daftar_id = :daftar_id")
+    # Archived scouts are only shown when asked for explicitly
+    if not filters.get("status"):
+        clauses.append(live("scouts"))
+    return " AND ".join(clauses) if clauses else "true"
+
+async def facet_counts(
+    db: AsyncSession,
+    daftar_id: Optional[int],
+    filters: Dict[str, List[str]]
+) -> Dict[str, List[dict]]:
+    """Counts per value for every facet, in one GROUPING SETS scan.
+
+    Each facet is counted with every filter except its own, so selecting a
+    sector still shows how many scouts the other sectors would give.
+    Results are cached per filter combination for FACET_CACHE_TTL seconds.
+    """
+    cache_key = "facets:scouts:" + hashlib.sha1(
+        json.dumps({"daftar_id": daftar_id, **filters}, sort_keys=True).encode()
+    ).hexdigest()
+    cached = await cache_get_json(cache_key)
+    if cached is not None:
+        return cached
+
+    count_for_set = "\n                    ".join(
+        f"WHEN GROUPING({facet}) = 0 THEN COUNT(*) FILTER (WHERE {_filter_sql(filters, exclude=facet)})"
+        for facet in FACETS
+    )
+    facet_name = "\n                    ".join(
+        f"WHEN GROUPING({facet}) = 0 THEN '{facet}'"
+        for facet in FACETS
+    )
+    facet_value = "COALESCE(" + ", ".join(FACETS) + ")"
+
+    result = await db.execute(
+        text(f"""
+            SELECT
+                CASE
+                    {facet_name}
+                END AS facet,
+                {facet_value} AS value,
+                CASE
+                    {count_for_set}
+                END AS count
+            FROM scouts
+            WHERE {_base_sql(daftar_id, filters)}
+            GROUP BY GROUPING SETS ({", ".join(f"({facet})" for facet in FACETS)})
+        """),
+        {"daftar_id": daftar_id, **filters}
+    )
+
+    facets: Dict[str, List[dict]] = {facet: [] for facet in FACETS}
+    for row in result.fetchall():
+        if row.count:
+            facets[row.facet].append({"value": row.value, "count": row.count})
+    for facet, values in facets.items():
+        values.sort(key=lambda v: (-v["count"], v["value"] or ""))
+        del values[FACET_LIMIT:]
+
+    await cache_set_json(cache_key, facets, FACET_CACHE_TTL)
+    return facets
+
+async def discover_scouts(
+    db: AsyncSession,
+    daftar_id: Optional[int],
+    filters: Dict[str, List[str]],
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of matching scouts, newest first, with the next page's cursor"""
+    params = {"daftar_id": daftar_id, "limit": limit + 1, **filters}
+    keyset = "true"
+    if cursor is not None:
+        params["cursor_created_at"], params["cursor_id"] = decode_cursor(cursor)
+        keyset = "(created_at, id) < (:cursor_created_at, :cursor_id)"
+
+    result = await db.execute(
+        text(f"""
+            SELECT * FROM scouts
+            WHERE {_base_sql(daftar_id, filters)}
+            AND {_filter_sql(filters)}
+            AND {keyset}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :limit
+        """),
+        params
+    )
+    scouts = [dict(row._mapping) for row in result.fetchall()]
+
+    next_cursor = None
+    if len(scouts) > limit:
+        scouts = scouts[:limit]
+        next_cursor = encode_cursor(scouts[-1]["created_at"], scouts[-1]["id"])
+    return scouts, next_cursor
@@ -0,0 +1,76 @@
+from typing import List, Optional
+from fastapi import HTTPException, Request, Response, status
+from services.soft_delete import live
+
+def etag(version: int) -> str:
+    """Strong ETag for a row version"""
+    return f'"{version}"'
+
+def parse_if_match(if_match: Optional[str]) -> Optional[List[int]]:
+    """Row versions an If-Match header accepts, or None when any version will do.
+
+    Only strong ETags we issued can match; anything else fails the
+    precondition, as a stale or foreign ETag would.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if not (len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit()):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="If-Match does not match the current version"
+            )
+        versions.append(int(tag[1:-1]))
+    return versions
+
+def versioned_update_sql(table: str, set_clause: str) -> str:
+    """Conditional UPDATE that bumps the row version, in one round trip.
+
+    Binds :id and :expected_versions (None skips the check). Returns the
+    updated row with applied = true, or the unchanged current row with
+    applied = false when the version did not match, or no row when the id
+    does not exist or is not live (soft-deleted or archived).
+    """
+    is_live = live(table)
+    return f"""
+        WITH updated AS (
+            UPDATE {table}
+            SET {set_clause}, version = version + 1
+            WHERE id = :id AND {is_live}
+            AND (
+                CAST(:expected_versions AS INTEGER[]) IS NULL
+                OR version = ANY(CAST(:expected_versions AS INTEGER[]))
+            )
+            RETURNING *
+        )
+        SELECT updated.*, true AS applied FROM updated
+        UNION ALL
+        SELECT {table}.*, false AS applied FROM {table}
+        WHERE id = :id AND {is_live}
+        AND NOT EXISTS (SELECT 1 FROM updated)
+    """
+
+def check_versioned_update(row, response: Response, not_found: str):
+    """Turn the result of versioned_update_sql into 404/412 or set the new ETag"""
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found
+        )
+    if not row.applied:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match does not match the current version",
+            headers={"ETag": etag(row.version)}
+        )
+    response.headers["ETag"] = etag(row.version)
+
+def not_modified(request: Request, version: int) -> bool:
+    """Whether a conditional GET already has this version"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag(version) in tags
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Set
+from services.bus import MessageBus, OUTBOX_STREAM
+
+logger = logging.getLogger(__name__)
+
+# Events pushed to the activity feed; everything else in the outbox is ignored
+FEED_EVENT_TYPES = {
+    "question.created",
+    "answer.created",
+    "document.created",
+    "offer.created",
+    "offer.withdrawn",
+}
+
+# Slow clients lose events beyond this many rather than holding memory
+MAX_PENDING_EVENTS = 100
+
+def pitch_scope(pitch_id: int) -> str:
+    return f"pitch:{pitch_id}"
+
+def daftar_scope(daftar_id: int) -> str:
+    return f"daftar:{daftar_id}"
+
+class FeedHub:
+    """Fans bus events out to the feed connections held by this worker.
+
+    Each worker reads the shared bus once and routes every event to the
+    local subscribers of its pitch and daftar scopes.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    def connect(self, scope: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._subscribers[scope].add(queue)
+        return queue
+
+    def disconnect(self, scope: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(scope)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[scope]
+
+    def dispatch(self, event: dict):
+        if event.get("event_type") not in FEED_EVENT_TYPES:
+            return
+
+        payload = event.get("payload") or {}
+        # Private documents are only visible to the side that uploaded them
+        if payload.get("is_private"):
+            return
+
+        message = {
+            "id": event.get("id"),
+            "event_type": event["event_type"],
+            "payload": payload,
+            "created_at": event.get("created_at"),
+        }
+
+        scopes = []
+        if payload.get("pitch_id") is not None:
+            scopes.append(pitch_scope(payload["pitch_id"]))
+        if payload.get("daftar_id") is not None:
+            scopes.append(daftar_scope(payload["daftar_id"]))
+
+        for scope in scopes:
+            for queue in self._subscribers.get(scope, ()):
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    logger.warning(f"Dropping feed event {message['id']} for slow client on {scope}")
+
+    async def run(self, bus: MessageBus):
+        """Consume the outbox stream and dispatch until cancelled"""
+        while True:
+            try:
+                async for event in bus.subscribe(OUTBOX_STREAM):
+                    self.dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Feed subscription error: {str(e)}")
+                await asyncio.sleep(1)
+
+hub = FeedHub()
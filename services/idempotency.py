@@ -0,0 +1,160 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import List, Optional
+from cachetools import TTLCache
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from cache import get_redis
+from services.rate_limit import verified_user
+
+logger = logging.getLogger(__name__)
+
+# How long a completed response is replayed for
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", str(24 * 3600)))
+# How long an in-flight claim is honoured, in case its worker dies
+IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", "60"))
+# How long a duplicate waits for the first request before giving up
+IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", "30"))
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+_POLL_INTERVAL = 0.05
+
+# Refusals a retry with the same key may get past, so they are not stored:
+# timeouts, conflicts, rate limits and every server error
+RETRYABLE_STATUSES = {
+    status.HTTP_408_REQUEST_TIMEOUT,
+    status.HTTP_409_CONFLICT,
+    status.HTTP_425_TOO_EARLY,
+    status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+# Process-local stand-in for Redis; entries carry their own expiry
+_local = TTLCache(maxsize=10_000, ttl=IDEMPOTENCY_TTL)
+
+async def _claim(key: str, record: dict) -> bool:
+    """Store the in-flight record unless the key is taken"""
+    redis = get_redis()
+    if redis is not None:
+        return bool(await redis.set(key, json.dumps(record), nx=True, ex=IDEMPOTENCY_LOCK_TTL))
+    if await _get(key) is not None:
+        return False
+    _local[key] = (time.monotonic() + IDEMPOTENCY_LOCK_TTL, record)
+    return True
+
+async def _get(key: str) -> Optional[dict]:
+    redis = get_redis()
+    if redis is not None:
+        value = await redis.get(key)
+        return json.loads(value) if value is not None else None
+    entry = _local.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+async def _complete(key: str, record: dict):
+    redis = get_redis()
+    if redis is not None:
+        await redis.set(key, json.dumps(record), ex=IDEMPOTENCY_TTL)
+        return
+    _local[key] = (time.monotonic() + IDEMPOTENCY_TTL, record)
+
+async def _release(key: str):
+    redis = get_redis()
+    if redis is not None:
+        await redis.delete(key)
+        return
+    _local.pop(key, None)
+
+def _retryable(status_code: int) -> bool:
+    return status_code >= 500 or status_code in RETRYABLE_STATUSES
+
+def _response(content: bytes, status_code: int, headers: List[List[str]]) -> Response:
+    """A response with the given headers, repeated ones such as Set-Cookie included"""
+    response = Response(content=content, status_code=status_code)
+    for name, value in headers:
+        if name.lower() != "content-length":
+            response.headers.append(name, value)
+    return response
+
+def _replay(record: dict) -> Response:
+    # Records stored before headers were kept have only the media type
+    headers = record.get("headers") or [["content-type", record["media_type"]]]
+    response = _response(base64.b64decode(record["body"]), record["status_code"], headers)
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+async def idempotency_middleware(request: Request, call_next):
+    """Run a POST carrying an Idempotency-Key once and replay its response.
+
+    A retry with the same key and body gets the stored response without
+    reaching the handler. A retry that arrives while the first attempt is
+    still running waits for it. Reusing a key for a different request is
+    rejected for authenticated callers. Server errors and other transient refusals are not stored,
+    so they can be retried.
+    """
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+    if request.method != "POST" or not idempotency_key:
+        return await call_next(request)
+
+    if len(idempotency_key) > 255:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"detail": "Idempotency-Key must be at most 255 characters"}
+        )
+
+    body = await request.body()
+    fingerprint = hashlib.sha256(
+        b"\n".join([request.url.path.encode(), request.url.query.encode(), body])
+    ).hexdigest()
+    # Scoped to the verified caller when there is one. Without a token the
+    # client address would change when a phone switches networks and its
+    # retry would run again, so the key is scoped to the request instead.
+    user = verified_user(request)
+    key = f"idempotency:{user}:{idempotency_key}" if user else f"idempotency:anon:{fingerprint}:{idempotency_key}"
+
+    deadline = time.monotonic() + IDEMPOTENCY_WAIT
+    while not await _claim(key, {"state": "in_flight", "fingerprint": fingerprint}):
+        record = await _get(key)
+        if record is None:
+            continue  # Released or expired in between; try to claim it
+        if record["fingerprint"] != fingerprint:
+            return JSONResponse(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                content={"detail": "Idempotency-Key was already used for a different request"}
+            )
+        if record["state"] == "completed":
+            return _replay(record)
+        if time.monotonic() > deadline:
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"detail": "A request with this Idempotency-Key is still in progress"},
+                headers={"Retry-After": "1"}
+            )
+        await asyncio.sleep(_POLL_INTERVAL)
+
+    try:
+        response = await call_next(request)
+        if _retryable(response.status_code):
+            await _release(key)
+            return response
+
+        content = b"".join([chunk async for chunk in response.body_iterator])
+        # ETag, Location, Retry-After and the like are replayed with the body
+        headers = [list(header) for header in response.headers.items()]
+        await _complete(key, {
+            "state": "completed",
+            "fingerprint": fingerprint,
+            "status_code": response.status_code,
+            "headers": headers,
+            "body": base64.b64encode(content).decode(),
+        })
+    except BaseException:
+        await _release(key)
+        raise
+
+    return _response(content, response.status_code, headers)
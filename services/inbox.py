@@ -0,0 +1,87 @@
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+# The founder inbox is a denormalized copy of every unanswered investor
+# question on a live pitch, one row per founder of the pitch. These helpers
+# keep it in step with the write paths and must run inside the caller's
+# transaction.
+
+async def add_question_to_inbox(db: AsyncSession, question_id: int):
+    """Fan a newly asked question out to every founder of its pitch"""
+    await db.execute(
+        text(f"""
+            INSERT INTO founder_question_inbox (
+                founder_id, question_id, pitch_id, question_text, created_at
+            )
+            SELECT fpr.founder_id, q.id, q.pitch_id, q.question_text, q.created_at
+            FROM investor_questions q
+            JOIN founder_pitch_relationship fpr ON q.pitch_id = fpr.pitch_id
+            JOIN pitches p ON p.id = q.pitch_id
+            WHERE q.id = :question_id
+            AND {live("pitches", "p")}
+            ON CONFLICT DO NOTHING
+        """),
+        {"question_id": question_id}
+    )
+
+async def add_pitch_to_founder_inbox(db: AsyncSession, founder_id: int, pitch_id: int):
+    """Copy a pitch's open questions to a founder just linked to it"""
+    await db.execute(
+        text(f"""
+            INSERT INTO founder_question_inbox (
+                founder_id, question_id, pitch_id, question_text, created_at
+            )
+            SELECT :founder_id, q.id, q.pitch_id, q.question_text, q.created_at
+            FROM investor_questions q
+            JOIN pitches p ON p.id = q.pitch_id
+            WHERE q.pitch_id = :pitch_id
+            AND {live("pitches", "p")}
+            AND NOT EXISTS (SELECT 1 FROM question_answers a WHERE a.question_id = q.id)
+            ON CONFLICT DO NOTHING
+        """),
+        {"founder_id": founder_id, "pitch_id": pitch_id}
+    )
+
+async def remove_question_from_inbox(db: AsyncSession, question_id: int):
+    """Drop an answered question from every founder's inbox"""
+    await db.execute(
+        text("DELETE FROM founder_question_inbox WHERE question_id = :question_id"),
+        {"question_id": question_id}
+    )
+
+async def remove_pitch_from_inbox(db: AsyncSession, pitch_id: int):
+    """Drop a deleted pitch's questions from its founders' inboxes"""
+    await db.execute(
+        text("DELETE FROM founder_question_inbox WHERE pitch_id = :pitch_id"),
+        {"pitch_id": pitch_id}
+    )
+
+async def rebuild_founder_inbox(db: AsyncSession, founder_id: Optional[int] = None):
+    """Recompute the inbox from the source tables.
+
+    Used for the initial backfill and to repair drift, e.g. after founders
+    are linked to a pitch outside add_pitch_to_founder_inbox.
+    """
+    scope = "WHERE founder_id = :founder_id" if founder_id is not None else ""
+    fpr_scope = "AND fpr.founder_id = :founder_id" if founder_id is not None else ""
+    params = {"founder_id": founder_id} if founder_id is not None else {}
+
+    await db.execute(text(f"DELETE FROM founder_question_inbox {scope}"), params)
+    await db.execute(
+        text(f"""
+            INSERT INTO founder_question_inbox (
+                founder_id, question_id, pitch_id, question_text, created_at
+            )
+            SELECT fpr.founder_id, q.id, q.pitch_id, q.question_text, q.created_at
+            FROM investor_questions q
+            JOIN founder_pitch_relationship fpr ON q.pitch_id = fpr.pitch_id
+            JOIN pitches p ON p.id = q.pitch_id
+            LEFT JOIN question_answers a ON q.id = a.question_id
+            WHERE a.id IS NULL
+            AND {live("pitches", "p")}
+            {fpr_scope}
+        """),
+        params
+    )
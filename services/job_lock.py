@@ -0,0 +1,33 @@
+import logging
+from contextlib import asynccontextmanager
+from sqlalchemy import text
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def single_runner(job: str):
+    """Yield whether this process may run the job now.
+
+    Every worker that runs background jobs starts the same loops, so each
+    run first takes a Postgres advisory lock named after the job and the
+    others skip theirs. The jobs commit several transactions, so the lock
+    is session-level on a connection of its own, held until the block ends.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = await conn.scalar(
+            text("SELECT pg_try_advisory_lock(hashtext(:job))"), {"job": job}
+        )
+        if not acquired:
+            logger.debug(f"Skipping {job}: another worker is running it")
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    await conn.execute(text("SELECT pg_advisory_unlock(hashtext(:job))"), {"job": job})
+                except BaseException:
+                    # A connection going back to the pool must not keep the lock
+                    await conn.invalidate()
+                    raise
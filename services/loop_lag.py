@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.1"))
+# A loop that has not run the monitor for this long past its interval is
+# considered blocked and the blocking stack is logged
+LOOP_BLOCK_THRESHOLD = float(os.getenv("LOOP_BLOCK_THRESHOLD", "0.1"))
+# Innermost frames logged; the outer ones are the same server plumbing
+LOOP_BLOCK_STACK_DEPTH = 25
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wakeup",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, float("inf"))
+)
+
+# Samples kept for the summary, one per interval (a minute at the default)
+LOOP_LAG_WINDOW = 600
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a task that asked to sleep.
+
+    Any lag beyond a millisecond or so means something ran on the loop
+    without yielding, such as a synchronous network call in a handler. A
+    watchdog thread notices when the loop stops ticking altogether and logs
+    the stack of whatever is holding it, with the route being served.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, block_threshold: float = LOOP_BLOCK_THRESHOLD):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.samples: Deque[float] = deque(maxlen=LOOP_LAG_WINDOW)
+        self.last: Optional[float] = None
+        self.heartbeat = time.monotonic()
+        self._routes: Dict[object, str] = {}
+        self._loop_thread: Optional[int] = None
+
+    def watch_routes(self, routes: Iterable):
+        """Map handler code objects to route templates, to name blocked routes"""
+        for route in routes:
+            endpoint = getattr(route, "endpoint", None)
+            code = getattr(endpoint, "__code__", None)
+            if code is not None and hasattr(route, "path"):
+                self._routes[code] = route.path
+
+    def record(self, lag: float):
+        self.last = lag
+        self.samples.append(lag)
+        LOOP_LAG.observe(lag)
+
+    def summary(self) -> dict:
+        """Lag over the recent window, in milliseconds"""
+        if not self.samples:
+            return {"interval_ms": self.interval * 1000, "samples": 0}
+        ordered = sorted(self.samples)
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": len(ordered),
+            "last_ms": round(self.last * 1000, 2),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+        }
+
+    def _blocked_route(self, frame) -> str:
+        while frame is not None:
+            route = self._routes.get(frame.f_code)
+            if route is not None:
+                return route
+            frame = frame.f_back
+        return "unknown"
+
+    def _watch(self, stopped: threading.Event):
+        """Runs in its own thread, so it keeps going while the loop is stuck"""
+        reported = None
+        while not stopped.wait(self.interval / 2):
+            heartbeat = self.heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            logger.warning(
+                f"Event loop blocked for {stalled * 1000:.0f}ms+ serving {self._blocked_route(frame)}:\n"
+                + "".join(traceback.format_stack(frame, limit=LOOP_BLOCK_STACK_DEPTH))
+            )
+
+    async def run(self):
+        self._loop_thread = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        stopped = threading.Event()
+        watchdog = threading.Thread(target=self._watch, args=(stopped,), name="loop-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                started = time.perf_counter()
+                await asyncio.sleep(self.interval)
+                self.record(max(0.0, time.perf_counter() - started - self.interval))
+                self.heartbeat = time.monotonic()
+        finally:
+            stopped.set()
+
+loop_lag = LoopLagMonitor()
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import text
+from database import AsyncSessionLocal
+from services.bus import MessageBus, OUTBOX_STREAM
+
+logger = logging.getLogger(__name__)
+
+MATCHER_REFRESH_INTERVAL = float(os.getenv("MATCHER_REFRESH_INTERVAL", "600"))
+
+# How much an explicit match on each audience attribute counts towards the
+# score. A scout that leaves an attribute empty accepts any value for it but
+# scores nothing on it.
+ATTRIBUTE_WEIGHTS = {
+    "sector": 4.0,
+    "stage": 3.0,
+    "location": 2.0,
+    "community": 1.5,
+    "age": 1.0,
+}
+
+# Ages outside this window are not indexed
+MIN_AGE, MAX_AGE = 16, 90
+
+_AGE_RANGE = re.compile(r"(\d+)\s*(?:-|to)\s*(\d+)")
+_AGE_PLUS = re.compile(r"(\d+)\s*\+")
+
+def _split(value: Optional[str], separators: str = ",") -> List[str]:
+    if not value:
+        return []
+    parts = re.split(f"[{re.escape(separators)}]", value)
+    return [part.strip().lower() for part in parts if part.strip()]
+
+def audience_keys(scout: dict) -> Dict[str, Set[str]]:
+    """Normalize a scout's audience columns into index keys per attribute.
+
+    Comma-separated values are treated as alternatives. Locations like
+    "India/Karnataka/Bangalore" are indexed at every level, and age ranges
+    such as "25-35" or "40+" are expanded to the individual ages they cover.
+    """
+    keys = {
+        "sector": set(_split(scout.get("sector"))),
+        "stage": set(_split(scout.get("stage"))),
+        "community": set(_split(scout.get("community"))),
+        "location": set(_split(scout.get("location"), ",/")),
+        "age": set(),
+    }
+    for part in _split(scout.get("age_range")):
+        bounded = _AGE_RANGE.search(part)
+        open_ended = _AGE_PLUS.search(part)
+        if bounded:
+            low, high = int(bounded.group(1)), int(bounded.group(2))
+        elif open_ended:
+            low, high = int(open_ended.group(1)), MAX_AGE
+        else:
+            continue
+        keys["age"].update(str(age) for age in range(max(low, MIN_AGE), min(high, MAX_AGE) + 1))
+    return keys
+
+def profile_keys(profile: dict) -> Dict[str, Set[str]]:
+    """Normalize a founder profile the same way; only given attributes filter"""
+    keys = {}
+    for attribute in ("sector", "stage", "community"):
+        if profile.get(attribute):
+            keys[attribute] = set(_split(profile[attribute]))
+    if profile.get("location"):
+        keys["location"] = set(_split(profile["location"], ",/"))
+    if profile.get("age") is not None:
+        keys["age"] = {str(profile["age"])}
+    return keys
+
+class ScoutMatcher:
+    """In-memory inverted index from audience attributes to open scout ids.
+
+    Every indexed scout owns a bit position ("slot"), and each posting list
+    is a Python int used as a bitset, so unions and intersections over 100k
+    scouts are a handful of machine-word loops rather than set operations.
+    """
+
+    def __init__(self):
+        self.scouts: Dict[int, dict] = {}
+        self._keys: Dict[int, Dict[str, Set[str]]] = {}
+        self._slots: Dict[int, int] = {}
+        self._slot_ids: List[Optional[int]] = []
+        self._free_slots: List[int] = []
+        self._all = 0
+        self._postings: Dict[Tuple[str, str], int] = defaultdict(int)
+        # Scouts with no preference for an attribute match any value of it
+        self._wildcards: Dict[str, int] = defaultdict(int)
+        # Events applied while a rebuild is running, replayed onto the new index
+        self._pending: Optional[List[dict]] = None
+
+    def __len__(self):
+        return len(self.scouts)
+
+    def _store(self, scout: dict, keys: Dict[str, Set[str]]) -> int:
+        scout_id = scout["id"]
+        slot = self._free_slots.pop() if self._free_slots else len(self._slot_ids)
+        if slot == len(self._slot_ids):
+            self._slot_ids.append(scout_id)
+        else:
+            self._slot_ids[slot] = scout_id
+        self._slots[scout_id] = slot
+        self._keys[scout_id] = keys
+        self.scouts[scout_id] = {
+            "id": scout_id,
+            "daftar_id": scout.get("daftar_id"),
+            "name": scout.get("name"),
+        }
+        return slot
+
+    def add(self, scout: dict):
+        """Index (or re-index) an open scout"""
+        self.remove(scout["id"])
+        keys = audience_keys(scout)
+        bit = 1 << self._store(scout, keys)
+
+        self._all |= bit
+        for attribute, values in keys.items():
+            if not values:
+                self._wildcards[attribute] |= bit
+            for value in values:
+                self._postings[(attribute, value)] |= bit
+
+    def remove(self, scout_id: int):
+        keys = self._keys.pop(scout_id, None)
+        if keys is None:
+            return
+        del self.scouts[scout_id]
+        slot = self._slots.pop(scout_id)
+        self._slot_ids[slot] = None
+        self._free_slots.append(slot)
+
+        mask = ~(1 << slot)
+        self._all &= mask
+        for attribute, values in keys.items():
+            if not values:
+                self._wildcards[attribute] &= mask
+            for value in values:
+                posting = self._postings[(attribute, value)] & mask
+                if posting:
+                    self._postings[(attribute, value)] = posting
+                else:
+                    del self._postings[(attribute, value)]
+
+    @classmethod
+    def build(cls, scouts: Iterable[dict]) -> "ScoutMatcher":
+        """A new index over scouts, filling the bitsets in one pass"""
+        fresh = cls()
+        postings: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        wildcards: Dict[str, List[int]] = defaultdict(list)
+        for scout in scouts:
+            keys = audience_keys(scout)
+            slot = fresh._store(scout, keys)
+            for attribute, values in keys.items():
+                if not values:
+                    wildcards[attribute].append(slot)
+                for value in values:
+                    postings[(attribute, value)].append(slot)
+
+        size = (len(fresh._slot_ids) + 7) // 8
+        def to_bitset(slots: List[int]) -> int:
+            buffer = bytearray(size)
+            for slot in slots:
+                buffer[slot >> 3] |= 1 << (slot & 7)
+            return int.from_bytes(buffer, "little")
+
+        fresh._all = (1 << len(fresh._slot_ids)) - 1
+        fresh._postings.update((key, to_bitset(slots)) for key, slots in postings.items())
+        fresh._wildcards.update((key, to_bitset(slots)) for key, slots in wildcards.items())
+        return fresh
+
+    def replace_all(self, scouts: Iterable[dict]):
+        """Rebuild from scratch"""
+        self._swap(self.build(scouts))
+
+    def _swap(self, fresh: "ScoutMatcher"):
+        # Takes over the new index without an await in between, so match()
+        # sees the old index or the new one, never a mix
+        pending = self._pending
+        self.__dict__.update(fresh.__dict__)
+        for event in pending or []:
+            self.apply(event)
+
+    def match(self, profile: dict, limit: int = 20) -> List[dict]:
+        """Rank open scouts for a founder profile.
+
+        A scout is a candidate when, for every attribute the founder gave,
+        it either targets one of the founder's values or has no preference.
+        Candidates are ranked by the weighted attributes they match
+        explicitly, most recently indexed first within a score.
+        """
+        keys = profile_keys(profile)
+
+        explicit: Dict[str, int] = {}
+        candidates = self._all
+        for attribute, values in keys.items():
+            hits = 0
+            for value in values:
+                hits |= self._postings.get((attribute, value), 0)
+            explicit[attribute] = hits
+            candidates &= hits | self._wildcards.get(attribute, 0)
+
+        # Walk the explicit-match combinations from highest to lowest score
+        attributes = list(explicit)
+        combinations = sorted(
+            range(1 << len(attributes)),
+            key=lambda combo: -sum(
+                ATTRIBUTE_WEIGHTS[a] for i, a in enumerate(attributes) if combo >> i & 1
+            )
+        )
+
+        results = []
+        for combo in combinations:
+            if not candidates:
+                break
+            matched = [a for i, a in enumerate(attributes) if combo >> i & 1]
+            bucket = candidates
+            for i, attribute in enumerate(attributes):
+                bucket &= explicit[attribute] if combo >> i & 1 else ~explicit[attribute]
+            candidates &= ~bucket
+
+            score = sum(ATTRIBUTE_WEIGHTS[a] for a in matched)
+            while bucket and len(results) < limit:
+                slot = bucket.bit_length() - 1
+                bucket ^= 1 << slot
+                results.append({
+                    **self.scouts[self._slot_ids[slot]],
+                    "score": score,
+                    "matched_on": sorted(matched),
+                })
+            if len(results) >= limit:
+                break
+        return results
+
+    async def load(self):
+        """Rebuild the index from every approved scout"""
+        self._pending = []
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    text("""
+                        SELECT id, daftar_id, name, location, community, age_range, stage, sector
+                        FROM scouts
+                        WHERE status = 'approved'
+                    """)
+                )
+                rows = [dict(row._mapping) for row in result.fetchall()]
+            # Indexing 100k scouts would stall every request on this worker,
+            # so the new index is built in a thread while the old one serves
+            fresh = await asyncio.to_thread(self.build, rows)
+        except BaseException:
+            self._pending = None
+            raise
+        self._swap(fresh)
+        logger.info(f"Scout matcher indexed {len(self)} scouts")
+
+    def apply(self, event: dict):
+        """Keep the index in step with scout lifecycle events from the outbox"""
+        if self._pending is not None:
+            self._pending.append(event)
+        event_type = event.get("event_type")
+        payload = event.get("payload") or {}
+        if event_type == "scout.approved":
+            self.add({"id": payload["scout_id"], **payload})
+        elif event_type == "scout.archived":
+            self.remove(payload["scout_id"])
+        elif event_type == "scout.audience_updated" and payload.get("status") == "approved":
+            self.add({"id": payload["scout_id"], **payload})
+
+    async def run(self, bus: MessageBus, refresh_interval: float = MATCHER_REFRESH_INTERVAL):
+        """Load the index, then follow lifecycle events with periodic full rebuilds"""
+        async def refresh():
+            while True:
+                try:
+                    await self.load()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Scout matcher load error: {str(e)}")
+                await asyncio.sleep(refresh_interval)
+
+        refresher = asyncio.create_task(refresh())
+        try:
+            while True:
+                try:
+                    async for event in bus.subscribe(OUTBOX_STREAM):
+                        self.apply(event)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Scout matcher subscription error: {str(e)}")
+                    await asyncio.sleep(1)
+        finally:
+            refresher.cancel()
+
+matcher = ScoutMatcher()
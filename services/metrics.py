@@ -0,0 +1,99 @@
+import hashlib
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Paths that are not worth timing, so scrapes do not measure themselves
+UNTIMED_PATHS = {"/metrics"}
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Wall time per request",
+    ["method", "route", "status"]
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent in database statements per request",
+    ["method", "route"]
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Database statements issued per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float("inf"))
+)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+(?:\.\d+)?\b")
+_BIND_LISTS = re.compile(r"\((?:\s*(?:\?|\$\d+|%s)\s*,)+\s*(?:\?|\$\d+|%s)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(statement: str) -> str:
+    """Statement text with literals and bind lists collapsed and whitespace squeezed"""
+    normalized = _LITERALS.sub("?", statement)
+    normalized = _BIND_LISTS.sub("(?)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+def statement_fingerprint(statement: str) -> str:
+    """Short stable id for statements that differ only in their values"""
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:16]
+
+class RequestStats:
+    """Database work done on behalf of one request"""
+
+    def __init__(self):
+        self.db_time = 0.0
+        self.statements = 0
+
+# Set by the middleware; background tasks and jobs see None and are not counted
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def instrument_engine(engine: AsyncEngine):
+    """Attribute statement count and time to the request that issued them"""
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = request_stats.get()
+        if stats is None:
+            return
+        stats.db_time += time.perf_counter() - context._metrics_started
+        stats.statements += 1
+
+def route_template(request: Request) -> str:
+    """The matched route's path template, so /pitches/1 and /pitches/2 share a series"""
+    route = request.scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+async def metrics_middleware(request: Request, call_next):
+    """Record latency, DB time and statement count and report them in Server-Timing"""
+    if request.url.path in UNTIMED_PATHS:
+        return await call_next(request)
+
+    stats = RequestStats()
+    token = request_stats.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        request_stats.reset(token)
+        elapsed = time.perf_counter() - started
+        route = route_template(request)
+        REQUEST_LATENCY.labels(request.method, route, status_code).observe(elapsed)
+        REQUEST_DB_TIME.labels(request.method, route).observe(stats.db_time)
+        REQUEST_DB_STATEMENTS.labels(request.method, route).observe(stats.statements)
+
+    response.headers["Server-Timing"] = ", ".join([
+        f"db;dur={stats.db_time * 1000:.1f};desc=\"{stats.statements} statements\"",
+        f"app;dur={(elapsed - stats.db_time) * 1000:.1f}",
+        f"total;dur={elapsed * 1000:.1f}",
+    ])
+    return response
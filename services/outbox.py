@@ -0,0 +1,53 @@
+import json
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+async def record_event(
+    db: AsyncSession,
+    aggregate_type: str,
+    aggregate_id: int,
+    event_type: str,
+    payload: dict,
+    pitch_id: Optional[int] = None
+):
+    """Append an event to the outbox.
+
+    Must be called before the caller commits, so the event is written in the
+    same transaction as the change it describes. When pitch_id is given the
+    payload is tagged with the pitch and its daftar, which is what the
+    activity feed uses to route the event.
+    """
+    params = {
+        "aggregate_type": aggregate_type,
+        "aggregate_id": aggregate_id,
+        "event_type": event_type,
+        "payload": json.dumps(payload, default=str)
+    }
+
+    if pitch_id is None:
+        payload_sql = "CAST(:payload AS JSONB)"
+    else:
+        # Resolve the daftar inside the INSERT rather than with another round trip
+        payload_sql = """CAST(:payload AS JSONB) || jsonb_build_object(
+                    'pitch_id', CAST(:pitch_id AS INTEGER),
+                    'daftar_id', (
+                        SELECT s.daftar_id FROM pitches p
+                        JOIN scouts s ON p.scout_id = s.id
+                        WHERE p.id = :pitch_id
+                    )
+                )"""
+        params["pitch_id"] = pitch_id
+
+    await db.execute(
+        text(f"""
+            INSERT INTO outbox_events (
+                aggregate_type, aggregate_id, event_type, payload, created_at
+            )
+            VALUES (
+                :aggregate_type, :aggregate_id, :event_type,
+                {payload_sql}, CURRENT_TIMESTAMP
+            )
+        """),
+        params
+    )
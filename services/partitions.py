@@ -0,0 +1,177 @@
+import logging
+import os
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Months of empty partitions kept ready ahead of the current one
+PARTITION_PREMAKE_MONTHS = int(os.getenv("PARTITION_PREMAKE_MONTHS", "3"))
+
+# Schema detached partitions are moved to; still queryable, no longer scanned by the API
+ARCHIVE_SCHEMA = "archive"
+
+class PartitionPolicy:
+    """Monthly range partitioning of one append-only table.
+
+    Partitions are named <table>_pYYYYMM. Once a month is older than
+    attached_months it is detached and moved to the archive schema; after
+    a further archived_months it is dropped. None keeps it indefinitely.
+    """
+
+    def __init__(self, table: str, column: str, attached_months: Optional[int] = None, archived_months: Optional[int] = None):
+        self.table = table
+        self.column = column
+        self.attached_months = attached_months
+        self.archived_months = archived_months
+
+def _months(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return int(value) if value.strip() else None
+
+# Documents and notes are what users see on a pitch, so they stay attached.
+# Offer actions and scout updates are history that is rarely read once
+# the offer or scout has moved on.
+PARTITION_POLICIES = [
+    PartitionPolicy(
+        "offer_actions", "action_taken_at",
+        attached_months=_months("OFFER_ACTIONS_ATTACHED_MONTHS", 24),
+        archived_months=_months("OFFER_ACTIONS_ARCHIVED_MONTHS", None)
+    ),
+    PartitionPolicy(
+        "scout_updates", "created_at",
+        attached_months=_months("SCOUT_UPDATES_ATTACHED_MONTHS", 36),
+        archived_months=_months("SCOUT_UPDATES_ARCHIVED_MONTHS", None)
+    ),
+    PartitionPolicy("documents", "uploaded_at"),
+    PartitionPolicy("investor_notes", "created_at"),
+]
+
+def month_start(day: date, offset: int = 0) -> date:
+    """First day of the month offset months from day's month"""
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+async def _is_partitioned(db: AsyncSession, table: str) -> bool:
+    result = await db.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table}
+    )
+    return result.first() is not None
+
+async def _partitions(db: AsyncSession, table: str, schema: Optional[str] = None) -> List[str]:
+    """Monthly partitions of table, attached ones or (with schema) archived ones"""
+    if schema is None:
+        result = await db.execute(
+            text("""
+                SELECT c.relname FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = to_regclass(:table)
+            """),
+            {"table": table}
+        )
+    else:
+        result = await db.execute(
+            text("""
+                SELECT c.relname FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = :schema AND c.relkind = 'r' AND c.relname LIKE :pattern
+            """),
+            {"schema": schema, "pattern": f"{table}\\_p______"}
+        )
+    return sorted(row.relname for row in result.fetchall())
+
+def _partition_month(table: str, name: str) -> Optional[date]:
+    suffix = name[len(table) + 2:]
+    if not (name.startswith(f"{table}_p") and len(suffix) == 6 and suffix.isdigit()):
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+async def ensure_partitions(
+    db: AsyncSession,
+    policy: PartitionPolicy,
+    today: date,
+    since: Optional[date] = None
+) -> List[str]:
+    """Create this month's partition and PARTITION_PREMAKE_MONTHS ahead; returns those created.
+
+    With since, every month from since's onwards is created as well.
+    """
+    existing = set(await _partitions(db, policy.table))
+    created = []
+    month = month_start(since or today)
+    while month <= month_start(today, PARTITION_PREMAKE_MONTHS):
+        name = partition_name(policy.table, month)
+        if name not in existing:
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {policy.table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{month_start(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = month_start(month, 1)
+    return created
+
+async def apply_retention(db: AsyncSession, policy: PartitionPolicy, today: date) -> List[str]:
+    """Archive, then drop, partitions past the policy's ages; returns the actions taken"""
+    actions = []
+    if policy.attached_months is not None:
+        cutoff = month_start(today, -policy.attached_months)
+        for name in await _partitions(db, policy.table):
+            month = _partition_month(policy.table, name)
+            if month is None or month >= cutoff:
+                continue
+            await db.execute(text(f"ALTER TABLE {policy.table} DETACH PARTITION {name}"))
+            await db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            actions.append(f"archived {name}")
+
+        if policy.archived_months is not None:
+            cutoff = month_start(cutoff, -policy.archived_months)
+            for name in await _partitions(db, policy.table, ARCHIVE_SCHEMA):
+                month = _partition_month(policy.table, name)
+                if month is None or month >= cutoff:
+                    continue
+                await db.execute(text(f"DROP TABLE {ARCHIVE_SCHEMA}.{name}"))
+                actions.append(f"dropped {ARCHIVE_SCHEMA}.{name}")
+    return actions
+
+async def ensure_partitions_since(db: AsyncSession, since: date, today: Optional[date] = None) -> List[str]:
+    """Create the partitions every partitioned table needs for rows dated from since.
+
+    For loading backdated rows, e.g. the benchmark seed; the caller commits.
+    """
+    today = today or date.today()
+    created = []
+    for policy in PARTITION_POLICIES:
+        if await _is_partitioned(db, policy.table):
+            created += await ensure_partitions(db, policy, today, since)
+    return created
+
+async def maintain_partitions(db: AsyncSession, today: Optional[date] = None) -> List[str]:
+    """Create upcoming partitions and apply retention for every partitioned table.
+
+    Tables that have not been migrated to partitioning yet are skipped.
+    Commits after each table so a failure in one leaves the others done.
+    """
+    today = today or date.today()
+    actions = []
+    for policy in PARTITION_POLICIES:
+        if not await _is_partitioned(db, policy.table):
+            continue
+        try:
+            created = await ensure_partitions(db, policy, today)
+            actions += [f"created {name}" for name in created]
+            actions += await apply_retention(db, policy, today)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Partition maintenance failed for {policy.table}: {str(e)}")
+    for action in actions:
+        logger.info(f"Partition maintenance: {action}")
+    return actions
@@ -0,0 +1,105 @@
+import itertools
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+from fastapi import Request
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from services.metrics import route_template
+
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.001"))
+
+# Captured profiles kept per route, newest first
+PROFILES_PER_ROUTE = 5
+
+class ProfileCapture:
+    """Samples the next N requests, or every request until a deadline.
+
+    Only requests whose route template matches the optional filter are
+    profiled. Results stay in memory on the worker that served them.
+    """
+
+    def __init__(self):
+        self.remaining = 0
+        self.until: Optional[float] = None
+        self.route: Optional[str] = None
+        self.profiles: Dict[str, Deque[dict]] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def active(self) -> bool:
+        if self.until is not None:
+            return time.monotonic() < self.until
+        return self.remaining > 0
+
+    def start(self, requests: Optional[int] = None, seconds: Optional[float] = None, route: Optional[str] = None):
+        self.remaining = requests or 0
+        self.until = time.monotonic() + seconds if seconds else None
+        self.route = route
+
+    def stop(self):
+        self.remaining = 0
+        self.until = None
+
+    def status(self) -> dict:
+        return {
+            "active": self.active,
+            "remaining_requests": self.remaining if self.until is None else None,
+            "remaining_seconds": round(max(0.0, self.until - time.monotonic()), 1) if self.until else None,
+            "route": self.route,
+            "profiles": [
+                {key: value for key, value in profile.items() if key != "session"}
+                for profiles in self.profiles.values()
+                for profile in profiles
+            ],
+        }
+
+    def find(self, profile_id: int) -> Optional[dict]:
+        for profiles in self.profiles.values():
+            for profile in profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+    def render(self, profile: dict, format: str) -> str:
+        renderer = SpeedscopeRenderer() if format == "speedscope" else HTMLRenderer()
+        return renderer.render(profile["session"])
+
+    def _keep(self, route: str, method: str, status_code: int, session):
+        profiles = self.profiles.setdefault(route, deque(maxlen=PROFILES_PER_ROUTE))
+        profiles.appendleft({
+            "id": next(self._ids),
+            "route": route,
+            "method": method,
+            "status_code": status_code,
+            "duration_ms": round(session.duration * 1000, 1),
+            "captured_at": datetime.utcnow(),
+            "session": session,
+        })
+
+    async def middleware(self, request: Request, call_next):
+        """Profile matching requests while a capture is active"""
+        if not self.active or request.url.path.startswith("/admin/"):
+            return await call_next(request)
+
+        # Only the handler's own task and the tasks it spawns are sampled
+        profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            session = profiler.stop()
+
+        route = route_template(request)
+        if self.route is not None and route != self.route:
+            return response
+        if self.until is None:
+            if self.remaining <= 0:
+                return response
+            self.remaining -= 1
+        self._keep(route, request.method, response.status_code, session)
+        return response
+
+capture = ProfileCapture()
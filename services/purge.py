@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from prometheus_client import Counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Rows deleted per statement; each batch is its own short transaction
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+# Pause between batches so replicas and autovacuum keep up with the WAL
+PURGE_BATCH_PAUSE = float(os.getenv("PURGE_BATCH_PAUSE", "0.05"))
+
+PURGED_ROWS = Counter(
+    "pitch_purge_rows_deleted_total",
+    "Rows removed by the soft-deleted pitch purge",
+    ["table"]
+)
+
+# Rows belonging to a pitch, children of children first so no batch trips
+# a foreign key. Each predicate selects the pitch's rows in that table.
+PITCH_CHILDREN = [
+    ("question_answers", "question_id IN (SELECT id FROM investor_questions WHERE pitch_id = :pitch_id)"),
+    ("investor_answers", "question_id IN (SELECT id FROM investor_questions WHERE pitch_id = :pitch_id)"),
+    ("founder_question_inbox", "pitch_id = :pitch_id"),
+    ("investor_questions", "pitch_id = :pitch_id"),
+    ("offer_actions", "offer_id IN (SELECT id FROM offers WHERE pitch_id = :pitch_id)"),
+    ("offers", "pitch_id = :pitch_id"),
+    ("bills", "pitch_id = :pitch_id"),
+    ("documents", "pitch_id = :pitch_id"),
+    ("investor_notes", "pitch_id = :pitch_id"),
+    ("team_member_analysis", "pitch_id = :pitch_id"),
+    ("founder_meeting_detail", "meeting_id IN (SELECT meeting_id FROM founder_meeting WHERE pitch_id = :pitch_id)"),
+    ("founder_meeting", "pitch_id = :pitch_id"),
+    ("pitch_team_invites", "pitch_id = :pitch_id"),
+    ("pending_confirmations", "pitch_id = :pitch_id"),
+    ("founder_pitch_relationship", "pitch_id = :pitch_id"),
+    ("entity_counters", "entity_type = 'pitch' AND entity_id = :pitch_id"),
+]
+
+class PitchPurger:
+    """Hard-deletes soft-deleted pitches and everything hanging off them.
+
+    Rows go in batches of PURGE_BATCH_SIZE, each committed on its own, so
+    no statement holds locks for long or writes a burst of WAL. Purging is
+    idempotent; a pitch interrupted half way is picked up again next run.
+    """
+
+    def __init__(self):
+        self.current: Optional[dict] = None
+        self.pitches_purged = 0
+        self.rows_deleted = 0
+        self.last_run_at: Optional[datetime] = None
+        self._tables: Optional[List[str]] = None
+
+    def status(self) -> dict:
+        return {
+            "current": self.current,
+            "pitches_purged": self.pitches_purged,
+            "rows_deleted": self.rows_deleted,
+            "last_run_at": self.last_run_at,
+        }
+
+    async def _existing_tables(self, db: AsyncSession) -> List[str]:
+        """Child tables present in this database; some are not in every deployment"""
+        if self._tables is None:
+            result = await db.execute(
+                text("SELECT t AS table_name FROM unnest(CAST(:tables AS TEXT[])) AS t WHERE to_regclass(t) IS NOT NULL"),
+                {"tables": [table for table, _ in PITCH_CHILDREN]}
+            )
+            self._tables = [row.table_name for row in result.fetchall()]
+        return self._tables
+
+    async def _delete_batch(self, db: AsyncSession, table: str, predicate: str, pitch_id: int) -> int:
+        # The predicate is repeated outside the ctid list because ctids are
+        # only unique within one partition of a partitioned table
+        result = await db.execute(
+            text(f"""
+                DELETE FROM {table}
+                WHERE {predicate}
+                AND ctid = ANY(ARRAY(
+                    SELECT ctid FROM {table}
+                    WHERE {predicate}
+                    LIMIT :batch_size
+                ))
+            """),
+            {"pitch_id": pitch_id, "batch_size": PURGE_BATCH_SIZE}
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def purge_pitch(self, db: AsyncSession, pitch_id: int) -> int:
+        """Delete one soft-deleted pitch and its child rows; returns rows deleted"""
+        tables = await self._existing_tables(db)
+        deleted: Dict[str, int] = {}
+        self.current = {"pitch_id": pitch_id, "table": None, "deleted": deleted, "started_at": datetime.utcnow()}
+
+        for table, predicate in PITCH_CHILDREN:
+            if table not in tables:
+                continue
+            self.current["table"] = table
+            while True:
+                count = await self._delete_batch(db, table, predicate, pitch_id)
+                if count:
+                    deleted[table] = deleted.get(table, 0) + count
+                    self.rows_deleted += count
+                    PURGED_ROWS.labels(table=table).inc(count)
+                if count < PURGE_BATCH_SIZE:
+                    break
+                await asyncio.sleep(PURGE_BATCH_PAUSE)
+
+        # Only a pitch that is still soft-deleted goes
+        result = await db.execute(
+            text("DELETE FROM pitches WHERE id = :pitch_id AND deleted_at IS NOT NULL"),
+            {"pitch_id": pitch_id}
+        )
+        await db.commit()
+        deleted["pitches"] = result.rowcount
+        self.rows_deleted += result.rowcount
+        PURGED_ROWS.labels(table="pitches").inc(result.rowcount)
+
+        self.pitches_purged += 1
+        self.current = None
+        total = sum(deleted.values())
+        logger.info(f"Purged pitch {pitch_id}: {total} rows ({deleted})")
+        return total
+
+    async def pending(self, db: AsyncSession, limit: Optional[int] = None) -> List[int]:
+        """Soft-deleted pitches waiting to be purged, oldest first"""
+        result = await db.execute(
+            text(f"""
+                SELECT id FROM pitches
+                WHERE deleted_at IS NOT NULL
+                ORDER BY deleted_at
+                {"LIMIT :limit" if limit is not None else ""}
+            """),
+            {"limit": limit}
+        )
+        return [row.id for row in result.fetchall()]
+
+    async def run_once(self, db: AsyncSession, limit: Optional[int] = None) -> int:
+        """Purge pending pitches; returns how many were purged"""
+        started = time.monotonic()
+        pitch_ids = await self.pending(db, limit)
+        for pitch_id in pitch_ids:
+            await self.purge_pitch(db, pitch_id)
+        self.last_run_at = datetime.utcnow()
+        if pitch_ids:
+            logger.info(f"Purged {len(pitch_ids)} pitches in {time.monotonic() - started:.1f}s")
+        return len(pitch_ids)
+
+purger = PitchPurger()
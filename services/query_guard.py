@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import sys
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+import greenlet
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from services.metrics import normalize_statement, route_template, statement_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# "warn" logs offending requests, "raise" also turns them into 500s so a
+# test run fails. Unset disables the guard.
+QUERY_GUARD = os.getenv("QUERY_GUARD")
+QUERY_GUARD_MAX_STATEMENTS = int(os.getenv("QUERY_GUARD_MAX_STATEMENTS", "25"))
+QUERY_GUARD_MAX_REPEATS = int(os.getenv("QUERY_GUARD_MAX_REPEATS", "3"))
+# Per-route report written on shutdown
+QUERY_GUARD_REPORT = os.getenv("QUERY_GUARD_REPORT", "query_guard_report.json")
+
+_HERE = os.path.abspath(__file__)
+_ROOT = os.path.dirname(os.path.dirname(_HERE))
+
+class RequestQueries:
+    """Statements one request issued, grouped by fingerprint"""
+
+    def __init__(self):
+        self.total = 0
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.statements: Dict[str, str] = {}
+        self.call_sites: Dict[str, set] = defaultdict(set)
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.total > QUERY_GUARD_MAX_STATEMENTS:
+            problems.append(f"{self.total} statements (limit {QUERY_GUARD_MAX_STATEMENTS})")
+        for fingerprint, count in self.counts.items():
+            if count > QUERY_GUARD_MAX_REPEATS:
+                sites = ", ".join(sorted(self.call_sites[fingerprint]))
+                problems.append(
+                    f"{count}x {self.statements[fingerprint][:120]!r} from {sites} "
+                    f"(limit {QUERY_GUARD_MAX_REPEATS})"
+                )
+        return problems
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+# route -> fingerprint -> aggregate over every request the process served
+_report: Dict[str, Dict[str, dict]] = defaultdict(dict)
+
+def _call_site() -> str:
+    """The innermost frame of our own code that led to the statement.
+
+    Statements execute in a greenlet spawned by the async engine, so the
+    handler's frames are found on the parent greenlet's suspended stack.
+    """
+    frame = sys._getframe(2)
+    parent = greenlet.getcurrent().parent
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+
+    for frame in frames:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_ROOT) and "site-packages" not in filename and filename != _HERE:
+            return f"{os.path.relpath(filename, _ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return "unknown"
+
+def setup_query_guard(engine: AsyncEngine) -> bool:
+    """Start recording statements per request; False when the guard is off"""
+    if QUERY_GUARD not in ("warn", "raise"):
+        return False
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries = _request_queries.get()
+        if queries is None:
+            return
+        fingerprint = statement_fingerprint(statement)
+        queries.total += 1
+        queries.counts[fingerprint] += 1
+        queries.statements.setdefault(fingerprint, normalize_statement(statement))
+        queries.call_sites[fingerprint].add(_call_site())
+
+    return True
+
+def _record(route: str, queries: RequestQueries):
+    for fingerprint, count in queries.counts.items():
+        entry = _report[route].setdefault(fingerprint, {
+            "statement": queries.statements[fingerprint],
+            "requests": 0,
+            "executions": 0,
+            "max_per_request": 0,
+            "call_sites": set(),
+        })
+        entry["requests"] += 1
+        entry["executions"] += count
+        entry["max_per_request"] = max(entry["max_per_request"], count)
+        entry["call_sites"].update(queries.call_sites[fingerprint])
+
+def write_report(path: str = QUERY_GUARD_REPORT):
+    """Dump per-route fingerprints, worst repeats first"""
+    report = {
+        route: sorted(
+            (
+                {"fingerprint": fingerprint, **entry, "call_sites": sorted(entry["call_sites"])}
+                for fingerprint, entry in fingerprints.items()
+            ),
+            key=lambda entry: (-entry["max_per_request"], -entry["executions"])
+        )
+        for route, fingerprints in sorted(_report.items())
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Query guard report written to {path}")
+
+async def query_guard_middleware(request: Request, call_next):
+    """Flag requests that issue too many statements or repeat one too often"""
+    queries = RequestQueries()
+    token = _request_queries.set(queries)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_queries.reset(token)
+
+    route = route_template(request)
+    _record(route, queries)
+    problems = queries.violations()
+    if not problems:
+        return response
+
+    logger.warning(f"Query guard: {request.method} {route}: " + "; ".join(problems))
+    if QUERY_GUARD == "raise":
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"detail": "Query guard violation", "route": route, "problems": problems}
+        )
+    return response
@@ -0,0 +1,174 @@
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from cachetools import TTLCache
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+import auth
+from cache import get_redis
+from services.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITS_ENABLED = os.getenv("RATE_LIMITS_ENABLED", "true").lower() == "true"
+
+# In-flight requests allowed per write route on each worker. The DB pool
+# holds 15 connections, so one busy route cannot take all of them.
+WRITE_CONCURRENCY = int(os.getenv("WRITE_CONCURRENCY", "8"))
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+class RateRule:
+    """A token bucket applied to matching requests.
+
+    scope "principal" gives every caller their own bucket for the route;
+    scope "route" is one bucket shared by all callers of the route.
+    """
+
+    def __init__(self, name: str, methods: Set[str], path: Optional[str], scope: str, capacity: float, refill_per_second: float):
+        self.name = name
+        self.methods = methods
+        self.path = path
+        self.scope = scope
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+
+    def matches(self, method: str, route: str) -> bool:
+        return method in self.methods and (self.path is None or self.path == route)
+
+RATE_RULES = [
+    # Ten attempts, then one every six seconds
+    RateRule("login", {"POST"}, "/auth/login", "principal", 10, 1 / 6),
+    # Bursts of 60 writes per caller and route, 5 a second sustained
+    RateRule("writes", WRITE_METHODS, None, "principal", 60, 5),
+    # Ceiling for each write route across every caller
+    RateRule("route_writes", WRITE_METHODS, None, "route", 500, 200),
+]
+
+# KEYS[1] bucket; ARGV capacity, refill per second, cost.
+# Uses the Redis clock so every worker agrees on elapsed time.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+class TokenBucketLimiter:
+    """Token buckets in Redis when configured, otherwise in this process"""
+
+    def __init__(self):
+        self._script = None
+        # key -> (tokens, last refill); idle buckets expire once full again
+        self._local = TTLCache(maxsize=100_000, ttl=3600)
+
+    async def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1) -> Tuple[bool, float]:
+        """Take cost tokens; returns whether allowed and seconds until it would be"""
+        redis = get_redis()
+        if redis is not None:
+            if self._script is None:
+                self._script = redis.register_script(TOKEN_BUCKET_LUA)
+            try:
+                allowed, retry_after = await self._script(keys=[key], args=[capacity, refill_per_second, cost])
+                return bool(int(allowed)), float(retry_after)
+            except Exception as e:
+                # Fail open; an unavailable Redis should not take the API down
+                logger.error(f"Rate limiter error: {str(e)}")
+                return True, 0.0
+
+        now = time.monotonic()
+        tokens, updated = self._local.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+        if tokens >= cost:
+            self._local[key] = (tokens - cost, now)
+            return True, 0.0
+        self._local[key] = (tokens, now)
+        return False, (cost - tokens) / refill_per_second
+
+limiter = TokenBucketLimiter()
+
+# (method, route) -> requests in flight on this worker
+_in_flight: Dict[Tuple[str, str], int] = defaultdict(int)
+
+def verified_user(request: Request) -> Optional[str]:
+    """The subject of a valid bearer token, if the request carries one"""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer ") and auth.SECRET_KEY:
+        try:
+            claims = jwt.decode(authorization[7:], auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+            if claims.get("sub"):
+                return f"user:{claims['sub']}"
+        except JWTError:
+            pass
+    return None
+
+def principal(request: Request) -> str:
+    """Who a request counts against: token subject, or client address"""
+    # The investor_id and founder_id query parameters are not verified, and a
+    # caller choosing its own bucket could mint a fresh one per request
+    return verified_user(request) or f"ip:{request.client.host if request.client else 'unknown'}"
+
+def concurrency_limit(method: str, route: str) -> Optional[int]:
+    return WRITE_CONCURRENCY if method in WRITE_METHODS else None
+
+def _too_many(detail: str, retry_after: float, status_code: int = status.HTTP_429_TOO_MANY_REQUESTS):
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+async def rate_limit(request: Request):
+    """Router dependency enforcing RATE_RULES and the per-route concurrency cap"""
+    if not RATE_LIMITS_ENABLED:
+        yield
+        return
+
+    method = request.method
+    route = route_template(request)
+    rules: List[RateRule] = [rule for rule in RATE_RULES if rule.matches(method, route)]
+    if rules:
+        caller = principal(request)
+        for rule in rules:
+            subject = caller if rule.scope == "principal" else "all"
+            allowed, retry_after = await limiter.take(
+                f"ratelimit:{rule.name}:{method}:{route}:{subject}",
+                rule.capacity,
+                rule.refill_per_second
+            )
+            if not allowed:
+                raise _too_many("Rate limit exceeded", retry_after)
+
+    cap = concurrency_limit(method, route)
+    if cap is None:
+        yield
+        return
+
+    key = (method, route)
+    if _in_flight[key] >= cap:
+        # Shed instead of queueing for a database connection
+        raise _too_many("Server busy, retry shortly", 1, status.HTTP_503_SERVICE_UNAVAILABLE)
+    _in_flight[key] += 1
+    try:
+        yield
+    finally:
+        _in_flight[key] -= 1
@@ -0,0 +1,261 @@
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+from prometheus_client import Counter
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+logger = logging.getLogger(__name__)
+
+# Days a scout stays archived in the hot tables before it is moved out
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+ARCHIVED_SCOUTS = Counter(
+    "scouts_archived_total",
+    "Scouts moved to the archive tier, by stage",
+    ["stage"]
+)
+
+def _rows(table: str, predicate: str, order: str, drop: str = "") -> str:
+    """Rows of a child table as a JSONB array, in order; drop removes keys"""
+    return f"""COALESCE((
+                SELECT jsonb_agg(to_jsonb(c){drop} ORDER BY c.{order})
+                FROM {table} c WHERE {predicate}
+            ), '[]')"""
+
+# Copies one archived scout into archive.scouts as a single document and
+# soft-deletes its pitches, all in one statement. The pitch purge then
+# removes the pitches and their child rows in batches. Nothing happens for
+# a scout that is not archived or already copied.
+ARCHIVE_SCOUT_SQL = f"""
+    WITH scout AS (
+        SELECT * FROM scouts WHERE id = :scout_id AND status = 'archived'
+    ),
+    moving AS (
+        SELECT p.* FROM pitches p
+        WHERE p.scout_id = :scout_id AND {live("pitches", "p")}
+    ),
+    pitch_docs AS (
+        SELECT p.id, to_jsonb(p) - 'search_vector' || jsonb_build_object(
+            'documents', {_rows("documents", "c.pitch_id = p.id", "uploaded_at")},
+            'offers', COALESCE((
+                SELECT jsonb_agg(to_jsonb(o) || jsonb_build_object(
+                    'actions', {_rows("offer_actions", "c.offer_id = o.id", "action_taken_at")}
+                ) ORDER BY o.id)
+                FROM offers o WHERE o.pitch_id = p.id
+            ), '[]'),
+            'notes', {_rows("investor_notes", "c.pitch_id = p.id", "created_at", " - 'search_vector'")}
+        ) AS doc
+        FROM moving p
+    ),
+    archived AS (
+        INSERT INTO archive.scouts (id, daftar_id, name, archived_at, moved_at, pitch_count, doc)
+        SELECT s.id, s.daftar_id, s.name, s.archived_at, CURRENT_TIMESTAMP,
+            (SELECT COUNT(*) FROM pitch_docs),
+            jsonb_build_object(
+                'scout', to_jsonb(s) - 'search_vector',
+                'faqs', {_rows("scout_faqs", "c.scout_id = s.id", "id")},
+                'updates', {_rows("scout_updates", "c.scout_id = s.id", "created_at", " - 'search_vector'")},
+                'pitches', COALESCE((SELECT jsonb_agg(doc ORDER BY id) FROM pitch_docs), '[]')
+            )
+        FROM scout s
+        ON CONFLICT (id) DO NOTHING
+        RETURNING id
+    ),
+    indexed AS (
+        INSERT INTO archive.pitch_index (pitch_id, scout_id)
+        SELECT moving.id, archived.id FROM moving, archived
+        ON CONFLICT (pitch_id) DO NOTHING
+    ),
+    hidden AS (
+        UPDATE pitches SET deleted_at = CURRENT_TIMESTAMP, version = version + 1
+        WHERE id IN (SELECT id FROM moving) AND EXISTS (SELECT 1 FROM archived)
+    )
+    SELECT id FROM archived
+"""
+
+# Rows hanging off a scout other than its pitches, children of children
+# first. Each predicate selects the scout's rows in that table.
+SCOUT_CHILDREN = [
+    ("sample_pitch_answers", "question_id IN (SELECT id FROM sample_investor_questions WHERE scout_id = :scout_id)"),
+    ("sample_investor_questions", "scout_id = :scout_id"),
+    ("custom_investor_questions", "scout_id = :scout_id"),
+    ("scout_faqs", "scout_id = :scout_id"),
+    ("scout_faq", "scout_id = :scout_id"),
+    ("scout_schedules", "scout_id = :scout_id"),
+    ("scout_updates", "scout_id = :scout_id"),
+    ("updates", "scout_id = :scout_id"),
+    ("scout_documents", "scout_id = :scout_id"),
+    ("scout_collaborators", "scout_id = :scout_id"),
+    ("investor_scouts", "scout_id = :scout_id"),
+    ("scout_pending_approvals", "scout_id = :scout_id"),
+    ("scout_pending_details", "scout_id = :scout_id"),
+    ("scout_delete_approvals", "scout_id = :scout_id"),
+    ("entity_counters", "entity_type = 'scout' AND entity_id = :scout_id"),
+]
+
+_tables: Optional[List[str]] = None
+
+async def _existing_tables(db: AsyncSession) -> List[str]:
+    """Scout child tables present in this database; some are not in every deployment"""
+    global _tables
+    if _tables is None:
+        result = await db.execute(
+            text("SELECT t AS table_name FROM unnest(CAST(:tables AS TEXT[])) AS t WHERE to_regclass(t) IS NOT NULL"),
+            {"tables": [table for table, _ in SCOUT_CHILDREN]}
+        )
+        _tables = [row.table_name for row in result.fetchall()]
+    return _tables
+
+async def due_scouts(db: AsyncSession, limit: Optional[int] = None) -> List[int]:
+    """Scouts archived more than ARCHIVE_AFTER_DAYS ago, oldest first"""
+    result = await db.execute(
+        text(f"""
+            SELECT id FROM scouts
+            WHERE status = 'archived'
+            AND archived_at < CURRENT_TIMESTAMP - CAST(:days AS INTEGER) * INTERVAL '1 day'
+            ORDER BY archived_at
+            {"LIMIT :limit" if limit is not None else ""}
+        """),
+        {"days": ARCHIVE_AFTER_DAYS, "limit": limit}
+    )
+    return [row.id for row in result.fetchall()]
+
+async def archive_scout(db: AsyncSession, scout_id: int) -> bool:
+    """Copy one scout to the archive and hide its pitches; False if there was nothing to do"""
+    result = await db.execute(text(ARCHIVE_SCOUT_SQL), {"scout_id": scout_id})
+    archived = result.first() is not None
+    await db.commit()
+    if archived:
+        ARCHIVED_SCOUTS.labels(stage="copied").inc()
+    return archived
+
+async def releasable_scouts(db: AsyncSession, limit: Optional[int] = None) -> List[int]:
+    """Copied scouts still in the hot tables whose pitches have all been purged"""
+    result = await db.execute(
+        text(f"""
+            SELECT s.id FROM scouts s
+            JOIN archive.scouts a ON a.id = s.id
+            WHERE NOT EXISTS (SELECT 1 FROM pitches p WHERE p.scout_id = s.id)
+            ORDER BY a.moved_at
+            {"LIMIT :limit" if limit is not None else ""}
+        """),
+        {"limit": limit}
+    )
+    return [row.id for row in result.fetchall()]
+
+async def release_scout(db: AsyncSession, scout_id: int) -> int:
+    """Delete a copied scout and its remaining rows from the hot tables; returns rows deleted"""
+    tables = await _existing_tables(db)
+    deleted = 0
+    for table, predicate in SCOUT_CHILDREN:
+        if table not in tables:
+            continue
+        result = await db.execute(text(f"DELETE FROM {table} WHERE {predicate}"), {"scout_id": scout_id})
+        deleted += result.rowcount
+
+    # Only a scout that is archived and copied goes
+    result = await db.execute(
+        text("""
+            DELETE FROM scouts
+            WHERE id = :scout_id AND status = 'archived'
+            AND EXISTS (SELECT 1 FROM archive.scouts WHERE id = :scout_id)
+        """),
+        {"scout_id": scout_id}
+    )
+    if not result.rowcount:
+        await db.rollback()
+        return 0
+    await db.commit()
+    ARCHIVED_SCOUTS.labels(stage="released").inc()
+    return deleted + result.rowcount
+
+async def run_archival(db: AsyncSession, limit: Optional[int] = None) -> dict:
+    """Move due scouts to the archive and release those whose pitches are gone.
+
+    A scout takes two runs at least: the first copies it and soft-deletes
+    its pitches, the pitch purge removes those, and a later run deletes
+    the scout itself. Each scout is committed on its own.
+    """
+    copied = released = 0
+    for scout_id in await due_scouts(db, limit):
+        try:
+            copied += await archive_scout(db, scout_id)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Archiving scout {scout_id} failed: {str(e)}")
+    for scout_id in await releasable_scouts(db, limit):
+        try:
+            released += bool(await release_scout(db, scout_id))
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Releasing archived scout {scout_id} failed: {str(e)}")
+    if copied or released:
+        logger.info(f"Scout archive: {copied} copied, {released} released")
+    return {"copied": copied, "released": released, "ran_at": datetime.utcnow()}
+
+def visible_to_investor(pitch: dict, investor_id: int) -> dict:
+    """An archived pitch as a member investor sees it on the live routes.
+
+    Offers and notes are the investor's own; documents are the investor's
+    own plus founder documents that are not private.
+    """
+    return {
+        **pitch,
+        "documents": [
+            d for d in pitch.get("documents", [])
+            if (d.get("uploaded_by_type") == "investor" and d.get("uploaded_by_id") == investor_id)
+            or (d.get("uploaded_by_type") == "founder" and not d.get("is_private"))
+        ],
+        "offers": [o for o in pitch.get("offers", []) if o.get("investor_id") == investor_id],
+        "notes": [n for n in pitch.get("notes", []) if n.get("investor_id") == investor_id],
+    }
+
+async def list_archived_scouts(
+    db: AsyncSession,
+    daftar_id: int,
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = 50
+) -> list:
+    """Archived scouts of a daftar, most recently archived first, without their documents"""
+    query = """
+        SELECT id, daftar_id, name, archived_at, moved_at, pitch_count
+        FROM archive.scouts
+        WHERE daftar_id = :daftar_id
+    """
+    params = {"daftar_id": daftar_id, "limit": limit}
+    # Keyset on (archived_at, id) so scouts archived at the same moment
+    # are not skipped between pages
+    if before:
+        query += " AND (archived_at, id) < (:before, :before_id)"
+        params["before"] = before
+        params["before_id"] = before_id if before_id is not None else 2**31 - 1
+    query += " ORDER BY archived_at DESC, id DESC LIMIT :limit"
+    result = await db.execute(text(query), params)
+    return [dict(row._mapping) for row in result.fetchall()]
+
+async def get_archived_scout(db: AsyncSession, scout_id: int) -> Optional[dict]:
+    result = await db.execute(
+        text("SELECT * FROM archive.scouts WHERE id = :scout_id"),
+        {"scout_id": scout_id}
+    )
+    row = result.first()
+    return dict(row._mapping) if row else None
+
+async def get_archived_pitch(db: AsyncSession, pitch_id: int) -> Optional[dict]:
+    """One pitch out of its archived scout's document, with the scout's daftar_id"""
+    result = await db.execute(
+        text("""
+            SELECT a.daftar_id, p.value AS pitch
+            FROM archive.pitch_index i
+            JOIN archive.scouts a ON a.id = i.scout_id
+            CROSS JOIN LATERAL jsonb_array_elements(a.doc -> 'pitches') p
+            WHERE i.pitch_id = :pitch_id AND (p.value ->> 'id')::int = :pitch_id
+        """),
+        {"pitch_id": pitch_id}
+    )
+    row = result.first()
+    return dict(row._mapping) if row else None
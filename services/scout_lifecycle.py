@@ -0,0 +1,151 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Outbox payload the scout matcher needs to (re-)index a scout
+AUDIENCE_PAYLOAD_SQL = """jsonb_build_object(
+                'scout_id', id, 'daftar_id', daftar_id, 'name', name,
+                'status', status, 'location', location, 'community', community,
+                'age_range', age_range, 'stage', stage, 'sector', sector
+            )"""
+
+class Transition:
+    """A move of scouts into one status from a fixed set of others.
+
+    set_clause holds extra column assignments; side_effects are CTEs that
+    read the moved rows from "moved", so every write a transition implies
+    happens in the same statement as the status change. When event_type is
+    set the outbox event is inserted the same way.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: str,
+        allowed_from: List[str],
+        error: str,
+        set_clause: str = "",
+        side_effects: Optional[List[str]] = None,
+        event_type: Optional[str] = None,
+        event_payload: str = "jsonb_build_object('scout_id', id, 'daftar_id', daftar_id)"
+    ):
+        self.name = name
+        self.target = target
+        self.allowed_from = allowed_from
+        self.error = error
+        self.set_clause = set_clause
+        self.side_effects = side_effects or []
+        self.event_type = event_type
+        self.event_payload = event_payload
+
+    def sql(self) -> str:
+        """One statement applying the transition to :scout_ids.
+
+        Moved scouts come back with applied = true and the rest of the
+        requested scouts unchanged with applied = false; ids that do not
+        exist are absent.
+        """
+        ctes = [f"""moved AS (
+            UPDATE scouts
+            SET status = :target, version = version + 1{self.set_clause}
+            WHERE id = ANY(:scout_ids) AND status = ANY(CAST(:allowed_from AS TEXT[]))
+            RETURNING *
+        )"""]
+        ctes += [f"{self.name}_{i} AS ({effect})" for i, effect in enumerate(self.side_effects)]
+        if self.event_type:
+            ctes.append(f"""events AS (
+            INSERT INTO outbox_events (
+                aggregate_type, aggregate_id, event_type, payload, created_at
+            )
+            SELECT 'scout', id, CAST(:event_type AS TEXT), {self.event_payload}, CURRENT_TIMESTAMP
+            FROM moved
+        )""")
+        return f"""
+        WITH {", ".join(ctes)}
+        SELECT moved.*, true AS applied FROM moved
+        UNION ALL
+        SELECT scouts.*, false AS applied FROM scouts
+        WHERE id = ANY(:scout_ids)
+        AND id NOT IN (SELECT id FROM moved)
+        """
+
+# Clears the sign-offs still outstanding for moved scouts
+CLEAR_PENDING_APPROVALS = """
+            DELETE FROM scout_pending_approvals
+            WHERE scout_id IN (SELECT id FROM moved)
+        """
+
+# draft -> pending -> approved -> archived; anything not yet archived,
+# rejected scouts included, can be archived
+TRANSITIONS = {
+    "submit": Transition(
+        "submit", "pending", ["draft"],
+        error="Scout must be in draft status to submit",
+        side_effects=[
+            # Every member of the daftar's team is asked to sign off
+            """
+            INSERT INTO scout_pending_approvals (scout_id, team_member_id)
+            SELECT moved.id, m.id
+            FROM moved JOIN daftar_team_members m ON m.daftar_id = moved.daftar_id
+            """,
+        ],
+    ),
+    "approve": Transition(
+        "approve", "approved", ["pending"],
+        error="Scout must be in pending status to approve",
+        set_clause=""",
+                approved_at = CURRENT_TIMESTAMP,
+                approved_by = :actor_id""",
+        side_effects=[
+            CLEAR_PENDING_APPROVALS,
+            # An approval supersedes any earlier sign-off to remove the scout
+            """
+            DELETE FROM scout_delete_approvals
+            WHERE scout_id IN (SELECT id FROM moved)
+            """,
+        ],
+        event_type="scout.approved",
+        event_payload=AUDIENCE_PAYLOAD_SQL,
+    ),
+    "archive": Transition(
+        "archive", "archived", ["draft", "pending", "approved", "rejected"],
+        error="Scout is already archived",
+        # Starts the clock for moving the scout to the archive tier
+        set_clause=""",
+                archived_at = CURRENT_TIMESTAMP""",
+        side_effects=[
+            CLEAR_PENDING_APPROVALS,
+            # Records who signed off on taking the scout down, when known
+            """
+            INSERT INTO scout_delete_approvals (scout_id, approved_by, approved_at)
+            SELECT id, CAST(:actor_id AS INTEGER), CURRENT_TIMESTAMP FROM moved
+            WHERE CAST(:actor_id AS INTEGER) IS NOT NULL
+            """,
+        ],
+        event_type="scout.archived",
+    ),
+}
+
+async def transition_scouts(
+    db: AsyncSession,
+    transition: Transition,
+    scout_ids: List[int],
+    actor_id: Optional[int] = None
+) -> Tuple[list, list]:
+    """Apply a transition to many scouts in one statement.
+
+    Returns the moved scouts and the scouts left as they were because their
+    status does not allow the transition. The caller commits.
+    """
+    result = await db.execute(
+        text(transition.sql()),
+        {
+            "scout_ids": scout_ids,
+            "target": transition.target,
+            "allowed_from": transition.allowed_from,
+            "actor_id": actor_id,
+            "event_type": transition.event_type
+        }
+    )
+    rows = result.fetchall()
+    return [row for row in rows if row.applied], [row for row in rows if not row.applied]
@@ -0,0 +1,155 @@
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from services.soft_delete import live
+
+# Must match the config used by the generated search_vector columns
+SEARCH_CONFIG = "english"
+
+SEARCH_TYPES = ["pitch", "scout", "faq", "update", "note"]
+
+# One branch per searchable table. Each one is driven by the GIN index on
+# search_vector and restricted to rows the caller may see.
+_BRANCHES = {
+    "pitch": f"""
+        SELECT 'pitch' AS type, p.id, p.scout_id, p.id AS pitch_id,
+               p.pitch_name AS title, p.pitch_name AS body,
+               ts_rank_cd(p.search_vector, query.q) AS rank
+        FROM pitches p, query
+        WHERE p.search_vector @@ query.q
+        AND {live("pitches", "p")}
+        AND p.id IN (SELECT id FROM visible_pitches)
+    """,
+    "scout": """
+        SELECT 'scout' AS type, s.id, s.id AS scout_id, NULL AS pitch_id,
+               s.name AS title, s.name AS body,
+               ts_rank_cd(s.search_vector, query.q) AS rank
+        FROM scouts s, query
+        WHERE s.search_vector @@ query.q
+        AND s.id IN (SELECT id FROM visible_scouts)
+    """,
+    "faq": """
+        SELECT 'faq' AS type, f.id, f.scout_id, NULL AS pitch_id,
+               f.question AS title, f.question || ' ' || f.answer AS body,
+               ts_rank_cd(f.search_vector, query.q) AS rank
+        FROM scout_faqs f, query
+        WHERE f.search_vector @@ query.q
+        AND f.scout_id IN (SELECT id FROM visible_scouts)
+    """,
+    "update": """
+        SELECT 'update' AS type, u.id, u.scout_id, NULL AS pitch_id,
+               NULL AS title, u.description AS body,
+               ts_rank_cd(u.search_vector, query.q) AS rank
+        FROM scout_updates u, query
+        WHERE u.search_vector @@ query.q
+        AND u.scout_id IN (SELECT id FROM visible_scouts)
+    """,
+    "note": """
+        SELECT 'note' AS type, n.id, NULL AS scout_id, n.pitch_id,
+               NULL AS title, n.note_text AS body,
+               ts_rank_cd(n.search_vector, query.q) AS rank
+        FROM investor_notes n, query
+        WHERE n.search_vector @@ query.q
+        AND n.investor_id = :investor_id
+    """,
+}
+
+def _visibility_ctes(investor_id: Optional[int], founder_id: Optional[int]) -> str:
+    """Scouts and pitches the caller can see.
+
+    Everyone sees approved scouts. Investors also see every live scout and
+    pitch of the daftars they belong to; founders see their own pitches.
+    """
+    if investor_id is not None:
+        return f"""
+            member_scouts AS (
+                SELECT s.id FROM scouts s
+                JOIN daftar_investors di ON s.daftar_id = di.daftar_id
+                WHERE di.investor_id = :investor_id
+                AND {live("daftar_investors", "di")}
+                AND {live("scouts", "s")}
+            ),
+            visible_scouts AS (
+                SELECT id FROM member_scouts
+                UNION
+                SELECT id FROM scouts WHERE status = 'approved'
+            ),
+            visible_pitches AS (
+                SELECT p.id FROM pitches p
+                WHERE p.scout_id IN (SELECT id FROM member_scouts)
+            )
+        """
+    if founder_id is not None:
+        return """
+            visible_scouts AS (
+                SELECT id FROM scouts WHERE status = 'approved'
+            ),
+            visible_pitches AS (
+                SELECT pitch_id AS id FROM founder_pitch_relationship
+                WHERE founder_id = :founder_id
+            )
+        """
+    return """
+        visible_scouts AS (
+            SELECT id FROM scouts WHERE status = 'approved'
+        ),
+        visible_pitches AS (
+            SELECT NULL::INTEGER AS id WHERE false
+        )
+    """
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    investor_id: Optional[int] = None,
+    founder_id: Optional[int] = None,
+    types: Optional[List[str]] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[dict]:
+    """Ranked full-text search across everything the caller can access"""
+    types = types or SEARCH_TYPES
+    # Notes are private to the investor who wrote them
+    if investor_id is None:
+        types = [t for t in types if t != "note"]
+    if not types:
+        return []
+
+    # No branch can put more than offset + limit rows on the page, so each
+    # keeps only its top ones before the union is sorted. Within a branch
+    # type is constant, so (rank, id) is the page's own order.
+    branches = "\nUNION ALL\n".join(
+        f"({_BRANCHES[t]} ORDER BY rank DESC, id LIMIT :branch_limit)" for t in types
+    )
+
+    # Headlines are only built for the page being returned
+    result = await db.execute(
+        text(f"""
+            WITH query AS (
+                SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :q) AS q
+            ),
+            {_visibility_ctes(investor_id, founder_id)},
+            hits AS (
+                {branches}
+            ),
+            page AS (
+                SELECT * FROM hits
+                ORDER BY rank DESC, type, id
+                LIMIT :limit OFFSET :offset
+            )
+            SELECT
+                page.type, page.id, page.scout_id, page.pitch_id, page.title, page.rank,
+                ts_headline('{SEARCH_CONFIG}', page.body, query.q, 'MaxFragments=1, MaxWords=20') AS snippet
+            FROM page, query
+            ORDER BY page.rank DESC, page.type, page.id
+        """),
+        {
+            "q": q,
+            "investor_id": investor_id,
+            "founder_id": founder_id,
+            "limit": limit,
+            "offset": offset,
+            "branch_limit": limit + offset
+        }
+    )
+    return [dict(row._mapping) for row in result.fetchall()]
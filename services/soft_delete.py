@@ -0,0 +1,21 @@
+from typing import Optional
+
+# What makes a row live, per table. Queries build their predicates from
+# here rather than by hand, and migrations/005_live_row_indexes.sql indexes
+# the same expressions, so the planner can prove a query only needs rows in
+# the partial indexes.
+LIVE_PREDICATES = {
+    "founders": "{t}is_active = true AND {t}deleted_on IS NULL",
+    "investors": "{t}is_active = true AND {t}deleted_on IS NULL",
+    "daftars": "{t}is_active = true AND {t}deleted_on IS NULL",
+    "daftar_investors": "{t}is_active = true",
+    "scouts": "{t}status != 'archived'",
+    "pitches": "{t}deleted_at IS NULL",
+}
+
+def live(table: str, alias: Optional[str] = None) -> str:
+    """SQL predicate selecting the live rows of table, optionally through an alias"""
+    predicate = LIVE_PREDICATES.get(table)
+    if predicate is None:
+        return "true"
+    return "(" + predicate.format(t=f"{alias}." if alias else "") + ")"
@@ -0,0 +1,115 @@
+import logging
+import os
+from contextlib import contextmanager
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from services.metrics import normalize_statement, route_template, statement_fingerprint
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # Tracing is optional
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# "otlp" sends to a collector, "console" prints spans, "file" appends them
+# to TRACING_FILE. Unset disables tracing.
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER")
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "1.0"))
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", "http://localhost:4318/v1/traces")
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "daftaros-api")
+
+_tracer = None
+
+def _exporter():
+    if TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=OTLP_ENDPOINT)
+    if TRACING_EXPORTER == "file":
+        out = open(TRACING_FILE, "a")
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    return ConsoleSpanExporter()
+
+def setup_tracing(engine: AsyncEngine) -> bool:
+    """Configure the tracer and instrument the engine; False when tracing is off"""
+    global _tracer
+    if not TRACING_EXPORTER:
+        return False
+    if trace is None:
+        logger.error("TRACING_EXPORTER is set but opentelemetry-sdk is not installed")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        # Follow the caller's decision when a sampled parent comes in
+        sampler=ParentBased(TraceIdRatioBased(TRACING_SAMPLE_RATIO))
+    )
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+    _instrument_engine(engine)
+    return True
+
+def _instrument_engine(engine: AsyncEngine):
+    """One client span per SQL statement, tagged with its fingerprint"""
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        normalized = normalize_statement(statement)
+        context._trace_span = _tracer.start_span(
+            normalized.split(" ", 1)[0].upper(),
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.statement": normalized,
+                "db.statement.fingerprint": statement_fingerprint(statement),
+            }
+        )
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statement_span = getattr(context, "_trace_span", None)
+        if statement_span is not None:
+            statement_span.set_attribute("db.rows", cursor.rowcount)
+            statement_span.end()
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        statement_span = getattr(exception_context.execution_context, "_trace_span", None)
+        if statement_span is not None:
+            statement_span.record_exception(exception_context.original_exception)
+            statement_span.set_status(Status(StatusCode.ERROR))
+            statement_span.end()
+
+@contextmanager
+def span(name: str, **attributes):
+    """Trace a block as a child of the current span; a no-op when tracing is off"""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+async def tracing_middleware(request: Request, call_next):
+    """Root span per request, continuing any incoming traceparent"""
+    with _tracer.start_as_current_span(
+        f"{request.method} {request.url.path}",
+        context=propagate.extract(request.headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.method": request.method, "http.target": request.url.path}
+    ) as current:
+        response = await call_next(request)
+        # The template is only known once routing has run
+        route = route_template(request)
+        current.update_name(f"{request.method} {route}")
+        current.set_attribute("http.route", route)
+        current.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 500:
+            current.set_status(Status(StatusCode.ERROR))
+        return response